@@ -14,35 +14,74 @@ Endpoints:
 Data persisted in SQLite (file: soa_builder_web.db by default).
 """
 
+import asyncio
 import csv
+import hashlib
+import importlib.util
 import io
 import json
 import logging
 import os
 import re
+import sqlite3
 import re as _re
 import urllib.parse
 import tempfile
 import time
-from contextlib import asynccontextmanager
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager, contextmanager, nullcontext
 from datetime import datetime, timezone
-from typing import Any, List, Optional
-
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional
+
+import httpx
+import orjson
 import pandas as pd
 import requests
+import xlsxwriter
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, Form, HTTPException, Request, Response, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from pydantic import BaseModel
 
 from ..normalization import normalize_soa
+from .audit import _write_audit, flush_audit
+from .db import (
+    _POOL,
+    _SQL_UTC_NOW,
+    ExistingSoa,
+    _soa_exists,
+    get_conn,
+    pooled_conn,
+)
 from .initialize_database import _connect, _init_db
 from .migrate_database import (
     _backfill_dataset_date,
     _drop_unused_override_table,
     _migrate_activity_add_uid,
+    _migrate_activity_concept_unique,
     _migrate_add_arm_uid,
     _migrate_add_epoch_id_to_visit,
     _migrate_add_epoch_label_desc,
@@ -54,8 +93,11 @@ from .migrate_database import (
     _migrate_drop_arm_element_link,
     _migrate_element_id,
     _migrate_element_table,
+    _migrate_matrix_indexes,
+    _migrate_order_indexes,
     _migrate_rename_cell_table,
     _migrate_rollback_add_elements_restored,
+    _migrate_terminology_audit_tables,
 )
 from .routers import activities as activities_router
 from .routers import arms as arms_router
@@ -72,12 +114,31 @@ load_dotenv()  # must come BEFORE reading env-based configuration so values are
 DB_PATH = os.environ.get("SOA_BUILDER_DB", "soa_builder_web.db")
 NORMALIZED_ROOT = os.environ.get("SOA_BUILDER_NORMALIZED_ROOT", "normalized")
 
+# Terminology workbooks are parsed with the Rust-backed calamine reader when the
+# optional python-calamine package is installed; None lets pandas pick its default
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
 
-_concept_cache = {"data": None, "fetched_at": 0}
+
+# fetched_at is wall-clock time for display; mono_at (time.monotonic) gates freshness
+_concept_cache = {"data": None, "fetched_at": 0, "mono_at": 0.0}
 _CONCEPT_CACHE_TTL = 60 * 60  # 1 hour TTL
+_BC_HREF_PREFIX = (
+    "https://api.library.cdisc.org/api/cosmos/v2/mdr/bc/biomedicalconcepts/"
+)
 # SDTM dataset specializations cache (similar TTL)
-_sdtm_specializations_cache = {"data": None, "fetched_at": 0}
+_sdtm_specializations_cache = {"data": None, "fetched_at": 0, "mono_at": 0.0}
 _SDTM_SPECIALIZATIONS_CACHE_TTL = 60 * 60
+# Shared keep-alive client for the async CDISC detail pages; opened by the lifespan
+# handler (or lazily on first use) and closed on shutdown
+_HTTP: Optional[httpx.AsyncClient] = None
+# Per-URL response cache for those pages: successes live 5 minutes, upstream errors
+# only 15s so a transient failure is retried soon. Oldest entries evicted past max.
+_URL_CACHE_TTL = 5 * 60
+_URL_CACHE_ERROR_TTL = 15
+_URL_CACHE_MAX = 512
+_url_cache: "OrderedDict[str, tuple[float, httpx.Response]]" = OrderedDict()
+# Single-flight: concurrent requests for one URL await the same upstream fetch
+_url_inflight: dict[str, "asyncio.Task[httpx.Response]"] = {}
 app = FastAPI(title="SoA Builder API", version="0.1.0")
 logger = logging.getLogger("soa_builder.concepts")
 if not logger.handlers:
@@ -90,6 +151,17 @@ STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
 os.makedirs(TEMPLATES_DIR, exist_ok=True)
 os.makedirs(STATIC_DIR, exist_ok=True)
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
+# Templates ship with the package, so skip Jinja's per-lookup mtime check unless
+# SOA_BUILDER_TEMPLATE_RELOAD=1 (handy while editing templates)
+templates.env.auto_reload = os.environ.get("SOA_BUILDER_TEMPLATE_RELOAD") == "1"
+# Compiled templates are cached on disk (a per-user temp directory unless
+# SOA_BUILDER_TEMPLATE_CACHE is set), so restarts and extra workers skip recompiling
+templates.env.bytecode_cache = FileSystemBytecodeCache(
+    os.environ.get("SOA_BUILDER_TEMPLATE_CACHE") or None
+)
+# Fragments rendered on every HTMX concept edit, resolved once at import
+_CONCEPTS_CELL_TPL = templates.get_template("concepts_cell.html")
+_CONCEPT_CHIP_TPL = templates.get_template("concept_chip.html")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 
@@ -113,6 +185,10 @@ _migrate_element_id()
 _migrate_rollback_add_elements_restored()
 _migrate_activity_add_uid()
 _migrate_arm_add_type_fields()
+_migrate_activity_concept_unique()
+_migrate_matrix_indexes()
+_migrate_order_indexes()
+_migrate_terminology_audit_tables()
 _backfill_dataset_date("ddf_terminology", "ddf_terminology_audit")
 _backfill_dataset_date("protocol_terminology", "protocol_terminology_audit")
 
@@ -132,6 +208,25 @@ def _get_concepts_override():
     return os.environ.get("CDISC_CONCEPTS_JSON")
 
 
+@lru_cache(maxsize=8)
+def _cdisc_headers(
+    api_key: Optional[str], subscription_key: Optional[str], accept_json: bool = False
+) -> Mapping[str, str]:
+    """Read-only CDISC Library request headers for the given keys.
+
+    Some CDISC gateways require the subscription key header, others accept bearer /
+    api-key; all are sent when available. Cached per key combination, so changing
+    the environment at runtime still takes effect.
+    """
+    headers = {"Accept": "application/json"} if accept_json else {}
+    if subscription_key:
+        headers["Ocp-Apim-Subscription-Key"] = subscription_key
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+        headers["api-key"] = api_key
+    return MappingProxyType(headers)
+
+
 # Audit functions
 def _record_element_audit(
     soa_id: int,
@@ -139,25 +234,21 @@ def _record_element_audit(
     element_id: Optional[int],
     before: Optional[dict] = None,
     after: Optional[dict] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO element_audit (soa_id, element_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                element_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:  # pragma: no cover
-        logger.warning("Failed recording element audit: %s", e)
+    _write_audit(
+        "INSERT INTO element_audit (soa_id, element_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            element_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "element",
+        conn,
+    )
 
 
 def _record_visit_audit(
@@ -166,25 +257,21 @@ def _record_visit_audit(
     visit_id: Optional[int],
     before: Optional[dict] = None,
     after: Optional[dict] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO visit_audit (soa_id, visit_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                visit_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:  # pragma: no cover
-        logger.warning("Failed recording visit audit: %s", e)
+    _write_audit(
+        "INSERT INTO visit_audit (soa_id, visit_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            visit_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "visit",
+        conn,
+    )
 
 
 def _record_activity_audit(
@@ -193,25 +280,21 @@ def _record_activity_audit(
     activity_id: Optional[int],
     before: Optional[dict] = None,
     after: Optional[dict] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO activity_audit (soa_id, activity_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                activity_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:  # pragma: no cover
-        logger.warning("Failed recording activity audit: %s", e)
+    _write_audit(
+        "INSERT INTO activity_audit (soa_id, activity_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            activity_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "activity",
+        conn,
+    )
 
 
 def _record_epoch_audit(
@@ -220,25 +303,21 @@ def _record_epoch_audit(
     epoch_id: Optional[int],
     before: Optional[dict] = None,
     after: Optional[dict] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO epoch_audit (soa_id, epoch_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                epoch_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:  # pragma: no cover
-        logger.warning("Failed recording epoch audit: %s", e)
+    _write_audit(
+        "INSERT INTO epoch_audit (soa_id, epoch_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            epoch_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "epoch",
+        conn,
+    )
 
 
 def _record_arm_audit(
@@ -247,25 +326,21 @@ def _record_arm_audit(
     arm_id: Optional[int],
     before: Optional[dict] = None,
     after: Optional[dict] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO arm_audit (soa_id, arm_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                arm_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:  # pragma: no cover
-        logger.warning("Failed recording arm audit: %s", e)
+    _write_audit(
+        "INSERT INTO arm_audit (soa_id, arm_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            arm_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "arm",
+        conn,
+    )
 
 
 """Element endpoints moved to routers/elements.py"""
@@ -282,74 +357,66 @@ app.include_router(rollback_router.router)
 
 
 @app.post("/soa/{soa_id}/visits/reorder", response_class=JSONResponse)
-def reorder_visits_api(soa_id: int, order: List[int]):
+def reorder_visits_api(soa_id: ExistingSoa, order: List[int]):
     """JSON reorder endpoint for visits (parity with elements). Body is array of visit IDs in desired order."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     if not order:
         raise HTTPException(400, "Order list required")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM visit WHERE soa_id=? ORDER BY order_index", (soa_id,))
-    old_order = [r[0] for r in cur.fetchall()]
-    cur.execute("SELECT id FROM visit WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(order) - existing:
-        conn.close()
-        raise HTTPException(400, "Order contains invalid visit id")
-    for idx, vid in enumerate(order, start=1):
-        cur.execute("UPDATE visit SET order_index=? WHERE id=?", (idx, vid))
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Take the write lock before reading the old order so the audited order
+        # and the rewrite happen in one transaction
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(
+            "SELECT id FROM visit WHERE soa_id=? ORDER BY order_index", (soa_id,)
+        )
+        old_order = [r[0] for r in cur.fetchall()]
+        existing = set(old_order)
+        if set(order) - existing:
+            raise HTTPException(400, "Order contains invalid visit id")
+        cur.executemany(
+            "UPDATE visit SET order_index=? WHERE id=?",
+            [(idx, vid) for idx, vid in enumerate(order, start=1)],
+        )
+        conn.commit()
     _record_reorder_audit(soa_id, "visit", old_order, order)
     return JSONResponse({"ok": True, "old_order": old_order, "new_order": order})
 
 
 @app.post("/soa/{soa_id}/activities/reorder", response_class=JSONResponse)
-def reorder_activities_api(soa_id: int, order: List[int]):
+def reorder_activities_api(soa_id: ExistingSoa, order: List[int]):
     """JSON reorder endpoint for activities."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     if not order:
         raise HTTPException(400, "Order list required")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id FROM activity WHERE soa_id=? ORDER BY order_index", (soa_id,)
-    )
-    old_order = [r[0] for r in cur.fetchall()]
-    cur.execute("SELECT id FROM activity WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(order) - existing:
-        conn.close()
-        raise HTTPException(400, "Order contains invalid activity id")
-    # Capture before state for audit detail (id -> order_index)
-    before_rows = {
-        r[0]: r[1]
-        for r in cur.execute(
-            "SELECT id, order_index FROM activity WHERE soa_id=?", (soa_id,)
-        ).fetchall()
-    }
-    for idx, aid in enumerate(order, start=1):
-        cur.execute("UPDATE activity SET order_index=? WHERE id=?", (idx, aid))
-    # Prepare after state mapping prior to UID refresh
-    after_rows = {
-        r[0]: r[1]
-        for r in cur.execute(
-            "SELECT id, order_index FROM activity WHERE soa_id=?", (soa_id,)
-        ).fetchall()
-    }
-    # Two-phase UID reassignment to avoid UNIQUE constraint collisions during in-place changes
-    cur.execute(
-        "UPDATE activity SET activity_uid = 'TMP_' || id WHERE soa_id=?",
-        (soa_id,),
-    )
-    cur.execute(
-        "UPDATE activity SET activity_uid = 'Activity_' || order_index WHERE soa_id=?",
-        (soa_id,),
-    )
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Take the write lock before reading the old order so the audited order
+        # and the rewrite happen in one transaction
+        cur.execute("BEGIN IMMEDIATE")
+        # One read yields the old order, the validation set and the before state
+        # for audit detail (id -> order_index)
+        cur.execute(
+            "SELECT id, order_index FROM activity WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
+        )
+        before_rows = dict(cur.fetchall())
+        old_order = list(before_rows)
+        if set(order) - before_rows.keys():
+            raise HTTPException(400, "Order contains invalid activity id")
+        new_positions = [(idx, aid) for idx, aid in enumerate(order, start=1)]
+        cur.executemany("UPDATE activity SET order_index=? WHERE id=?", new_positions)
+        # After state follows from the update: listed ids take their new position
+        after_rows = dict(before_rows)
+        after_rows.update((aid, idx) for idx, aid in new_positions)
+        # Two-phase UID reassignment to avoid UNIQUE constraint collisions during in-place changes
+        cur.execute(
+            "UPDATE activity SET activity_uid = 'TMP_' || id WHERE soa_id=?",
+            (soa_id,),
+        )
+        cur.execute(
+            "UPDATE activity SET activity_uid = 'Activity_' || order_index WHERE soa_id=?",
+            (soa_id,),
+        )
+        conn.commit()
     _record_reorder_audit(soa_id, "activity", old_order, order)
     # Activity-level audit entry capturing each id's order change list
     reorder_details = [
@@ -378,27 +445,27 @@ class FreezeCreate(BaseModel):
     version_label: Optional[str] = None
 
 
-def _list_freezes(soa_id: int):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, version_label, created_at FROM soa_freeze WHERE soa_id=? ORDER BY id DESC",
-        (soa_id,),
-    )
-    rows = [dict(id=r[0], version_label=r[1], created_at=r[2]) for r in cur.fetchall()]
-    conn.close()
+def _list_freezes(soa_id: int, conn: Optional[sqlite3.Connection] = None):
+    with nullcontext(conn) if conn is not None else pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, version_label, created_at FROM soa_freeze WHERE soa_id=? ORDER BY id DESC",
+            (soa_id,),
+        )
+        rows = [
+            dict(id=r[0], version_label=r[1], created_at=r[2]) for r in cur.fetchall()
+        ]
     return rows
 
 
-def _get_freeze(soa_id: int, freeze_id: int):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, version_label, created_at, snapshot_json FROM soa_freeze WHERE id=? AND soa_id=?",
-        (freeze_id, soa_id),
-    )
-    row = cur.fetchone()
-    conn.close()
+def _get_freeze(soa_id: int, freeze_id: int, conn: Optional[sqlite3.Connection] = None):
+    with nullcontext(conn) if conn is not None else pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, version_label, created_at, snapshot_json FROM soa_freeze WHERE id=? AND soa_id=?",
+            (freeze_id, soa_id),
+        )
+        row = cur.fetchone()
     if not row:
         return None
     try:
@@ -417,104 +484,95 @@ def _create_freeze(soa_id: int, version_label: Optional[str]):
     if not _soa_exists(soa_id):
         raise HTTPException(404, "SOA not found")
     # Auto version label if not provided
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT version_label FROM soa_freeze WHERE soa_id=?", (soa_id,))
-    existing_labels = {r[0] for r in cur.fetchall()}
-    if not version_label or not version_label.strip():
-        # Find next available vN
-        n = 1
-        while f"v{n}" in existing_labels:
-            n += 1
-        version_label = f"v{n}"
-    else:
-        version_label = version_label.strip()
-    if version_label in existing_labels:
-        raise HTTPException(400, "Version label already exists for this SOA")
-    # Gather snapshot data
-    cur.execute(
-        "SELECT name, created_at, study_id, study_label, study_description FROM soa WHERE id=?",
-        (soa_id,),
-    )
-    row = cur.fetchone()
-    soa_name = row[0] if row else f"SOA {soa_id}"
-    study_id_val = row[2] if row else None
-    study_label_val = row[3] if row else None
-    study_description_val = row[4] if row else None
-    visits, activities, cells = _fetch_matrix(soa_id)
-    # Epochs snapshot (ordered)
-    conn2 = _connect()
-    cur2 = conn2.cursor()
-    cur2.execute(
-        "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    epochs = [
-        dict(
-            id=r[0],
-            name=r[1],
-            order_index=r[2],
-            epoch_seq=r[3],
-            epoch_label=r[4],
-            epoch_description=r[5],
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT version_label FROM soa_freeze WHERE soa_id=?", (soa_id,))
+        existing_labels = {r[0] for r in cur.fetchall()}
+        if not version_label or not version_label.strip():
+            # Find next available vN
+            n = 1
+            while f"v{n}" in existing_labels:
+                n += 1
+            version_label = f"v{n}"
+        else:
+            version_label = version_label.strip()
+        if version_label in existing_labels:
+            raise HTTPException(400, "Version label already exists for this SOA")
+        # Gather snapshot data
+        cur.execute(
+            "SELECT name, created_at, study_id, study_label, study_description FROM soa WHERE id=?",
+            (soa_id,),
         )
-        for r in cur2.fetchall()
-    ]
-    conn2.close()
-    # Elements snapshot (ordered)
-    conn_el = _connect()
-    cur_el = conn_el.cursor()
-    cur_el.execute(
-        "SELECT id,name,label,description,testrl,teenrl,order_index FROM element WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    elements = [
-        dict(
-            id=r[0],
-            name=r[1],
-            label=r[2],
-            description=r[3],
-            testrl=r[4],
-            teenrl=r[5],
-            order_index=r[6],
+        row = cur.fetchone()
+        soa_name = row[0] if row else f"SOA {soa_id}"
+        study_id_val = row[2] if row else None
+        study_label_val = row[3] if row else None
+        study_description_val = row[4] if row else None
+        visits, activities, cells = _fetch_matrix(soa_id, conn)
+        # Epochs snapshot (ordered)
+        cur.execute(
+            "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
         )
-        for r in cur_el.fetchall()
-    ]
-    conn_el.close()
-    # Concept mapping
-    activity_ids = [a["id"] for a in activities]
-    concepts_map = {}
-    if activity_ids:
-        placeholders = ",".join("?" for _ in activity_ids)
+        epochs = [
+            dict(
+                id=r[0],
+                name=r[1],
+                order_index=r[2],
+                epoch_seq=r[3],
+                epoch_label=r[4],
+                epoch_description=r[5],
+            )
+            for r in cur.fetchall()
+        ]
+        # Elements snapshot (ordered)
+        cur.execute(
+            "SELECT id,name,label,description,testrl,teenrl,order_index FROM element WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
+        )
+        elements = [
+            dict(
+                id=r[0],
+                name=r[1],
+                label=r[2],
+                description=r[3],
+                testrl=r[4],
+                teenrl=r[5],
+                order_index=r[6],
+            )
+            for r in cur.fetchall()
+        ]
+        # Concept mapping; scoped by soa_id so the SQL text is constant and stays cached
+        concepts_map = defaultdict(list)
         cur.execute(
-            f"SELECT activity_id, concept_code, concept_title FROM activity_concept WHERE activity_id IN ({placeholders})",
-            activity_ids,
+            "SELECT ac.activity_id, ac.concept_code, ac.concept_title FROM activity_concept ac "
+            "JOIN activity a ON a.id=ac.activity_id WHERE a.soa_id=?",
+            (soa_id,),
         )
         for aid, code, title in cur.fetchall():
-            concepts_map.setdefault(aid, []).append({"code": code, "title": title})
-    snapshot = {
-        "soa_id": soa_id,
-        "soa_name": soa_name,
-        "study_id": study_id_val,
-        "study_label": study_label_val,
-        "study_description": study_description_val,
-        "version_label": version_label,
-        "frozen_at": datetime.now(timezone.utc).isoformat(),
-        "epochs": epochs,
-        "elements": elements,
-        "visits": visits,
-        "activities": activities,
-        "cells": cells,
-        "activity_concepts": concepts_map,
-    }
-    snap_json = json.dumps(snapshot)
-    cur.execute(
-        "INSERT INTO soa_freeze (soa_id, version_label, created_at, snapshot_json) VALUES (?,?,?,?)",
-        (soa_id, version_label, datetime.now(timezone.utc).isoformat(), snap_json),
-    )
-    fid = cur.lastrowid
-    conn.commit()
-    conn.close()
+            concepts_map[aid].append({"code": code, "title": title})
+        snapshot = {
+            "soa_id": soa_id,
+            "soa_name": soa_name,
+            "study_id": study_id_val,
+            "study_label": study_label_val,
+            "study_description": study_description_val,
+            "version_label": version_label,
+            "frozen_at": datetime.now(timezone.utc).isoformat(),
+            "epochs": epochs,
+            "elements": elements,
+            "visits": visits,
+            "activities": activities,
+            "cells": cells,
+            "activity_concepts": concepts_map,
+        }
+        snap_json = json.dumps(snapshot)
+        cur.execute(
+            "INSERT INTO soa_freeze (soa_id, version_label, created_at, snapshot_json) VALUES (?,?,?,?)",
+            (soa_id, version_label, datetime.now(timezone.utc).isoformat(), snap_json),
+        )
+        fid = cur.lastrowid
+        conn.commit()
     return fid, version_label
 
 
@@ -529,6 +587,11 @@ def _diff_freezes_limited(
     right = _get_freeze(soa_id, right_id)
     if not left or not right:
         raise HTTPException(404, "Freeze not found")
+    return _diff_freeze_pair(left, right, limit)
+
+
+def _diff_freeze_pair(left: dict, right: dict, limit: Optional[int]):
+    """Diff two freezes already loaded with _get_freeze."""
     l_snap = left["snapshot"]
     r_snap = right["snapshot"]
     # Visits
@@ -698,92 +761,94 @@ def _rollback_freeze(soa_id: int, freeze_id: int) -> dict:
     cells = snap.get("cells", [])
     elements = snap.get("elements", [])
     concepts_map = snap.get("activity_concepts", {}) or {}
-    conn = _connect()
-    cur = conn.cursor()
-    # Clear existing
-    # Order matters: delete cells, then concepts (while activity rows still exist), then activities, then visits.
-    cur.execute("DELETE FROM matrix_cells WHERE soa_id=?", (soa_id,))
-    cur.execute(
-        "DELETE FROM activity_concept WHERE activity_id IN (SELECT id FROM activity WHERE soa_id=? )",
-        (soa_id,),
-    )
-    cur.execute("DELETE FROM activity WHERE soa_id=?", (soa_id,))
-    cur.execute("DELETE FROM visit WHERE soa_id=?", (soa_id,))
-    cur.execute("DELETE FROM element WHERE soa_id=?", (soa_id,))
-    # Reinsert visits mapping old id->new id
-    visit_id_map = {}
-    for v in sorted(visits, key=lambda x: x.get("order_index", 0)):
-        cur.execute(
-            "INSERT INTO visit (soa_id,name,raw_header,order_index) VALUES (?,?,?,?)",
-            (
-                soa_id,
-                v.get("name"),
-                v.get("raw_header") or v.get("name"),
-                v.get("order_index"),
-            ),
-        )
-        new_id = cur.lastrowid
-        visit_id_map[v.get("id")] = new_id
-    # Reinsert activities mapping old id->new id
-    activity_id_map = {}
-    for a in sorted(activities, key=lambda x: x.get("order_index", 0)):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Clear existing
+        # Order matters: delete cells, then concepts (while activity rows still exist), then activities, then visits.
+        cur.execute("DELETE FROM matrix_cells WHERE soa_id=?", (soa_id,))
         cur.execute(
-            "INSERT INTO activity (soa_id,name,order_index) VALUES (?,?,?)",
-            (soa_id, a.get("name"), a.get("order_index")),
+            "DELETE FROM activity_concept WHERE activity_id IN (SELECT id FROM activity WHERE soa_id=? )",
+            (soa_id,),
         )
-        new_id = cur.lastrowid
-        activity_id_map[a.get("id")] = new_id
-    # Reinsert cells
-    inserted_cells = 0
-    for c in cells:
-        old_vid = c.get("visit_id")
-        old_aid = c.get("activity_id")
-        status = c.get("status", "").strip()
-        if status == "":
-            continue
-        vid = visit_id_map.get(old_vid)
-        aid = activity_id_map.get(old_aid)
-        if vid and aid:
+        cur.execute("DELETE FROM activity WHERE soa_id=?", (soa_id,))
+        cur.execute("DELETE FROM visit WHERE soa_id=?", (soa_id,))
+        cur.execute("DELETE FROM element WHERE soa_id=?", (soa_id,))
+        # Reinsert visits mapping old id->new id
+        visit_id_map = {}
+        for v in sorted(visits, key=lambda x: x.get("order_index", 0)):
             cur.execute(
-                "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?)",
-                (soa_id, vid, aid, status),
+                "INSERT INTO visit (soa_id,name,raw_header,order_index) VALUES (?,?,?,?)",
+                (
+                    soa_id,
+                    v.get("name"),
+                    v.get("raw_header") or v.get("name"),
+                    v.get("order_index"),
+                ),
             )
-            inserted_cells += 1
-    # Reinsert concepts
-    # Reinsert elements
-    elements_restored = 0
-    for el in sorted(elements, key=lambda x: x.get("order_index", 0)):
-        cur.execute(
-            "INSERT INTO element (soa_id,name,label,description,testrl,teenrl,order_index,created_at) VALUES (?,?,?,?,?,?,?,?)",
-            (
-                soa_id,
-                el.get("name"),
-                el.get("label"),
-                el.get("description"),
-                el.get("testrl"),
-                el.get("teenrl"),
-                el.get("order_index"),
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        elements_restored += 1
-    inserted_concepts = 0
-    for old_aid, concept_list in concepts_map.items():
-        new_aid = activity_id_map.get(int(old_aid))
-        if not new_aid:
-            continue
-        for c in concept_list:
-            code = c.get("code")
-            title = c.get("title") or code
-            if not code:
+            new_id = cur.lastrowid
+            visit_id_map[v.get("id")] = new_id
+        # Reinsert activities mapping old id->new id
+        activity_id_map = {}
+        for a in sorted(activities, key=lambda x: x.get("order_index", 0)):
+            cur.execute(
+                "INSERT INTO activity (soa_id,name,order_index) VALUES (?,?,?)",
+                (soa_id, a.get("name"), a.get("order_index")),
+            )
+            new_id = cur.lastrowid
+            activity_id_map[a.get("id")] = new_id
+        # Reinsert cells
+        inserted_cells = 0
+        for c in cells:
+            old_vid = c.get("visit_id")
+            old_aid = c.get("activity_id")
+            status = c.get("status", "").strip()
+            if status == "":
                 continue
+            vid = visit_id_map.get(old_vid)
+            aid = activity_id_map.get(old_aid)
+            if vid and aid:
+                # Snapshots taken before the unique cell index may repeat a cell
+                cur.execute(
+                    "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?) "
+                    "ON CONFLICT(soa_id, visit_id, activity_id) DO UPDATE SET status=excluded.status",
+                    (soa_id, vid, aid, status),
+                )
+                inserted_cells += 1
+        # Reinsert concepts
+        # Reinsert elements
+        elements_restored = 0
+        for el in sorted(elements, key=lambda x: x.get("order_index", 0)):
             cur.execute(
-                "INSERT INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
-                (new_aid, code, title),
+                "INSERT INTO element (soa_id,name,label,description,testrl,teenrl,order_index,created_at) VALUES (?,?,?,?,?,?,?,?)",
+                (
+                    soa_id,
+                    el.get("name"),
+                    el.get("label"),
+                    el.get("description"),
+                    el.get("testrl"),
+                    el.get("teenrl"),
+                    el.get("order_index"),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
             )
-            inserted_concepts += 1
-    conn.commit()
-    conn.close()
+            elements_restored += 1
+        inserted_concepts = 0
+        for old_aid, concept_list in concepts_map.items():
+            new_aid = activity_id_map.get(int(old_aid))
+            if not new_aid:
+                continue
+            for c in concept_list:
+                code = c.get("code")
+                title = c.get("title") or code
+                if not code:
+                    continue
+                # Snapshots taken before ux_activity_concept may repeat a code
+                cur.execute(
+                    "INSERT OR IGNORE INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
+                    (new_aid, code, title),
+                )
+                inserted_concepts += cur.rowcount
+        conn.commit()
     return {
         "rollback_freeze_id": freeze_id,
         "visits_restored": len(visits),
@@ -795,23 +860,22 @@ def _rollback_freeze(soa_id: int, freeze_id: int) -> dict:
 
 
 def _record_rollback_audit(soa_id: int, freeze_id: int, stats: dict):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO rollback_audit (soa_id, freeze_id, performed_at, visits_restored, activities_restored, cells_restored, concepts_restored, elements_restored) VALUES (?,?,?,?,?,?,?,?)",
-        (
-            soa_id,
-            freeze_id,
-            datetime.now(timezone.utc).isoformat(),
-            stats.get("visits_restored"),
-            stats.get("activities_restored"),
-            stats.get("cells_restored"),
-            stats.get("concept_mappings_restored"),
-            stats.get("elements_restored"),
-        ),
-    )
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO rollback_audit (soa_id, freeze_id, performed_at, visits_restored, activities_restored, cells_restored, concepts_restored, elements_restored) VALUES (?,?,?,?,?,?,?,?)",
+            (
+                soa_id,
+                freeze_id,
+                datetime.now(timezone.utc).isoformat(),
+                stats.get("visits_restored"),
+                stats.get("activities_restored"),
+                stats.get("cells_restored"),
+                stats.get("concept_mappings_restored"),
+                stats.get("elements_restored"),
+            ),
+        )
+        conn.commit()
 
 
 def _record_reorder_audit(
@@ -825,60 +889,57 @@ def _record_reorder_audit(
       old_order: list of IDs before reorder (ascending order_index)
       new_order: list of IDs after reorder (ascending order_index)
     """
-    try:
-        if old_order == new_order:
-            return  # no change
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO reorder_audit (soa_id, entity_type, old_order_json, new_order_json, performed_at) VALUES (?,?,?,?,?)",
-            (
-                soa_id,
-                entity_type,
-                json.dumps(old_order),
-                json.dumps(new_order),
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except (
-        Exception
-    ) as e:  # pragma: no cover - audit failure should not break core flow
-        logger.warning("Failed to record reorder audit: %s", e)
-
-
-def _list_reorder_audit(soa_id: int) -> list[dict]:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, entity_type, old_order_json, new_order_json, performed_at FROM reorder_audit WHERE soa_id=? ORDER BY id DESC",
-        (soa_id,),
+    if old_order == new_order:
+        return  # no change
+    _write_audit(
+        "INSERT INTO reorder_audit (soa_id, entity_type, old_order_json, new_order_json, performed_at) VALUES (?,?,?,?,?)",
+        (
+            soa_id,
+            entity_type,
+            json.dumps(old_order),
+            json.dumps(new_order),
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "reorder",
     )
-    rows = [
-        {
-            "id": r[0],
-            "entity_type": r[1],
-            "old_order": json.loads(r[2]) if r[2] else [],
-            "new_order": json.loads(r[3]) if r[3] else [],
-            "performed_at": r[4],
-        }
-        for r in cur.fetchall()
-    ]
-    conn.close()
-    return rows
 
 
-def _fetch_arms_for_edit(soa_id: int) -> list[dict]:
-    """Return ordered arms for edit template."""
-    try:
-        conn = _connect()
+def _list_reorder_audit(soa_id: int) -> list[dict]:
+    flush_audit()
+    with pooled_conn() as conn:
         cur = conn.cursor()
         cur.execute(
-            "SELECT id,name,label,description,order_index FROM arm WHERE soa_id=? ORDER BY order_index",
+            "SELECT id, entity_type, old_order_json, new_order_json, performed_at FROM reorder_audit WHERE soa_id=? ORDER BY id DESC",
             (soa_id,),
         )
         rows = [
+            {
+                "id": r[0],
+                "entity_type": r[1],
+                "old_order": json.loads(r[2]) if r[2] else [],
+                "new_order": json.loads(r[3]) if r[3] else [],
+                "performed_at": r[4],
+            }
+            for r in cur.fetchall()
+        ]
+    return rows
+
+
+def _fetch_arms_for_edit(
+    soa_id: int, conn: Optional[sqlite3.Connection] = None
+) -> list[dict]:
+    """Return ordered arms for edit template; a supplied ``conn`` is left open."""
+    with nullcontext(conn) if conn is not None else pooled_conn() as conn:
+        try:
+            cur = conn.execute(
+                "SELECT id,name,label,description,order_index FROM arm WHERE soa_id=? ORDER BY order_index",
+                (soa_id,),
+            )
+        except sqlite3.OperationalError as e:
+            # Databases predating the arm table render without arms
+            logger.warning("Failed fetching arms for SOA %s: %s", soa_id, e)
+            return []
+        return [
             {
                 "id": r[0],
                 "name": r[1],
@@ -888,32 +949,29 @@ def _fetch_arms_for_edit(soa_id: int) -> list[dict]:
             }
             for r in cur.fetchall()
         ]
-        conn.close()
-        return rows
-    except Exception:
-        return []
 
 
-def _list_rollback_audit(soa_id: int) -> list[dict]:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, freeze_id, performed_at, visits_restored, activities_restored, cells_restored, concepts_restored FROM rollback_audit WHERE soa_id=? ORDER BY id DESC",
-        (soa_id,),
-    )
-    rows = [
-        {
-            "id": r[0],
-            "freeze_id": r[1],
-            "performed_at": r[2],
-            "visits_restored": r[3],
-            "activities_restored": r[4],
-            "cells_restored": r[5],
-            "concepts_restored": r[6],
-        }
-        for r in cur.fetchall()
-    ]
-    conn.close()
+def _list_rollback_audit(
+    soa_id: int, conn: Optional[sqlite3.Connection] = None
+) -> list[dict]:
+    with nullcontext(conn) if conn is not None else pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, freeze_id, performed_at, visits_restored, activities_restored, cells_restored, concepts_restored FROM rollback_audit WHERE soa_id=? ORDER BY id DESC",
+            (soa_id,),
+        )
+        rows = [
+            {
+                "id": r[0],
+                "freeze_id": r[1],
+                "performed_at": r[2],
+                "visits_restored": r[3],
+                "activities_restored": r[4],
+                "cells_restored": r[5],
+                "concepts_restored": r[6],
+            }
+            for r in cur.fetchall()
+        ]
     return rows
 
 
@@ -965,38 +1023,36 @@ class MatrixImport(BaseModel):
 # --------------------- Helpers ---------------------
 
 
-def _soa_exists(soa_id: int) -> bool:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM soa WHERE id=?", (soa_id,))
-    row = cur.fetchone()
-    conn.close()
-    return row is not None
-
+def _fetch_matrix(soa_id: int, conn: Optional[sqlite3.Connection] = None):
+    """Return (visits, activities, cells) for an SOA.
 
-def _fetch_matrix(soa_id: int):
-    conn = _connect()
-    cur = conn.cursor()
-    # Epochs not part of matrix axes currently; retrieved separately where needed.
-    cur.execute(
-        "SELECT id,name,raw_header,order_index,epoch_id FROM visit WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    visits = [
-        dict(id=r[0], name=r[1], raw_header=r[2], order_index=r[3], epoch_id=r[4])
-        for r in cur.fetchall()
-    ]
-    cur.execute(
-        "SELECT id,name,order_index FROM activity WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    activities = [dict(id=r[0], name=r[1], order_index=r[2]) for r in cur.fetchall()]
-    cur.execute(
-        "SELECT visit_id, activity_id, status FROM matrix_cells WHERE soa_id=?",
-        (soa_id,),
-    )
-    cells = [dict(visit_id=r[0], activity_id=r[1], status=r[2]) for r in cur.fetchall()]
-    conn.close()
+    When ``conn`` is supplied it is reused and left open for the caller.
+    """
+    with nullcontext(conn) if conn is not None else pooled_conn() as conn:
+        cur = conn.cursor()
+        # Epochs not part of matrix axes currently; retrieved separately where needed.
+        cur.execute(
+            "SELECT id,name,raw_header,order_index,epoch_id FROM visit WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
+        )
+        visits = [
+            dict(id=r[0], name=r[1], raw_header=r[2], order_index=r[3], epoch_id=r[4])
+            for r in cur.fetchall()
+        ]
+        cur.execute(
+            "SELECT id,name,order_index FROM activity WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
+        )
+        activities = [
+            dict(id=r[0], name=r[1], order_index=r[2]) for r in cur.fetchall()
+        ]
+        cur.execute(
+            "SELECT visit_id, activity_id, status FROM matrix_cells WHERE soa_id=?",
+            (soa_id,),
+        )
+        cells = [
+            dict(visit_id=r[0], activity_id=r[1], status=r[2]) for r in cur.fetchall()
+        ]
     return visits, activities, cells
 
 
@@ -1008,15 +1064,9 @@ def fetch_biomedical_concept_categories() -> list[dict]:
     """
     url = "https://api.library.cdisc.org/api/cosmos/v2/mdr/bc/categories"
     base_prefix = "https://api.library.cdisc.org/api/cosmos/v2"
-    headers = {"Accept": "application/json"}
     api_key = _get_cdisc_api_key()
     subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
-    # Some CDISC gateways require subscription key header, others accept bearer/api-key; send all when available.
-    if subscription_key:
-        headers["Ocp-Apim-Subscription-Key"] = subscription_key
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"  # bearer token style
-        headers["api-key"] = api_key  # fallback header name
+    headers = _cdisc_headers(api_key, subscription_key, accept_json=True)
 
     def _normalize_href(h: Optional[str]) -> Optional[str]:
         if not h:
@@ -1090,14 +1140,9 @@ def fetch_biomedical_concepts_by_category(name: str) -> list[dict]:
     decoded_once = urllib.parse.unquote(category)
     encoded = requests.utils.quote(decoded_once, safe="")
     url = f"{base_prefix}/mdr/bc/biomedicalconcepts?category={encoded}"
-    headers = {"Accept": "application/json"}
     api_key = _get_cdisc_api_key()
     subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
-    if subscription_key:
-        headers["Ocp-Apim-Subscription-Key"] = subscription_key
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-        headers["api-key"] = api_key
+    headers = _cdisc_headers(api_key, subscription_key, accept_json=True)
 
     def _normalize_href(h: Optional[str]) -> Optional[str]:
         if not h:
@@ -1216,13 +1261,13 @@ def fetch_biomedical_concepts(force: bool = False):
     Precedence: CDISC_CONCEPTS_JSON env override (for tests/offline) > cached remote fetch > empty list.
     Remote fetch uses CDISC_API_KEY header if present. Caches for TTL duration.
     """
-    now = time.time()
     if (
         not force
         and _concept_cache["data"]
-        and now - _concept_cache["fetched_at"] < _CONCEPT_CACHE_TTL
+        and time.monotonic() - _concept_cache.get("mono_at", 0.0) < _CONCEPT_CACHE_TTL
     ):
         return _concept_cache["data"]
+    now = time.time()
     # Environment override
     override_json = _get_concepts_override()
     if override_json:
@@ -1244,7 +1289,9 @@ def fetch_biomedical_concepts(force: bool = False):
                 if code:
                     concepts.append({"code": str(code), "title": str(title)})
             concepts.sort(key=lambda c: c["title"].lower())
-            _concept_cache.update(data=concepts, fetched_at=now)
+            _concept_cache.update(
+                data=concepts, fetched_at=now, mono_at=time.monotonic()
+            )
             logger.info("Loaded %d concepts from env override", len(concepts))
             return concepts
         except Exception:
@@ -1255,15 +1302,9 @@ def fetch_biomedical_concepts(force: bool = False):
         logger.warning("CDISC_SKIP_REMOTE=1; concept list empty")
         return []
     url = "https://api.library.cdisc.org/api/cosmos/v2/mdr/bc/biomedicalconcepts"
-    headers = {"Accept": "application/json"}
     api_key = _get_cdisc_api_key()
     subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
-    # Some CDISC gateways require subscription key header, others accept bearer/api-key; send all when available.
-    if subscription_key:
-        headers["Ocp-Apim-Subscription-Key"] = subscription_key
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"  # bearer token style
-        headers["api-key"] = api_key  # fallback header name
+    headers = _cdisc_headers(api_key, subscription_key, accept_json=True)
     try:
         resp = requests.get(url, headers=headers, timeout=15)
         _concept_cache["last_status"] = resp.status_code
@@ -1349,7 +1390,9 @@ def fetch_biomedical_concepts(force: bool = False):
                 if code:
                     concepts.append({"code": str(code), "title": str(title)})
             concepts.sort(key=lambda c: c["title"].lower())
-            _concept_cache.update(data=concepts, fetched_at=now)
+            _concept_cache.update(
+                data=concepts, fetched_at=now, mono_at=time.monotonic()
+            )
             logger.info("Fetched %d concepts from remote API", len(concepts))
             return concepts
         else:
@@ -1362,6 +1405,21 @@ def fetch_biomedical_concepts(force: bool = False):
     return []
 
 
+# code -> title map for the list currently held in _concept_cache; rebuilt only when
+# fetch_biomedical_concepts hands back a different list (refresh or TTL expiry).
+_concept_lookup_cache = {"source": None, "lookup": {}}
+
+
+def _concepts_snapshot() -> tuple[list, dict]:
+    """Return (concepts, {code: title}) without rebuilding the map on every request."""
+    concepts = fetch_biomedical_concepts()
+    if _concept_lookup_cache["source"] is not concepts:
+        _concept_lookup_cache.update(
+            source=concepts, lookup={c["code"]: c["title"] for c in concepts}
+        )
+    return concepts, _concept_lookup_cache["lookup"]
+
+
 def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
     """Return list of SDTM dataset specializations as [{'title':..., 'href':...}].
 
@@ -1393,14 +1451,9 @@ def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
             f"{base_prefix}/mdr/specializations/datasetspecializations"
             f"?biomedicalconcept={code}"
         )
-        headers = {"Accept": "application/json"}
         api_key = _get_cdisc_api_key()
         subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
-        if subscription_key:
-            headers["Ocp-Apim-Subscription-Key"] = subscription_key
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
-            headers["api-key"] = api_key
+        headers = _cdisc_headers(api_key, subscription_key, accept_json=True)
 
         try:
             resp = requests.get(url, headers=headers, timeout=20)
@@ -1462,7 +1515,7 @@ def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
     if (
         not force
         and _sdtm_specializations_cache["data"]
-        and now - _sdtm_specializations_cache["fetched_at"]
+        and time.monotonic() - _sdtm_specializations_cache.get("mono_at", 0.0)
         < _SDTM_SPECIALIZATIONS_CACHE_TTL
     ):
         return _sdtm_specializations_cache["data"]
@@ -1511,7 +1564,9 @@ def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
                 href = _normalize_href(href)
                 packages.append({"title": title, "href": href})
             packages.sort(key=lambda p: p.get("title", "").lower())
-            _sdtm_specializations_cache.update(data=packages, fetched_at=now)
+            _sdtm_specializations_cache.update(
+                data=packages, fetched_at=now, mono_at=time.monotonic()
+            )
             logger.info(
                 "Loaded %d SDTM dataset specializations from override", len(packages)
             )
@@ -1526,14 +1581,9 @@ def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
         return []
 
     url = f"{base_prefix}/mdr/specializations/sdtm/datasetspecializations"  # full SDTM list
-    headers = {"Accept": "application/json"}
     api_key = _get_cdisc_api_key()
     subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
-    if subscription_key:
-        headers["Ocp-Apim-Subscription-Key"] = subscription_key
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-        headers["api-key"] = api_key
+    headers = _cdisc_headers(api_key, subscription_key, accept_json=True)
 
     packages: list[dict] = []
     try:
@@ -1623,7 +1673,9 @@ def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
         _sdtm_specializations_cache["last_error"] = str(e)
 
     packages.sort(key=lambda p: p.get("title", "").lower())
-    _sdtm_specializations_cache.update(data=packages, fetched_at=now)
+    _sdtm_specializations_cache.update(
+        data=packages, fetched_at=now, mono_at=time.monotonic()
+    )
     logger.info(
         "Fetched %d SDTM dataset specializations from remote API (full list)",
         len(packages),
@@ -1631,6 +1683,48 @@ def fetch_sdtm_specializations(force: bool = False, code: Optional[str] = None):
     return packages
 
 
+def _http_client() -> httpx.AsyncClient:
+    global _HTTP
+    if _HTTP is None or _HTTP.is_closed:
+        _HTTP = httpx.AsyncClient(
+            timeout=15,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _HTTP
+
+
+async def _cached_get(
+    url: str, headers: dict, timeout: Optional[float] = None, force: bool = False
+) -> httpx.Response:
+    """GET ``url`` through the shared client, served from ``_url_cache`` when fresh.
+
+    Transport exceptions are not cached and propagate to every waiting caller.
+    """
+    if not force:
+        hit = _url_cache.get(url)
+        if hit and hit[0] > time.monotonic():
+            _url_cache.move_to_end(url)
+            return hit[1]
+    task = _url_inflight.get(url)
+    if task is not None:
+        return await asyncio.shield(task)
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    task = asyncio.ensure_future(_http_client().get(url, headers=headers, **kwargs))
+    _url_inflight[url] = task
+    try:
+        # Shielded so a disconnecting client does not cancel the fetch for the others
+        resp = await asyncio.shield(task)
+    finally:
+        if _url_inflight.get(url) is task:
+            del _url_inflight[url]
+    ttl = _URL_CACHE_TTL if resp.status_code == 200 else _URL_CACHE_ERROR_TTL
+    _url_cache[url] = (time.monotonic() + ttl, resp)
+    _url_cache.move_to_end(url)
+    while len(_url_cache) > _URL_CACHE_MAX:
+        _url_cache.popitem(last=False)
+    return resp
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pragma: no cover
     """FastAPI lifespan context replacing deprecated startup event.
@@ -1639,18 +1733,31 @@ async def lifespan(app: FastAPI):  # pragma: no cover
     specializations) so first request uses warm caches. Errors are logged but
     never raised to avoid blocking application startup.
     """
-    try:
-        concepts = fetch_biomedical_concepts(force=True)
+    # Both fetches are independent network calls; run them in worker threads concurrently
+    concepts, sdtm_specs = await asyncio.gather(
+        asyncio.to_thread(fetch_biomedical_concepts, force=True),
+        asyncio.to_thread(fetch_sdtm_specializations, force=True),
+        return_exceptions=True,
+    )
+    if isinstance(concepts, Exception):
+        logger.error("Lifespan concept preload failed: %s", concepts)
+    else:
         logger.info("Lifespan preload concepts count=%d", len(concepts))
-    except Exception as e:
-        logger.error("Lifespan concept preload failed: %s", e)
-    try:
-        sdtm_specs = fetch_sdtm_specializations(force=True)
+    if isinstance(sdtm_specs, Exception):
+        logger.error("Lifespan SDTM specializations preload failed: %s", sdtm_specs)
+    else:
         logger.info("Lifespan preload SDTM specializations count=%d", len(sdtm_specs))
-    except Exception as e:
-        logger.error("Lifespan SDTM specializations preload failed: %s", e)
+    _POOL.prewarm()
+    _http_client()
+    # Compile (or load from the bytecode cache) every page template up front so the
+    # first request for each page does not pay for it
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.get_template(name)
     yield
-    # No shutdown actions required presently.
+    flush_audit()
+    _POOL.close_all()
+    if _HTTP is not None:
+        await _HTTP.aclose()
 
 
 # Register lifespan handler (keeps existing app instantiation location)
@@ -1658,54 +1765,72 @@ app.router.lifespan_context = lifespan
 
 
 @app.post("/ui/soa/{soa_id}/concepts_refresh")
-def ui_refresh_concepts(request: Request, soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def ui_refresh_concepts(request: Request, soa_id: ExistingSoa):
     fetch_biomedical_concepts(force=True)
     # If HTMX request, use HX-Redirect header for clean redirect without injecting script
     if request.headers.get("HX-Request") == "true":
         return HTMLResponse("", headers={"HX-Redirect": f"/ui/soa/{soa_id}/edit"})
-    # Fallback: plain form POST non-htmx redirect via script
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    # Plain form POST: 303 See Other back to the edit page
+    return RedirectResponse(url=f"/ui/soa/{soa_id}/edit", status_code=303)
 
 
 """Freeze & rollback endpoints moved to routers/freezes.py and routers/rollback.py"""
 
 
+_REORDER_AUDIT_CSV_HEADER = (
+    "id",
+    "entity_type",
+    "performed_at",
+    "old_order",
+    "new_order",
+    "moves",
+)
+
+
 @app.get("/soa/{soa_id}/reorder_audit/export/csv")
-def export_reorder_audit_csv(soa_id: int):
+def export_reorder_audit_csv(soa_id: ExistingSoa):
     """Export reorder audit history to CSV."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    rows = _list_reorder_audit(soa_id)
-    # Prepare CSV lines
-    header = ["id", "entity_type", "performed_at", "old_order", "new_order", "moves"]
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(header)
-    for r in rows:
-        old_order = r.get("old_order", [])
-        new_order = r.get("new_order", [])
-        moves = []
-        old_pos = {vid: idx + 1 for idx, vid in enumerate(old_order)}
-        for idx, vid in enumerate(new_order, start=1):
-            op = old_pos.get(vid)
-            if op and op != idx:
-                moves.append(f"{vid}:{op}->{idx}")
-        writer.writerow(
-            [
-                r.get("id"),
-                r.get("entity_type"),
-                r.get("performed_at"),
-                ",".join(map(str, old_order)),
-                ",".join(map(str, new_order)),
-                "; ".join(moves) if moves else "",
-            ]
-        )
-    output.seek(0)
+    flush_audit()
+
+    def _iter_csv():
+        # Reuse one small buffer; each row is read off the cursor, encoded and yielded
+        # as soon as it is written, so the history is never held in memory at once
+        buf = io.StringIO()
+        writerow = csv.writer(buf).writerow
+        writerow(_REORDER_AUDIT_CSV_HEADER)
+        yield buf.getvalue().encode("utf-8")
+        with pooled_conn() as conn:
+            cur = conn.execute(
+                "SELECT id, entity_type, performed_at, old_order_json, new_order_json "
+                "FROM reorder_audit WHERE soa_id=? ORDER BY id DESC",
+                (soa_id,),
+            )
+            for rid, entity_type, performed_at, old_json, new_json in cur:
+                buf.seek(0)
+                buf.truncate()
+                old_order = json.loads(old_json) if old_json else []
+                new_order = json.loads(new_json) if new_json else []
+                moves = []
+                old_pos = {vid: idx + 1 for idx, vid in enumerate(old_order)}
+                for idx, vid in enumerate(new_order, start=1):
+                    op = old_pos.get(vid)
+                    if op and op != idx:
+                        moves.append(f"{vid}:{op}->{idx}")
+                writerow(
+                    (
+                        rid,
+                        entity_type,
+                        performed_at,
+                        ",".join(map(str, old_order)),
+                        ",".join(map(str, new_order)),
+                        "; ".join(moves) if moves else "",
+                    )
+                )
+                yield buf.getvalue().encode("utf-8")
+
     filename = f"soa_{soa_id}_reorder_audit.csv"
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode("utf-8")),
+        _iter_csv(),
         media_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -1770,7 +1895,7 @@ def ui_sdtm_specializations_refresh(request: Request):
     # HX redirect support
     if request.headers.get("HX-Request") == "true":
         return HTMLResponse("", headers={"HX-Redirect": "/ui/sdtm/specializations"})
-    return HTMLResponse("<script>window.location='/ui/sdtm/specializations';</script>")
+    return RedirectResponse(url="/ui/sdtm/specializations", status_code=303)
 
 
 def _wide_csv_path(soa_id: int) -> str:
@@ -1807,9 +1932,9 @@ def _generate_wide_csv(soa_id: int) -> str:
     return path
 
 
-def _matrix_arrays(soa_id: int):
-    """Return visit headers list and rows (activity name + statuses)."""
-    visits, activities, cells = _fetch_matrix(soa_id)
+def _matrix_arrays(visits: list, activities: list, cells: list):
+    """Return visit headers list and rows (activity name + statuses) for a matrix
+    already loaded by ``_fetch_matrix``."""
     visit_headers = [v["raw_header"] or v["name"] for v in visits]
     cell_lookup = {(c["visit_id"], c["activity_id"]): c["status"] for c in cells}
     rows = []
@@ -1826,27 +1951,27 @@ def _matrix_arrays(soa_id: int):
 
 @app.post("/soa")
 def create_soa(payload: SOACreate):
-    conn = _connect()
-    cur = conn.cursor()
-    # Enforce unique study_id if provided
-    if payload.study_id and payload.study_id.strip():
-        cur.execute("SELECT 1 FROM soa WHERE study_id=?", (payload.study_id.strip(),))
-        if cur.fetchone():
-            conn.close()
-            raise HTTPException(400, "study_id already exists")
-    cur.execute(
-        "INSERT INTO soa (name, created_at, study_id, study_label, study_description) VALUES (?,?,?,?,?)",
-        (
-            payload.name,
-            datetime.now(timezone.utc).isoformat(),
-            (payload.study_id or "").strip() or None,
-            (payload.study_label or "").strip() or None,
-            (payload.study_description or "").strip() or None,
-        ),
-    )
-    soa_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Enforce unique study_id if provided
+        if payload.study_id and payload.study_id.strip():
+            cur.execute(
+                "SELECT 1 FROM soa WHERE study_id=?", (payload.study_id.strip(),)
+            )
+            if cur.fetchone():
+                raise HTTPException(400, "study_id already exists")
+        cur.execute(
+            "INSERT INTO soa (name, created_at, study_id, study_label, study_description) VALUES (?,?,?,?,?)",
+            (
+                payload.name,
+                datetime.now(timezone.utc).isoformat(),
+                (payload.study_id or "").strip() or None,
+                (payload.study_label or "").strip() or None,
+                (payload.study_description or "").strip() or None,
+            ),
+        )
+        soa_id = cur.lastrowid
+        conn.commit()
     return {
         "id": soa_id,
         "name": payload.name,
@@ -1856,15 +1981,24 @@ def create_soa(payload: SOACreate):
     }
 
 
-@app.get("/soa/{soa_id}")
-def get_soa(soa_id: int):
-    if not _soa_exists(soa_id):
+@app.get("/soa/{soa_id}", response_class=ORJSONResponse)
+def get_soa(soa_id: int, conn: sqlite3.Connection = Depends(get_conn)):
+    cur = conn.cursor()
+    # Study metadata lookup doubles as the existence check
+    cur.execute(
+        "SELECT study_id, study_label, study_description FROM soa WHERE id=?", (soa_id,)
+    )
+    meta_row = cur.fetchone()
+    if not meta_row:
         raise HTTPException(404, "SOA not found")
-    visits, activities, cells = _fetch_matrix(soa_id)
+    study_meta = {
+        "study_id": meta_row[0],
+        "study_label": meta_row[1],
+        "study_description": meta_row[2],
+    }
+    visits, activities, cells = _fetch_matrix(soa_id, conn)
     # Fetch epochs
-    conn_ep = _connect()
-    cur_ep = conn_ep.cursor()
-    cur_ep.execute(
+    cur.execute(
         "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE soa_id=? ORDER BY order_index",
         (soa_id,),
     )
@@ -1877,26 +2011,8 @@ def get_soa(soa_id: int):
             epoch_label=r[4],
             epoch_description=r[5],
         )
-        for r in cur_ep.fetchall()
+        for r in cur.fetchall()
     ]
-    conn_ep.close()
-    # Also include study metadata if present
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT study_id, study_label, study_description FROM soa WHERE id=?", (soa_id,)
-    )
-    meta_row = cur.fetchone()
-    conn.close()
-    study_meta = (
-        {
-            "study_id": meta_row[0],
-            "study_label": meta_row[1],
-            "study_description": meta_row[2],
-        }
-        if meta_row
-        else {}
-    )
     return {
         "id": soa_id,
         **study_meta,
@@ -1908,10 +2024,11 @@ def get_soa(soa_id: int):
 
 
 @app.post("/soa/{soa_id}/metadata")
-def update_soa_metadata(soa_id: int, payload: SOAMetadataUpdate):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
+def update_soa_metadata(
+    soa_id: ExistingSoa,
+    payload: SOAMetadataUpdate,
+    conn: sqlite3.Connection = Depends(get_conn),
+):
     cur = conn.cursor()
     # Fetch current study_id to enforce non-blank persistence
     cur.execute("SELECT study_id FROM soa WHERE id=?", (soa_id,))
@@ -1928,11 +2045,9 @@ def update_soa_metadata(soa_id: int, payload: SOAMetadataUpdate):
             "SELECT id FROM soa WHERE study_id=? AND id<>?", (new_study_id, soa_id)
         )
         if cur.fetchone():
-            conn.close()
             raise HTTPException(400, "study_id already exists")
     # If there was no previous study_id and none provided now, reject
     if not current_study_id and not new_study_id:
-        conn.close()
         raise HTTPException(400, "study_id is required and cannot be blank")
     cur.execute(
         "UPDATE soa SET study_id=?, study_label=?, study_description=? WHERE id=?",
@@ -1944,7 +2059,6 @@ def update_soa_metadata(soa_id: int, payload: SOAMetadataUpdate):
         ),
     )
     conn.commit()
-    conn.close()
     return {"id": soa_id, "updated": True}
 
 
@@ -1969,91 +2083,91 @@ def update_soa_metadata(soa_id: int, payload: SOAMetadataUpdate):
 """Epoch CRUD and reorder endpoints refactored into epochs_router."""
 
 
-@app.post("/soa/{soa_id}/activities/{activity_id}/concepts")
-def set_activity_concepts(soa_id: int, activity_id: int, payload: ConceptsUpdate):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
+def _replace_activity_concepts(
+    cur: sqlite3.Cursor, soa_id: int, activity_id: int, concept_codes: List[str]
+) -> int:
+    """Make the activity's concept set equal ``concept_codes`` within the caller's
+    transaction; returns the number of codes set."""
     cur.execute("SELECT 1 FROM activity WHERE id=? AND soa_id=?", (activity_id, soa_id))
     if not cur.fetchone():
-        conn.close()
         raise HTTPException(404, "Activity not found")
-    # Clear existing mappings
-    cur.execute("DELETE FROM activity_concept WHERE activity_id=?", (activity_id,))
-    concepts = fetch_biomedical_concepts()
-    lookup = {c["code"]: c["title"] for c in concepts}
-    inserted = 0
-    for code in payload.concept_codes:
-        ccode = code.strip()
-        if not ccode:
-            continue
-        title = lookup.get(ccode, ccode)
-        cur.execute(
-            "INSERT INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
-            (activity_id, ccode, title),
-        )
-        inserted += 1
-    conn.commit()
-    conn.close()
-    return {"activity_id": activity_id, "concepts_set": inserted}
+    _, lookup = _concepts_snapshot()
+    codes = list(dict.fromkeys(c.strip() for c in concept_codes if c.strip()))
+    # Only touch the delta; ux_activity_concept makes re-adding a kept code a no-op
+    cur.execute(
+        "SELECT concept_code FROM activity_concept WHERE activity_id=?",
+        (activity_id,),
+    )
+    stale = {r[0] for r in cur.fetchall()}.difference(codes)
+    cur.executemany(
+        "DELETE FROM activity_concept WHERE activity_id=? AND concept_code=?",
+        [(activity_id, code) for code in stale],
+    )
+    cur.executemany(
+        "INSERT OR IGNORE INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
+        [(activity_id, code, lookup.get(code, code)) for code in codes],
+    )
+    return len(codes)
 
 
-def _get_activity_concepts(activity_id: int):
+def _get_activity_concepts(cur: sqlite3.Cursor, activity_id: int) -> list[dict]:
     """Return list of concepts (immutable: stored snapshot)."""
-    conn = _connect()
-    cur = conn.cursor()
     cur.execute(
         "SELECT concept_code, concept_title FROM activity_concept WHERE activity_id=?",
         (activity_id,),
     )
-    rows = [{"code": c, "title": t} for c, t in cur.fetchall()]
-    conn.close()
-    return rows
+    return [{"code": c, "title": t} for c, t in cur.fetchall()]
+
+
+@app.post("/soa/{soa_id}/activities/{activity_id}/concepts")
+def set_activity_concepts(
+    soa_id: ExistingSoa, activity_id: int, payload: ConceptsUpdate
+):
+    with pooled_conn() as conn:
+        inserted = _replace_activity_concepts(
+            conn.cursor(), soa_id, activity_id, payload.concept_codes
+        )
+        conn.commit()
+    return {"activity_id": activity_id, "concepts_set": inserted}
 
 
 @app.post(
     "/ui/soa/{soa_id}/activity/{activity_id}/concepts/add", response_class=HTMLResponse
 )
 def ui_add_activity_concept(
-    request: Request, soa_id: int, activity_id: int, concept_code: str = Form(...)
+    request: Request,
+    soa_id: ExistingSoa,
+    activity_id: int,
+    concept_code: str = Form(...),
 ):
     if not activity_id:
         raise HTTPException(400, "Missing activity_id")
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     code = concept_code.strip()
     if not code:
         raise HTTPException(400, "Empty concept_code")
-    concepts = fetch_biomedical_concepts()
-    lookup = {c["code"]: c["title"] for c in concepts}
+    _, lookup = _concepts_snapshot()
     title = lookup.get(code, code)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM activity WHERE id=? AND soa_id=?", (activity_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Activity not found")
-    cur.execute(
-        "SELECT 1 FROM activity_concept WHERE activity_id=? AND concept_code=?",
-        (activity_id, code),
-    )
-    if not cur.fetchone():
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT 1 FROM activity WHERE id=? AND soa_id=?", (activity_id, soa_id)
+        )
+        if not cur.fetchone():
+            raise HTTPException(404, "Activity not found")
         cur.execute(
-            "INSERT INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
+            "INSERT OR IGNORE INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
             (activity_id, code, title),
         )
+        added = cur.rowcount > 0
         conn.commit()
-    conn.close()
-    selected = _get_activity_concepts(activity_id)
-    html = templates.get_template("concepts_cell.html").render(
-        request=request,
+    if not added:
+        # Already selected: its chip is on the page, so leave the cell untouched
+        return HTMLResponse(status_code=204)
+    # Only the new chip is sent; the client appends it to #concept-chips-<activity_id>
+    html = _CONCEPT_CHIP_TPL.render(
         soa_id=soa_id,
         activity_id=activity_id,
-        concepts=concepts,
-        selected_codes=[s["code"] for s in selected],
-        selected_list=selected,
-        edit=False,
+        ac={"code": code, "title": title},
     )
     return HTMLResponse(html)
 
@@ -2063,134 +2177,140 @@ def ui_add_activity_concept(
     response_class=HTMLResponse,
 )
 def ui_remove_activity_concept(
-    request: Request, soa_id: int, activity_id: int, concept_code: str = Form(...)
+    request: Request,
+    soa_id: ExistingSoa,
+    activity_id: int,
+    concept_code: str = Form(...),
 ):
     if not activity_id:
         raise HTTPException(400, "Missing activity_id")
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     code = concept_code.strip()
     if not code:
         raise HTTPException(400, "Empty concept_code")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "DELETE FROM activity_concept WHERE activity_id=? AND concept_code=?",
-        (activity_id, code),
-    )
-    conn.commit()
-    conn.close()
-    concepts = fetch_biomedical_concepts()
-    selected = _get_activity_concepts(activity_id)
-    html = templates.get_template("concepts_cell.html").render(
-        request=request,
-        soa_id=soa_id,
-        activity_id=activity_id,
-        concepts=concepts,
-        selected_codes=[s["code"] for s in selected],
-        selected_list=selected,
-        edit=False,
-    )
-    return HTMLResponse(html)
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "DELETE FROM activity_concept WHERE activity_id=? AND concept_code=?",
+            (activity_id, code),
+        )
+        conn.commit()
+    # Empty body: the client swaps the removed chip out of the cell
+    return HTMLResponse("")
 
 
 """Activity bulk creation handled in routers/activities.py"""
 
 
 @app.post("/soa/{soa_id}/cells")
-def set_cell(soa_id: int, payload: CellCreate):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    # Upsert semantics: find existing
-    cur.execute(
-        "SELECT id FROM matrix_cells WHERE soa_id=? AND visit_id=? AND activity_id=?",
-        (soa_id, payload.visit_id, payload.activity_id),
-    )
-    row = cur.fetchone()
-    # If blank status => delete existing cell (clear) and do not create new row
-    if payload.status.strip() == "":
-        if row:
-            cur.execute("DELETE FROM matrix_cells WHERE id=?", (row[0],))
-            cid = row[0]
+def set_cell(soa_id: ExistingSoa, payload: CellCreate):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Blank status => clear the cell; no row is created
+        if payload.status.strip() == "":
+            cur.execute(
+                "DELETE FROM matrix_cells WHERE soa_id=? AND visit_id=? AND activity_id=? RETURNING id",
+                (soa_id, payload.visit_id, payload.activity_id),
+            )
+            row = cur.fetchone()
             conn.commit()
-            conn.close()
-            return {"cell_id": cid, "status": "", "deleted": True}
-        conn.close()
-        return {"cell_id": None, "status": "", "deleted": False}
-    if row:
-        cur.execute("UPDATE cell SET status=? WHERE id=?", (payload.status, row[0]))
-        cid = row[0]
-    else:
+            if row:
+                return {"cell_id": row[0], "status": "", "deleted": True}
+            return {"cell_id": None, "status": "", "deleted": False}
+        # Upsert on ux_matrix_cells_soa_visit_activity
         cur.execute(
-            "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?)",
+            "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?) "
+            "ON CONFLICT(soa_id, visit_id, activity_id) DO UPDATE SET status=excluded.status "
+            "RETURNING id",
             (soa_id, payload.visit_id, payload.activity_id, payload.status),
         )
-        cid = cur.lastrowid
-    conn.commit()
-    conn.close()
+        cid = cur.fetchone()[0]
+        conn.commit()
     return {"cell_id": cid, "status": payload.status}
 
 
-@app.get("/soa/{soa_id}/matrix")
-def get_matrix(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+@app.get("/soa/{soa_id}/matrix", response_class=ORJSONResponse)
+def get_matrix(soa_id: ExistingSoa):
     visits, activities, cells = _fetch_matrix(soa_id)
     return {"visits": visits, "activities": activities, "cells": cells}
 
 
+def _freeze_activity_names(freeze: Optional[dict]) -> dict:
+    """Map str(activity id) -> name from a freeze snapshot (empty if no freeze)."""
+    return {
+        str(a.get("id")): a.get("name")
+        for a in (freeze or {}).get("snapshot", {}).get("activities", [])
+        if isinstance(a, dict)
+    }
+
+
+def _write_sheet_rows(book, sheet_name: str, df: pd.DataFrame, header_fmt):
+    """Write ``df`` (header + rows) to a new worksheet strictly row by row.
+
+    pandas' ``to_excel`` emits cells column by column, which loses data under
+    xlsxwriter's constant_memory mode.
+    """
+    ws = book.add_worksheet(sheet_name)
+    ws.write_row(0, 0, [str(c) for c in df.columns], header_fmt)
+    values = df.astype(object).where(df.notna(), None)
+    for r, row in enumerate(values.itertuples(index=False, name=None), start=1):
+        ws.write_row(r, 0, row)
+
+
 @app.get("/soa/{soa_id}/export/xlsx")
-def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] = None):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    visits, activities, cells = _fetch_matrix(soa_id)
-    if not visits or not activities:
-        raise HTTPException(
-            400, "Cannot export empty matrix (need visits and activities)"
+def export_xlsx(
+    soa_id: ExistingSoa, left: Optional[int] = None, right: Optional[int] = None
+):
+    # One read transaction so matrix, concepts, study metadata, freezes and the
+    # rollback audit come from the same snapshot
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN")
+        visits, activities, cells = _fetch_matrix(soa_id, conn)
+        if not visits or not activities:
+            raise HTTPException(
+                400, "Cannot export empty matrix (need visits and activities)"
+            )
+        # Fetch concepts only (immutable snapshot titles), scoped to this SOA
+        cur.execute(
+            "SELECT ac.activity_id, ac.concept_code, ac.concept_title FROM activity_concept ac "
+            "JOIN activity a ON a.id=ac.activity_id WHERE a.soa_id=? "
+            "ORDER BY a.order_index, a.id, LOWER(ac.concept_title)",
+            (soa_id,),
+        )
+        concept_rows = cur.fetchall()
+        # Fetch study core metadata (name, study fields, created_at)
+        cur.execute(
+            "SELECT name, created_at, study_id, study_label, study_description FROM soa WHERE id=?",
+            (soa_id,),
         )
-    headers, rows = _matrix_arrays(soa_id)
+        info_row = cur.fetchone()
+        freezes = _list_freezes(soa_id, conn)
+        left_freeze = _get_freeze(soa_id, left, conn) if left else None
+        right_freeze = _get_freeze(soa_id, right, conn) if right else None
+        audit_rows = _list_rollback_audit(soa_id, conn)
+        conn.rollback()
+    headers, rows = _matrix_arrays(visits, activities, cells)
     # Build DataFrame, then inject Concepts column (second position)
     df = pd.DataFrame(rows, columns=["Activity"] + headers)
-    # Fetch concepts only (immutable snapshot titles)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT activity_id, concept_code, concept_title FROM activity_concept")
-    concepts_map = {}
-    for aid, code, title in cur.fetchall():
-        concepts_map.setdefault(aid, {})[code] = title
-    conn.close()
-    visits, activities, _cells = _fetch_matrix(soa_id)
-    activity_ids_in_order = [a["id"] for a in activities]
-    # Build display strings using EffectiveTitle (override if present) and show code in parentheses
-    concepts_strings = []
-    for aid in activity_ids_in_order:
-        cmap = concepts_map.get(aid, {})
-        if not cmap:
-            concepts_strings.append("")
-            continue
-        items = sorted(cmap.items(), key=lambda kv: kv[1].lower())
-        concepts_strings.append(
-            "; ".join([f"{title} ({code})" for code, title in items])
-        )
+    # Build display strings using EffectiveTitle (override if present) and show code in parentheses;
+    # rows arrive grouped by activity and sorted by title
+    concept_strs = {
+        aid: "; ".join(f"{title} ({code})" for _, code, title in group)
+        for aid, group in groupby(concept_rows, key=itemgetter(0))
+    }
+    concepts_strings = [concept_strs.get(a["id"], "") for a in activities]
     if len(concepts_strings) == len(df):
         df.insert(1, "Concepts", concepts_strings)
     # Build concept mappings sheet data
-    mapping_rows = []
-    for a in activities:
-        aid = a["id"]
-        cmap = concepts_map.get(aid, {})
-        for code, title in cmap.items():
-            mapping_rows.append([aid, a["name"], code, title])
+    activity_names = {a["id"]: a["name"] for a in activities}
+    mapping_rows = [
+        [aid, activity_names[aid], code, title] for aid, code, title in concept_rows
+    ]
     mapping_df = pd.DataFrame(
         mapping_rows,
         columns=["ActivityID", "ActivityName", "ConceptCode", "ConceptTitle"],
     )
-    # Build rollback audit sheet data (optional)
-    audit_rows = (
-        _list_rollback_audit(soa_id) if "_list_rollback_audit" in globals() else []
-    )
+    # Build rollback audit sheet data
     audit_df = pd.DataFrame(audit_rows)
     if audit_df.empty:
         audit_df = pd.DataFrame(
@@ -2206,15 +2326,6 @@ def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] =
         )
     bio = io.BytesIO()
     # Prepare cover sheet metadata
-    # Fetch study core metadata (name, study fields, created_at)
-    conn_info = _connect()
-    cur_info = conn_info.cursor()
-    cur_info.execute(
-        "SELECT name, created_at, study_id, study_label, study_description FROM soa WHERE id=?",
-        (soa_id,),
-    )
-    info_row = cur_info.fetchone()
-    conn_info.close()
     if info_row:
         soa_name_val, created_at_val, study_id_val, study_label_val, study_desc_val = (
             info_row
@@ -2227,11 +2338,8 @@ def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] =
             None,
             None,
         )
-    freezes = _list_freezes(soa_id)
     last_freeze_label = freezes[0]["version_label"] if freezes else None
     last_freeze_time = freezes[0]["created_at"] if freezes else None
-    left_freeze = _get_freeze(soa_id, left) if left else None
-    right_freeze = _get_freeze(soa_id, right) if right else None
     concept_mapping_count = len(mapping_rows)
     cell_count = len(cells)
     meta_rows = [
@@ -2262,18 +2370,14 @@ def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] =
     concept_diff_df = None
     if left and right:
         try:
-            diff = _diff_freezes_limited(soa_id, left, right, limit=None)
-            left_freeze = _get_freeze(soa_id, left)
-            right_freeze = _get_freeze(soa_id, right)
-            activity_name_lookup = {}
-            if left_freeze:
-                for a in left_freeze.get("snapshot", {}).get("activities", []):
-                    if isinstance(a, dict):
-                        activity_name_lookup[str(a.get("id"))] = a.get("name")
-            if right_freeze:
-                for a in right_freeze.get("snapshot", {}).get("activities", []):
-                    if isinstance(a, dict):
-                        activity_name_lookup[str(a.get("id"))] = a.get("name")
+            if not left_freeze or not right_freeze:
+                raise HTTPException(404, "Freeze not found")
+            diff = _diff_freeze_pair(left_freeze, right_freeze, limit=None)
+            # Right-hand names win for activities present in both freezes
+            activity_name_lookup = {
+                **_freeze_activity_names(left_freeze),
+                **_freeze_activity_names(right_freeze),
+            }
             diff_rows = []
             for ch in diff.get("concepts", []):
                 aid = str(ch.get("activity_id"))
@@ -2310,22 +2414,21 @@ def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] =
         except Exception as e:
             # Provide an error sheet to highlight issue rather than failing entire export
             concept_diff_df = pd.DataFrame([[str(e)]], columns=["ConceptDiffError"])
-    with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-        study_df.to_excel(writer, index=False, sheet_name="Study")
-        df.to_excel(writer, index=False, sheet_name="SoA")
-        mapping_df.to_excel(writer, index=False, sheet_name="ConceptMappings")
-        audit_df.to_excel(writer, index=False, sheet_name="RollbackAudit")
-        if concept_diff_df is not None:
-            concept_diff_df.to_excel(writer, index=False, sheet_name="ConceptDiff")
+    # constant_memory flushes each row to a temp file as soon as the next one starts,
+    # so the workbook is never held in memory as cell objects
+    book = xlsxwriter.Workbook(bio, {"constant_memory": True, "strings_to_urls": False})
+    header_fmt = book.add_format({"bold": True, "border": 1})
+    _write_sheet_rows(book, "Study", study_df, header_fmt)
+    _write_sheet_rows(book, "SoA", df, header_fmt)
+    _write_sheet_rows(book, "ConceptMappings", mapping_df, header_fmt)
+    _write_sheet_rows(book, "RollbackAudit", audit_df, header_fmt)
+    if concept_diff_df is not None:
+        _write_sheet_rows(book, "ConceptDiff", concept_diff_df, header_fmt)
+    book.close()
     bio.seek(0)
     # Dynamic filename pattern: studyid_version.xlsx
     # Determine study_id and version context
-    conn_meta = _connect()
-    cur_meta = conn_meta.cursor()
-    cur_meta.execute("SELECT study_id FROM soa WHERE id=?", (soa_id,))
-    row_meta = cur_meta.fetchone()
-    conn_meta.close()
-    study_id_val = (row_meta[0] if row_meta else None) or f"soa{soa_id}"
+    study_id_val = study_id_val or f"soa{soa_id}"
     # Sanitize study_id for filename (keep alnum, '-', '_')
 
     safe_study = (
@@ -2334,18 +2437,14 @@ def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] =
     version_segment = ""
     if left and right:
         # Diff export: include both labels
-        left_f = _get_freeze(soa_id, left)
-        right_f = _get_freeze(soa_id, right)
-        left_label = left_f.get("version_label") if left_f else f"v{left}"
-        right_label = right_f.get("version_label") if right_f else f"v{right}"
+        left_label = left_freeze.get("version_label") if left_freeze else f"v{left}"
+        right_label = right_freeze.get("version_label") if right_freeze else f"v{right}"
         version_segment = f"{left_label}_vs_{right_label}"
+    elif freezes:
+        version_segment = freezes[0]["version_label"] or f"v{freezes[0]['id']}"
     else:
-        freezes = _list_freezes(soa_id)
-        if freezes:
-            version_segment = freezes[0]["version_label"] or f"v{freezes[0]['id']}"
-        else:
-            # No freezes yet: assume initial version number 1
-            version_segment = "v1"
+        # No freezes yet: assume initial version number 1
+        version_segment = "v1"
     safe_version = _re.sub(r"[^A-Za-z0-9._-]+", "-", version_segment)[:60]
     filename = f"{safe_study}_{safe_version}.xlsx"
     return StreamingResponse(
@@ -2356,62 +2455,69 @@ def export_xlsx(soa_id: int, left: Optional[int] = None, right: Optional[int] =
 
 
 @app.get("/soa/{soa_id}/export/pdf")
-def export_pdf(soa_id: int):
+def export_pdf(soa_id: ExistingSoa):
     """Generate a lightweight PDF summary of the SOA (arms, visits, activities, concept mappings).
 
     The PDF is intentionally simple and produced without external dependencies to avoid
     introducing new packages. It uses a single page with monospaced layout style commands.
     """
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    # Fetch core metadata
-    cur.execute(
-        "SELECT name, study_id, study_label, study_description, created_at FROM soa WHERE id=?",
-        (soa_id,),
-    )
-    row = cur.fetchone()
-    if row:
-        soa_name_val, study_id_val, study_label_val, study_desc_val, created_at_val = (
-            row
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Fetch core metadata
+        cur.execute(
+            "SELECT name, study_id, study_label, study_description, created_at FROM soa WHERE id=?",
+            (soa_id,),
         )
-    else:
-        soa_name_val, study_id_val, study_label_val, study_desc_val, created_at_val = (
-            f"SOA {soa_id}",
-            None,
-            None,
-            None,
-            None,
+        row = cur.fetchone()
+        if row:
+            (
+                soa_name_val,
+                study_id_val,
+                study_label_val,
+                study_desc_val,
+                created_at_val,
+            ) = row
+        else:
+            (
+                soa_name_val,
+                study_id_val,
+                study_label_val,
+                study_desc_val,
+                created_at_val,
+            ) = (
+                f"SOA {soa_id}",
+                None,
+                None,
+                None,
+                None,
+            )
+        # Arms
+        cur.execute(
+            "SELECT id, name, COALESCE(type,''), COALESCE(data_origin_type,'') FROM arm WHERE soa_id=? ORDER BY COALESCE(order_index, id)",
+            (soa_id,),
         )
-    # Arms
-    cur.execute(
-        "SELECT id, name, COALESCE(type,''), COALESCE(data_origin_type,'') FROM arm WHERE soa_id=? ORDER BY COALESCE(order_index, id)",
-        (soa_id,),
-    )
-    arms = cur.fetchall()
-    # Visits
-    cur.execute(
-        "SELECT id, name, COALESCE(raw_header,'') FROM visit WHERE soa_id=? ORDER BY COALESCE(order_index, id)",
-        (soa_id,),
-    )
-    visits = cur.fetchall()
-    # Activities
-    cur.execute(
-        "SELECT id, name FROM activity WHERE soa_id=? ORDER BY COALESCE(order_index, id)",
-        (soa_id,),
-    )
-    activities = cur.fetchall()
-    # Concept mappings
-    cur.execute(
-        "SELECT ac.activity_id, ac.concept_code FROM activity_concept ac JOIN activity a ON ac.activity_id = a.id WHERE a.soa_id=? ORDER BY ac.activity_id, ac.concept_code",
-        (soa_id,),
-    )
-    concept_rows = cur.fetchall()
-    conn.close()
-    concept_map = {}
+        arms = cur.fetchall()
+        # Visits
+        cur.execute(
+            "SELECT id, name, COALESCE(raw_header,'') FROM visit WHERE soa_id=? ORDER BY COALESCE(order_index, id)",
+            (soa_id,),
+        )
+        visits = cur.fetchall()
+        # Activities
+        cur.execute(
+            "SELECT id, name FROM activity WHERE soa_id=? ORDER BY COALESCE(order_index, id)",
+            (soa_id,),
+        )
+        activities = cur.fetchall()
+        # Concept mappings
+        cur.execute(
+            "SELECT ac.activity_id, ac.concept_code FROM activity_concept ac JOIN activity a ON ac.activity_id = a.id WHERE a.soa_id=? ORDER BY ac.activity_id, ac.concept_code",
+            (soa_id,),
+        )
+        concept_rows = cur.fetchall()
+    concept_map = defaultdict(list)
     for aid, code in concept_rows:
-        concept_map.setdefault(aid, []).append(code)
+        concept_map[aid].append(code)
 
     # Build text lines (will later be embedded in a single-page PDF)
     lines = []
@@ -2530,9 +2636,7 @@ def export_pdf(soa_id: int):
 
 
 @app.get("/soa/{soa_id}/normalized")
-def get_normalized(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def get_normalized(soa_id: ExistingSoa):
     csv_path = _generate_wide_csv(soa_id)
     out_dir = os.path.join(NORMALIZED_ROOT, f"soa_{soa_id}")
     os.makedirs(out_dir, exist_ok=True)
@@ -2543,9 +2647,7 @@ def get_normalized(soa_id: int):
 
 
 @app.post("/soa/{soa_id}/matrix/import")
-def import_matrix(soa_id: int, payload: MatrixImport):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def import_matrix(soa_id: ExistingSoa, payload: MatrixImport):
     if not payload.visits:
         raise HTTPException(400, "visits list empty")
     if not payload.activities:
@@ -2558,73 +2660,95 @@ def import_matrix(soa_id: int, payload: MatrixImport):
                 400,
                 f"Activity '{act.name}' statuses length {len(act.statuses)} != visits length {visit_count}",
             )
-    conn = _connect()
-    cur = conn.cursor()
-    if payload.reset:
-        cur.execute("DELETE FROM matrix_cells WHERE soa_id=?", (soa_id,))
-        cur.execute("DELETE FROM visit WHERE soa_id=?", (soa_id,))
-        cur.execute("DELETE FROM activity WHERE soa_id=?", (soa_id,))
-    # Insert visits respecting order
-    cur.execute("SELECT COUNT(*) FROM visit WHERE soa_id=?", (soa_id,))
-    vstart = cur.fetchone()[0]
-    v_index = vstart
-    visit_id_map = []
-    for v in payload.visits:
-        v_index += 1
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # One write transaction for the whole import; taken up front to avoid
+        # SQLITE_BUSY upgrades midway through
+        cur.execute("BEGIN IMMEDIATE")
+        if payload.reset:
+            cur.execute("DELETE FROM matrix_cells WHERE soa_id=?", (soa_id,))
+            cur.execute("DELETE FROM visit WHERE soa_id=?", (soa_id,))
+            cur.execute("DELETE FROM activity WHERE soa_id=?", (soa_id,))
+        # Insert visits respecting order. New ids are picked up as id > the prior
+        # MAX(id) (rowids only grow inside this write transaction); order_index
+        # may have gaps or duplicates, so it can't identify the new rows.
         cur.execute(
+            "SELECT COALESCE(MAX(id), 0), "
+            "(SELECT COALESCE(MAX(order_index), 0) FROM visit WHERE soa_id=?) FROM visit",
+            (soa_id,),
+        )
+        vmax_id, vstart = cur.fetchone()
+        cur.executemany(
             "INSERT INTO visit (soa_id,name,raw_header,order_index) VALUES (?,?,?,?)",
-            (soa_id, v.name, v.raw_header or v.name, v_index),
+            [
+                (soa_id, v.name, v.raw_header or v.name, idx)
+                for idx, v in enumerate(payload.visits, start=vstart + 1)
+            ],
+        )
+        cur.execute(
+            "SELECT id FROM visit WHERE soa_id=? AND id>? ORDER BY id",
+            (soa_id, vmax_id),
         )
-        visit_id_map.append(cur.lastrowid)
-    # Insert activities
-    cur.execute("SELECT COUNT(*) FROM activity WHERE soa_id=?", (soa_id,))
-    astart = cur.fetchone()[0]
-    a_index = astart
-    activity_id_map = []
-    for a in payload.activities:
-        a_index += 1
+        visit_id_map = [r[0] for r in cur.fetchall()]
+        # Insert activities
         cur.execute(
+            "SELECT COALESCE(MAX(id), 0), "
+            "(SELECT COALESCE(MAX(order_index), 0) FROM activity WHERE soa_id=?) FROM activity",
+            (soa_id,),
+        )
+        amax_id, astart = cur.fetchone()
+        cur.executemany(
             "INSERT INTO activity (soa_id,name,order_index,activity_uid) VALUES (?,?,?,?)",
-            (soa_id, a.name, a_index, f"Activity_{a_index}"),
+            [
+                (soa_id, a.name, idx, f"Activity_{idx}")
+                for idx, a in enumerate(payload.activities, start=astart + 1)
+            ],
         )
-        activity_id_map.append(cur.lastrowid)
-    # Insert cells
-    for a_idx, a in enumerate(payload.activities):
-        aid = activity_id_map[a_idx]
-        for v_idx, status in enumerate(a.statuses):
-            if status is None:
-                status = ""
-            status_str = str(status).strip()
-            if status_str == "":
-                continue
-            vid = visit_id_map[v_idx]
-            cur.execute(
-                "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?)",
-                (soa_id, vid, aid, status_str),
-            )
-    conn.commit()
-    conn.close()
+        cur.execute(
+            "SELECT id FROM activity WHERE soa_id=? AND id>? ORDER BY id",
+            (soa_id, amax_id),
+        )
+        activity_id_map = [r[0] for r in cur.fetchall()]
+        # Insert cells
+        cell_rows = []
+        for aid, a in zip(activity_id_map, payload.activities):
+            for vid, status in zip(visit_id_map, a.statuses):
+                status_str = str(status if status is not None else "").strip()
+                if status_str:
+                    cell_rows.append((soa_id, vid, aid, status_str))
+        cur.executemany(
+            "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?)",
+            cell_rows,
+        )
+        conn.commit()
     return {
         "visits_added": len(payload.visits),
         "activities_added": len(payload.activities),
-        "cells_inserted": sum(
-            1 for a in payload.activities for s in a.statuses if str(s).strip() != ""
-        ),
+        "cells_inserted": len(cell_rows),
     }
 
 
 # --------------------- Deletion API Endpoints ---------------------
 
 
-def _reindex(table: str, soa_id: int):
-    conn = _connect()
-    cur = conn.cursor()
+_REINDEX_TABLES = frozenset({"visit", "activity", "epoch"})
+
+
+def _reindex(cur: sqlite3.Cursor, table: str, soa_id: int):
+    """Renumber order_index 1..N for an SOA within the caller's transaction."""
+    # table is interpolated into SQL, so only known tables are accepted
+    if table not in _REINDEX_TABLES:
+        raise ValueError(f"Cannot reindex table {table!r}")
     cur.execute(
-        f"SELECT id FROM {table} WHERE soa_id=? ORDER BY order_index", (soa_id,)
+        f"""WITH ranked AS (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY order_index, id) AS rn
+            FROM {table} WHERE soa_id=?
+        )
+        UPDATE {table}
+        SET order_index = (SELECT rn FROM ranked WHERE ranked.id = {table}.id)
+        WHERE soa_id=?""",
+        (soa_id, soa_id),
     )
-    ids = [r[0] for r in cur.fetchall()]
-    for idx, _id in enumerate(ids, start=1):
-        cur.execute(f"UPDATE {table} SET order_index=? WHERE id=?", (idx, _id))
     # Maintain activity_uid after any activity reindex
     if table == "activity":
         # Two-phase UID refresh to satisfy UNIQUE(soa_id, activity_uid) without transient collisions
@@ -2636,29 +2760,22 @@ def _reindex(table: str, soa_id: int):
             "UPDATE activity SET activity_uid = 'Activity_' || order_index WHERE soa_id=?",
             (soa_id,),
         )
-    conn.commit()
-    conn.close()
 
 
 @app.delete("/soa/{soa_id}/visits/{visit_id}")
-def delete_visit(soa_id: int, visit_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM visit WHERE id=? AND soa_id=?", (visit_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Visit not found")
-    # cascade cells
-    # Capture before for audit
-    cur.execute(
-        "SELECT id,name,raw_header,order_index,epoch_id FROM visit WHERE id=?",
-        (visit_id,),
-    )
-    b = cur.fetchone()
-    before = None
-    if b:
+def delete_visit(soa_id: ExistingSoa, visit_id: int):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Delete, cascade and renumber as one write transaction
+        cur.execute("BEGIN IMMEDIATE")
+        # Capture before for audit from the deleted row itself
+        cur.execute(
+            "DELETE FROM visit WHERE id=? AND soa_id=? RETURNING id,name,raw_header,order_index,epoch_id",
+            (visit_id, soa_id),
+        )
+        b = cur.fetchone()
+        if not b:
+            raise HTTPException(404, "Visit not found")
         before = {
             "id": b[0],
             "name": b[1],
@@ -2666,64 +2783,57 @@ def delete_visit(soa_id: int, visit_id: int):
             "order_index": b[3],
             "epoch_id": b[4],
         }
-    cur.execute(
-        "DELETE FROM matrix_cells WHERE soa_id=? AND visit_id=?", (soa_id, visit_id)
-    )
-    cur.execute("DELETE FROM visit WHERE id=?", (visit_id,))
-    conn.commit()
-    conn.close()
-    _reindex("visit", soa_id)
-    _record_visit_audit(soa_id, "delete", visit_id, before=before, after=None)
+        # cascade cells
+        cur.execute(
+            "DELETE FROM matrix_cells WHERE soa_id=? AND visit_id=?", (soa_id, visit_id)
+        )
+        _reindex(cur, "visit", soa_id)
+        _record_visit_audit(
+            soa_id, "delete", visit_id, before=before, after=None, conn=conn
+        )
+        conn.commit()
     return {"deleted_visit_id": visit_id}
 
 
 @app.delete("/soa/{soa_id}/activities/{activity_id}")
-def delete_activity(soa_id: int, activity_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM activity WHERE id=? AND soa_id=?", (activity_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Activity not found")
-    cur.execute(
-        "SELECT id,name,order_index FROM activity WHERE id=?",
-        (activity_id,),
-    )
-    b = cur.fetchone()
-    before = None
-    if b:
+def delete_activity(soa_id: ExistingSoa, activity_id: int):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Delete, cascade and renumber as one write transaction
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(
+            "DELETE FROM activity WHERE id=? AND soa_id=? RETURNING id,name,order_index",
+            (activity_id, soa_id),
+        )
+        b = cur.fetchone()
+        if not b:
+            raise HTTPException(404, "Activity not found")
         before = {"id": b[0], "name": b[1], "order_index": b[2]}
-    cur.execute(
-        "DELETE FROM matrix_cells WHERE soa_id=? AND activity_id=?",
-        (soa_id, activity_id),
-    )
-    cur.execute("DELETE FROM activity WHERE id=?", (activity_id,))
-    conn.commit()
-    conn.close()
-    _reindex("activity", soa_id)
-    _record_activity_audit(soa_id, "delete", activity_id, before=before, after=None)
+        cur.execute(
+            "DELETE FROM matrix_cells WHERE soa_id=? AND activity_id=?",
+            (soa_id, activity_id),
+        )
+        _reindex(cur, "activity", soa_id)
+        _record_activity_audit(
+            soa_id, "delete", activity_id, before=before, after=None, conn=conn
+        )
+        conn.commit()
     return {"deleted_activity_id": activity_id}
 
 
 @app.delete("/soa/{soa_id}/epochs/{epoch_id}")
-def delete_epoch(soa_id: int, epoch_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM epoch WHERE id=? AND soa_id=?", (epoch_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Epoch not found")
-    cur.execute(
-        "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE id=?",
-        (epoch_id,),
-    )
-    b = cur.fetchone()
-    before = None
-    if b:
+def delete_epoch(soa_id: ExistingSoa, epoch_id: int):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Delete, cascade and renumber as one write transaction
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(
+            "DELETE FROM epoch WHERE id=? AND soa_id=? RETURNING id,name,order_index,epoch_seq,epoch_label,epoch_description",
+            (epoch_id, soa_id),
+        )
+        b = cur.fetchone()
+        if not b:
+            raise HTTPException(404, "Epoch not found")
         before = {
             "id": b[0],
             "name": b[1],
@@ -2732,11 +2842,11 @@ def delete_epoch(soa_id: int, epoch_id: int):
             "epoch_label": b[4],
             "epoch_description": b[5],
         }
-    cur.execute("DELETE FROM epoch WHERE id=", (epoch_id,))
-    conn.commit()
-    conn.close()
-    _reindex("epoch", soa_id)
-    _record_epoch_audit(soa_id, "delete", epoch_id, before=before, after=None)
+        _reindex(cur, "epoch", soa_id)
+        _record_epoch_audit(
+            soa_id, "delete", epoch_id, before=before, after=None, conn=conn
+        )
+        conn.commit()
     return {"deleted_epoch_id": epoch_id}
 
 
@@ -2745,13 +2855,12 @@ def delete_epoch(soa_id: int, epoch_id: int):
 
 @app.get("/", response_class=HTMLResponse)
 def ui_index(request: Request):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id,name,created_at,study_id,study_label,study_description FROM soa ORDER BY id DESC"
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id,name,created_at,study_id,study_label,study_description FROM soa ORDER BY id DESC"
+        )
+        rows = cur.fetchall()
     return templates.TemplateResponse(
         request,
         "index.html",
@@ -2771,24 +2880,32 @@ def ui_index(request: Request):
     )
 
 
+def _redirect_to_edit(request: Request, soa_id: int) -> Response:
+    """Send the browser back to the SOA edit page after a UI mutation.
+
+    HTMX requests get an ``HX-Redirect`` header; plain form posts get a 303.
+    """
+    url = f"/ui/soa/{soa_id}/edit"
+    if request.headers.get("HX-Request") == "true":
+        return Response(status_code=204, headers={"HX-Redirect": url})
+    return RedirectResponse(url=url, status_code=303)
+
+
 @app.post("/ui/soa/{soa_id}/add_activity", response_class=HTMLResponse)
-def ui_add_activity(request: Request, soa_id: int, name: str = Form(...)):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def ui_add_activity(request: Request, soa_id: ExistingSoa, name: str = Form(...)):
     nm = (name or "").strip()
     if not nm:
         raise HTTPException(400, "Name required")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM activity WHERE soa_id=?", (soa_id,))
-    order_index = cur.fetchone()[0] + 1
-    cur.execute(
-        "INSERT INTO activity (soa_id,name,order_index,activity_uid) VALUES (?,?,?,?)",
-        (soa_id, nm, order_index, f"Activity_{order_index}"),
-    )
-    aid = cur.lastrowid
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM activity WHERE soa_id=?", (soa_id,))
+        order_index = cur.fetchone()[0] + 1
+        cur.execute(
+            "INSERT INTO activity (soa_id,name,order_index,activity_uid) VALUES (?,?,?,?)",
+            (soa_id, nm, order_index, f"Activity_{order_index}"),
+        )
+        aid = cur.lastrowid
+        conn.commit()
     _record_activity_audit(
         soa_id,
         "create",
@@ -2801,7 +2918,7 @@ def ui_add_activity(request: Request, soa_id: int, name: str = Form(...)):
             "activity_uid": f"Activity_{order_index}",
         },
     )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/create", response_class=HTMLResponse)
@@ -2812,145 +2929,185 @@ def ui_create_soa(
     study_label: Optional[str] = Form(None),
     study_description: Optional[str] = Form(None),
 ):
-    conn = _connect()
-    cur = conn.cursor()
-    # Uniqueness check
-    if study_id and study_id.strip():
-        cur.execute("SELECT 1 FROM soa WHERE study_id=?", (study_id.strip(),))
-        if cur.fetchone():
-            conn.close()
-            return HTMLResponse(
-                "<script>alert('study_id already exists');window.location='/'</script>"
-            )
-    cur.execute(
-        "INSERT INTO soa (name, created_at, study_id, study_label, study_description) VALUES (?,?,?,?,?)",
-        (
-            name,
-            datetime.now(timezone.utc).isoformat(),
-            (study_id or "").strip() or None,
-            (study_label or "").strip() or None,
-            (study_description or "").strip() or None,
-        ),
-    )
-    sid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return HTMLResponse(f"<script>window.location='/ui/soa/{sid}/edit';</script>")
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Uniqueness check
+        if study_id and study_id.strip():
+            cur.execute("SELECT 1 FROM soa WHERE study_id=?", (study_id.strip(),))
+            if cur.fetchone():
+                return HTMLResponse(
+                    "<script>alert('study_id already exists');window.location='/'</script>"
+                )
+        cur.execute(
+            "INSERT INTO soa (name, created_at, study_id, study_label, study_description) VALUES (?,?,?,?,?)",
+            (
+                name,
+                datetime.now(timezone.utc).isoformat(),
+                (study_id or "").strip() or None,
+                (study_label or "").strip() or None,
+                (study_description or "").strip() or None,
+            ),
+        )
+        sid = cur.lastrowid
+        conn.commit()
+    return _redirect_to_edit(request, sid)
 
 
 @app.post("/ui/soa/{soa_id}/update_meta", response_class=HTMLResponse)
 def ui_update_meta(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     study_id: Optional[str] = Form(None),
     study_label: Optional[str] = Form(None),
     study_description: Optional[str] = Form(None),
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT study_id FROM soa WHERE id=?", (soa_id,))
-    row = cur.fetchone()
-    current_study_id = row[0] if row else None
-    proposed = (study_id or "").strip()
-    if proposed == "" and current_study_id:
-        new_study_id = current_study_id  # preserve existing
-    else:
-        new_study_id = proposed or None
-    if new_study_id:
-        cur.execute(
-            "SELECT id FROM soa WHERE study_id=? AND id<>?", (new_study_id, soa_id)
-        )
-        if cur.fetchone():
-            conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT study_id FROM soa WHERE id=?", (soa_id,))
+        row = cur.fetchone()
+        current_study_id = row[0] if row else None
+        proposed = (study_id or "").strip()
+        if proposed == "" and current_study_id:
+            new_study_id = current_study_id  # preserve existing
+        else:
+            new_study_id = proposed or None
+        if new_study_id:
+            cur.execute(
+                "SELECT id FROM soa WHERE study_id=? AND id<>?", (new_study_id, soa_id)
+            )
+            if cur.fetchone():
+                return HTMLResponse(
+                    "<script>alert('study_id already exists');window.location='/ui/soa/%d/edit';</script>"
+                    % soa_id
+                )
+        if not current_study_id and not new_study_id:
             return HTMLResponse(
-                "<script>alert('study_id already exists');window.location='/ui/soa/%d/edit';</script>"
+                "<script>alert('study_id is required');window.location='/ui/soa/%d/edit';</script>"
                 % soa_id
             )
-    if not current_study_id and not new_study_id:
-        conn.close()
-        return HTMLResponse(
-            "<script>alert('study_id is required');window.location='/ui/soa/%d/edit';</script>"
-            % soa_id
+        cur.execute(
+            "UPDATE soa SET study_id=?, study_label=?, study_description=? WHERE id=?",
+            (
+                new_study_id,
+                (study_label or "").strip() or None,
+                (study_description or "").strip() or None,
+                soa_id,
+            ),
         )
-    cur.execute(
-        "UPDATE soa SET study_id=?, study_label=?, study_description=? WHERE id=?",
-        (
-            new_study_id,
-            (study_label or "").strip() or None,
-            (study_description or "").strip() or None,
-            soa_id,
-        ),
-    )
-    conn.commit()
-    conn.close()
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+        conn.commit()
+    return _redirect_to_edit(request, soa_id)
+
+
+_STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def _stream_template(request: Request, name: str, context: dict) -> StreamingResponse:
+    """Render ``name`` incrementally so the first bytes leave before the page is done.
+
+    Jinja yields many tiny fragments; they are coalesced into ~16KB chunks because
+    Starlette pulls each chunk of a sync iterator through the threadpool.
+    """
+    template = templates.get_template(name)
+
+    def chunks():
+        buf: list[str] = []
+        size = 0
+        for piece in template.generate({"request": request, **context}):
+            buf.append(piece)
+            size += len(piece)
+            if size >= _STREAM_CHUNK_SIZE:
+                yield "".join(buf)
+                buf.clear()
+                size = 0
+        if buf:
+            yield "".join(buf)
+
+    return StreamingResponse(chunks(), media_type="text/html; charset=utf-8")
+
+
+@lru_cache(maxsize=128)
+def _fetch_age_strings(fetched_at: float, now: int) -> tuple[str, str]:
+    """Return (ISO timestamp, relative age) for a cache fetch time.
+
+    ``now`` is whole seconds, so renders within the same second share one result.
+    """
+    iso = datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat()
+    # Simple relative string (seconds/minutes/hours)
+    secs = max(0, int(now - fetched_at))
+    if secs < 60:
+        return iso, f"{secs}s ago"
+    if secs < 3600:
+        return iso, f"{secs//60}m ago"
+    return iso, f"{secs//3600}h ago"
 
 
 @app.get("/ui/soa/{soa_id}/edit", response_class=HTMLResponse)
-def ui_edit(request: Request, soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    visits, activities, cells = _fetch_matrix(soa_id)
-    # Epochs list
-    conn_ep = _connect()
-    cur_ep = conn_ep.cursor()
-    cur_ep.execute(
-        "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    epochs = [
-        dict(
-            id=r[0],
-            name=r[1],
-            order_index=r[2],
-            epoch_seq=r[3],
-            epoch_label=r[4],
-            epoch_description=r[5],
+def ui_edit(request: Request, soa_id: ExistingSoa):
+    # Matrix, epochs, elements, arms, concept mappings, study metadata and freezes are
+    # all gathered in one read transaction on one pooled connection before rendering
+    with pooled_conn() as conn:
+        conn.execute("BEGIN")
+        visits, activities, cells = _fetch_matrix(soa_id, conn)
+        cur = conn.cursor()
+        # Epochs list
+        cur.execute(
+            "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
         )
-        for r in cur_ep.fetchall()
-    ]
-    conn_ep.close()
-    # Elements list
-    conn_el = _connect()
-    cur_el = conn_el.cursor()
-    cur_el.execute(
-        "SELECT id,name,label,description,testrl,teenrl,order_index,created_at FROM element WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    elements = [
-        dict(
-            id=r[0],
-            name=r[1],
-            label=r[2],
-            description=r[3],
-            testrl=r[4],
-            teenrl=r[5],
-            order_index=r[6],
-            created_at=r[7],
+        epochs = [
+            dict(
+                id=r[0],
+                name=r[1],
+                order_index=r[2],
+                epoch_seq=r[3],
+                epoch_label=r[4],
+                epoch_description=r[5],
+            )
+            for r in cur.fetchall()
+        ]
+        # Elements list
+        cur.execute(
+            "SELECT id,name,label,description,testrl,teenrl,order_index,created_at FROM element WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
         )
-        for r in cur_el.fetchall()
-    ]
-    conn_el.close()
+        elements = [
+            dict(
+                id=r[0],
+                name=r[1],
+                label=r[2],
+                description=r[3],
+                testrl=r[4],
+                teenrl=r[5],
+                order_index=r[6],
+                created_at=r[7],
+            )
+            for r in cur.fetchall()
+        ]
+        # All concept mappings for this SOA in one query, bucketed by activity
+        cur.execute(
+            "SELECT ac.activity_id, ac.concept_code, ac.concept_title FROM activity_concept ac "
+            "JOIN activity a ON a.id=ac.activity_id WHERE a.soa_id=?",
+            (soa_id,),
+        )
+        # Rows stay {"code", "title"} dicts: concept_chip.html is shared with the
+        # single-activity paths and the freeze snapshot serializes the same shape
+        activity_concepts = defaultdict(list)
+        for aid, code, title in cur.fetchall():
+            activity_concepts[aid].append({"code": code, "title": title})
+        # Study metadata for edit form
+        cur.execute(
+            "SELECT study_id, study_label, study_description FROM soa WHERE id=?",
+            (soa_id,),
+        )
+        meta_row = cur.fetchone()
+        arms = _fetch_arms_for_edit(soa_id, conn)
+        freeze_list = _list_freezes(soa_id, conn)
+        conn.rollback()
     # No pagination: use all activities
     activities_page = activities
     # Build cell lookup
     cell_map = {(c["visit_id"], c["activity_id"]): c["status"] for c in cells}
     concepts = fetch_biomedical_concepts()
-    activity_ids = [a["id"] for a in activities_page]
-    activity_concepts = {}
-    if activity_ids:
-        conn = _connect()
-        cur = conn.cursor()
-        placeholders = ",".join("?" for _ in activity_ids)
-        cur.execute(
-            f"SELECT activity_id, concept_code, concept_title FROM activity_concept WHERE activity_id IN ({placeholders})",
-            activity_ids,
-        )
-        for aid, code, title in cur.fetchall():
-            activity_concepts.setdefault(aid, []).append({"code": code, "title": title})
-        conn.close()
     concepts_diag = {
         "count": len(_concept_cache.get("data") or []),
         "last_status": _concept_cache.get("last_status"),
@@ -2963,33 +3120,16 @@ def ui_edit(request: Request, soa_id: int):
     last_fetch_iso = None
     last_fetch_relative = None
     if fetched_at:
-        dt = datetime.fromtimestamp(fetched_at, tz=timezone.utc)
-        last_fetch_iso = dt.isoformat()
-        # Simple relative string (seconds/minutes/hours)
-        delta = datetime.now(timezone.utc) - dt
-        secs = int(delta.total_seconds())
-        if secs < 60:
-            last_fetch_relative = f"{secs}s ago"
-        elif secs < 3600:
-            last_fetch_relative = f"{secs//60}m ago"
-        else:
-            last_fetch_relative = f"{secs//3600}h ago"
-    freeze_list = _list_freezes(soa_id)
+        last_fetch_iso, last_fetch_relative = _fetch_age_strings(
+            fetched_at, int(time.time())
+        )
     last_frozen_at = freeze_list[0]["created_at"] if freeze_list else None
-    # Study metadata for edit form
-    conn_meta = _connect()
-    cur_meta = conn_meta.cursor()
-    cur_meta.execute(
-        "SELECT study_id, study_label, study_description FROM soa WHERE id=?", (soa_id,)
-    )
-    meta_row = cur_meta.fetchone()
-    conn_meta.close()
     study_meta = {
         "study_id": meta_row[0] if meta_row else None,
         "study_label": meta_row[1] if meta_row else None,
         "study_description": meta_row[2] if meta_row else None,
     }
-    return templates.TemplateResponse(
+    return _stream_template(
         request,
         "edit.html",
         {
@@ -2998,7 +3138,7 @@ def ui_edit(request: Request, soa_id: int):
             "visits": visits,
             "activities": activities_page,
             "elements": elements,
-            "arms": _fetch_arms_for_edit(soa_id),
+            "arms": arms,
             "cell_map": cell_map,
             "concepts": concepts,
             "activity_concepts": activity_concepts,
@@ -3015,19 +3155,23 @@ def ui_edit(request: Request, soa_id: int):
 
 
 @app.get("/ui/concepts", response_class=HTMLResponse)
-def ui_concepts_list(request: Request):
-    """Render table listing biomedical concepts (title + href)."""
-    concepts = fetch_biomedical_concepts(force=True) or []
+def ui_concepts_list(request: Request, refresh: bool = False):
+    """Render table listing biomedical concepts (title + href).
+
+    Served from the TTL cache; ``?refresh=1`` forces an upstream refetch.
+    """
+    concepts = fetch_biomedical_concepts(force=refresh) or []
     rows = []
     for c in concepts:
         code = c.get("concept_code") or c.get("code")
         title = c.get("title") or c.get("concept_title") or c.get("name") or code
-        href = (
-            f"https://api.library.cdisc.org/api/cosmos/v2/mdr/bc/biomedicalconcepts/{code}"
-            if code
-            else None
+        rows.append(
+            {
+                "code": code,
+                "title": title,
+                "href": _BC_HREF_PREFIX + code if code else None,
+            }
         )
-        rows.append({"code": code, "title": title, "href": href})
     subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or _get_cdisc_api_key()
     return templates.TemplateResponse(
         request,
@@ -3097,13 +3241,16 @@ def ui_category_detail(request: Request, name: str = ""):
 
 
 @app.get("/ui/sdtm/specializations", response_class=HTMLResponse)
-def ui_sdtm_specializations_list(request: Request, code: Optional[str] = None):
+def ui_sdtm_specializations_list(
+    request: Request, code: Optional[str] = None, refresh: bool = False
+):
     """Render table listing SDTM dataset specializations (title + API link).
 
     If `code` is provided as a query parameter, each href will include
     ?biomedicalconcept={code} (or &biomedicalconcept=... when a query string already exists).
+    The unfiltered list is served from the TTL cache unless ``?refresh=1`` is given.
     """
-    packages = fetch_sdtm_specializations(force=True, code=code) or []
+    packages = fetch_sdtm_specializations(force=refresh, code=code) or []
     rows = [
         {"title": p.get("title") or "(untitled)", "href": p.get("href")}
         for p in packages
@@ -3129,16 +3276,21 @@ def ui_sdtm_specializations_list(request: Request, code: Optional[str] = None):
 
 
 @app.get("/ui/sdtm/specializations/{idx}", response_class=HTMLResponse)
-def ui_sdtm_specialization_detail(
+async def ui_sdtm_specialization_detail(
     idx: int,
     request: Request,
     code: Optional[str] = None,  # NEW: propagate code filter from query string
+    force: bool = False,
 ):
     """Detail page for a single SDTM dataset specialization.
 
-    Lookup by index into the (optionally filtered) list.
+    Lookup by index into the (optionally filtered) list. ``force`` bypasses the list
+    and detail caches.
     """
-    packages = fetch_sdtm_specializations(force=True, code=code) or []  # <-- pass code
+    packages = (
+        await asyncio.to_thread(fetch_sdtm_specializations, force=force, code=code)
+        or []
+    )
     if idx < 0 or idx >= len(packages):
         raise HTTPException(status_code=404, detail="Specialization index out of range")
     spec = packages[idx]
@@ -3146,14 +3298,8 @@ def ui_sdtm_specialization_detail(
     href = spec.get("href")
 
     api_key = _get_cdisc_api_key()
-    subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY")
-    unified_key = subscription_key or api_key
-    headers: dict[str, str] = {}
-    if unified_key:
-        headers["Ocp-Apim-Subscription-Key"] = unified_key
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-        headers["api-key"] = api_key
+    unified_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
+    headers = _cdisc_headers(api_key, unified_key)
 
     status = None
     error = None
@@ -3161,20 +3307,19 @@ def ui_sdtm_specialization_detail(
     raw_text_snippet = None
     if href:
         try:
-            resp = requests.get(href, headers=headers, timeout=15)
+            resp = await _cached_get(href, headers, force=force)
             status = resp.status_code
             raw_text_snippet = resp.text[:500]
             if resp.status_code == 200:
                 try:
-                    data = resp.json()
+                    data = orjson.loads(resp.content)
                 except ValueError:
                     error = "200 OK but response was not valid JSON"
                     data = None
                 if data is not None:
-                    try:
-                        pretty_json = json.dumps(data, indent=2, sort_keys=True)
-                    except Exception:
-                        pretty_json = json.dumps(data, indent=2)
+                    pretty_json = orjson.dumps(
+                        data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                    ).decode()
             else:
                 error = f"HTTP {resp.status_code} retrieving specialization"
         except Exception as e:
@@ -3201,34 +3346,27 @@ def ui_sdtm_specialization_detail(
 
 
 @app.get("/ui/concepts/{code}", response_class=HTMLResponse)
-def ui_concept_detail(code: str, request: Request):
+async def ui_concept_detail(code: str, request: Request, force: bool = False):
     """Detail page for a single biomedical concept. Fetches concept JSON from CDISC Library API,
     extracts title, canonical href, parentBiomedicalConcept href (if any), and parentPackage href.
+    Responses are cached briefly per URL; ``force`` refetches.
     """
     # Build concept API URL
-    api_href = (
-        f"https://api.library.cdisc.org/api/cosmos/v2/mdr/bc/biomedicalconcepts/{code}"
-    )
-    headers = {}
+    api_href = _BC_HREF_PREFIX + code
     api_key = _get_cdisc_api_key()
-    subscription_key = os.environ.get("CDISC_SUBSCRIPTION_KEY")
     # Some deployments use a single key; if only one provided, reuse it for both header styles
-    unified_key = subscription_key or api_key
-    if unified_key:
-        headers["Ocp-Apim-Subscription-Key"] = unified_key
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-        headers["api-key"] = api_key
+    unified_key = os.environ.get("CDISC_SUBSCRIPTION_KEY") or api_key
+    headers = _cdisc_headers(api_key, unified_key)
     concept_json = None
     parent_bc_href = None
     parent_pkg_href = None
     parent_bc_title = None
     status = None
     try:
-        resp = requests.get(api_href, headers=headers, timeout=10)
+        resp = await _cached_get(api_href, headers, timeout=10, force=force)
         status = resp.status_code
         if resp.status_code == 200:
-            concept_json = resp.json()
+            concept_json = orjson.loads(resp.content)
             # Extract parent biomedical concept link if present
             parent_bc_href = concept_json.get(
                 "parentBiomedicalConcept"
@@ -3269,7 +3407,11 @@ def ui_concept_detail(code: str, request: Request):
             "parent_bc_title": parent_bc_title,
             "parent_pkg_href": parent_pkg_href,
             "status": status,
-            "raw": json.dumps(concept_json, indent=2) if concept_json else None,
+            "raw": (
+                orjson.dumps(concept_json, option=orjson.OPT_INDENT_2).decode()
+                if concept_json
+                else None
+            ),
             "missing_key": unified_key is None,
         },
     )
@@ -3278,7 +3420,7 @@ def ui_concept_detail(code: str, request: Request):
 @app.post("/ui/soa/{soa_id}/add_visit", response_class=HTMLResponse)
 def ui_add_visit(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     name: str = Form(...),
     raw_header: str = Form(""),
     epoch_id_raw: str = Form(""),  # new flexible field name
@@ -3289,8 +3431,6 @@ def ui_add_visit(
     Accepts either form field name `epoch_id_raw` (new) or `epoch_id` (legacy).
     Blank selection is treated as None without triggering 422 validation.
     """
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     # Determine which raw epoch string was provided
     provided = (epoch_id_raw or "").strip() or (epoch_id or "").strip()
     parsed_epoch: Optional[int] = None
@@ -3299,27 +3439,25 @@ def ui_add_visit(
             parsed_epoch = int(provided)
         else:
             raise HTTPException(400, "Invalid epoch_id value")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM visit WHERE soa_id=?", (soa_id,))
-    order_index = cur.fetchone()[0] + 1
-    if parsed_epoch is not None:
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM visit WHERE soa_id=?", (soa_id,))
+        order_index = cur.fetchone()[0] + 1
+        if parsed_epoch is not None:
+            cur.execute(
+                "SELECT 1 FROM epoch WHERE id=? AND soa_id=?", (parsed_epoch, soa_id)
+            )
+            if not cur.fetchone():
+                raise HTTPException(400, "Invalid epoch_id for this SOA")
         cur.execute(
-            "SELECT 1 FROM epoch WHERE id=? AND soa_id=?", (parsed_epoch, soa_id)
+            "INSERT INTO visit (soa_id,name,raw_header,order_index,epoch_id) VALUES (?,?,?,?,?)",
+            (soa_id, name, raw_header or name, order_index, parsed_epoch),
         )
-        if not cur.fetchone():
-            conn.close()
-            raise HTTPException(400, "Invalid epoch_id for this SOA")
-    cur.execute(
-        "INSERT INTO visit (soa_id,name,raw_header,order_index,epoch_id) VALUES (?,?,?,?,?)",
-        (soa_id, name, raw_header or name, order_index, parsed_epoch),
-    )
-    vid = cur.lastrowid
-    conn.commit()
-    # Debug verification query
-    cur.execute("SELECT COUNT(*) FROM visit WHERE soa_id=?", (soa_id,))
-    _total_visits = cur.fetchone()[0]
-    conn.close()
+        vid = cur.lastrowid
+        conn.commit()
+        # Debug verification query
+        cur.execute("SELECT COUNT(*) FROM visit WHERE soa_id=?", (soa_id,))
+        _total_visits = cur.fetchone()[0]
     logger.info(
         "ui_add_visit inserted visit id=%s soa_id=%s total_visits_now=%s epoch_raw='%s' db_path=%s",
         vid,
@@ -3341,73 +3479,69 @@ def ui_add_visit(
             "epoch_id": parsed_epoch,
         },
     )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/add_arm", response_class=HTMLResponse)
 def ui_add_arm(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     name: str = Form(...),
     label: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     element_id: Optional[str] = Form(None),
 ):
     """Form handler to create a new Arm."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     # Accept blank/empty element selection gracefully. The form may submit "" which would 422 with Optional[int].
     eid = int(element_id) if element_id and element_id.strip().isdigit() else None
     payload = ArmCreate(name=name, label=label, description=description, element_id=eid)
     create_arm(soa_id, payload)
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/update_arm", response_class=HTMLResponse)
 def ui_update_arm(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     arm_id: int = Form(...),
     name: Optional[str] = Form(None),
     label: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     element_id: Optional[str] = Form(None),
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     # Coerce possible blank element selection to None; avoid 422 validation error from string "" into Optional[int].
     eid = int(element_id) if element_id and element_id.strip().isdigit() else None
     payload = ArmUpdate(name=name, label=label, description=description, element_id=eid)
     update_arm(soa_id, arm_id, payload)
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/delete_arm", response_class=HTMLResponse)
 def ui_delete_arm(request: Request, soa_id: int, arm_id: int = Form(...)):
     delete_arm(soa_id, arm_id)
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/reorder_arms", response_class=HTMLResponse)
-def ui_reorder_arms(request: Request, soa_id: int, order: str = Form("")):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def ui_reorder_arms(request: Request, soa_id: ExistingSoa, order: str = Form("")):
     ids = [int(x) for x in order.split(",") if x.strip().isdigit()]
     if not ids:
         return HTMLResponse("Invalid order", status_code=400)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM arm WHERE soa_id=? ORDER BY order_index", (soa_id,))
-    old_order = [r[0] for r in cur.fetchall()]
-    cur.execute("SELECT id FROM arm WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(ids) - existing:
-        conn.close()
-        return HTMLResponse("Order contains invalid arm id", status_code=400)
-    for idx, aid in enumerate(ids, start=1):
-        cur.execute("UPDATE arm SET order_index=? WHERE id=?", (idx, aid))
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Take the write lock before reading the old order so the audited order
+        # and the rewrite happen in one transaction
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute("SELECT id FROM arm WHERE soa_id=? ORDER BY order_index", (soa_id,))
+        old_order = [r[0] for r in cur.fetchall()]
+        existing = set(old_order)
+        if set(ids) - existing:
+            return HTMLResponse("Order contains invalid arm id", status_code=400)
+        cur.executemany(
+            "UPDATE arm SET order_index=? WHERE id=?",
+            [(idx, aid) for idx, aid in enumerate(ids, start=1)],
+        )
+        conn.commit()
     _record_reorder_audit(soa_id, "arm", old_order, ids)
     _record_arm_audit(
         soa_id,
@@ -3422,77 +3556,72 @@ def ui_reorder_arms(request: Request, soa_id: int, order: str = Form("")):
 @app.post("/ui/soa/{soa_id}/add_element", response_class=HTMLResponse)
 def ui_add_element(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     name: str = Form(...),
     label: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     testrl: Optional[str] = Form(None),
     teenrl: Optional[str] = Form(None),
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     name = (name or "").strip()
     if not name:
         raise HTTPException(400, "Name required")
-    conn = _connect()
-    cur = conn.cursor()
-    # Determine next order index
-    cur.execute(
-        "SELECT COALESCE(MAX(order_index),0) FROM element WHERE soa_id=?", (soa_id,)
-    )
-    next_ord = (cur.fetchone() or [0])[0] + 1
-    now = datetime.now(timezone.utc).isoformat()
-    # Check if legacy/non-standard element_id column exists and populate if required
-    cur.execute("PRAGMA table_info(element)")
-    element_cols = {r[1] for r in cur.fetchall()}
-    element_identifier: Optional[str] = None
-    if "element_id" in element_cols:
-        # Generate StudyElement_<n> where n is next unused integer for this SOA
-        cur.execute("SELECT element_id FROM element WHERE soa_id=?", (soa_id,))
-        existing_raw = [r[0] for r in cur.fetchall() if r[0]]
-        used_nums = set()
-        for val in existing_raw:
-            if val.startswith("StudyElement_"):
-                tail = val.split("StudyElement_")[-1]
-                if tail.isdigit():
-                    used_nums.add(int(tail))
-        next_n = 1
-        while next_n in used_nums:
-            next_n += 1
-        element_identifier = f"StudyElement_{next_n}"
-        cur.execute(
-            """INSERT INTO element (soa_id,name,label,description,testrl,teenrl,order_index,created_at,element_id)
-            VALUES (?,?,?,?,?,?,?,?,?)""",
-            (
-                soa_id,
-                name,
-                (label or "").strip() or None,
-                (description or "").strip() or None,
-                (testrl or "").strip() or None,
-                (teenrl or "").strip() or None,
-                next_ord,
-                now,
-                element_identifier,
-            ),
-        )
-    else:
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Determine next order index
         cur.execute(
-            """INSERT INTO element (soa_id,name,label,description,testrl,teenrl,order_index,created_at)
-            VALUES (?,?,?,?,?,?,?,?)""",
-            (
-                soa_id,
-                name,
-                (label or "").strip() or None,
-                (description or "").strip() or None,
-                (testrl or "").strip() or None,
-                (teenrl or "").strip() or None,
-                next_ord,
-                now,
-            ),
+            "SELECT COALESCE(MAX(order_index),0) FROM element WHERE soa_id=?", (soa_id,)
         )
-    eid = cur.lastrowid
-    conn.commit()
-    conn.close()
+        next_ord = (cur.fetchone() or [0])[0] + 1
+        # Check if legacy/non-standard element_id column exists and populate if required
+        element_identifier: Optional[str] = None
+        # table_info is served from the connection's parsed schema, so reading it
+        # per request stays cheap and follows a recreated database
+        cur.execute("PRAGMA table_info(element)")
+        if "element_id" in {r[1] for r in cur.fetchall()}:
+            # Generate StudyElement_<n> where n is next unused integer for this SOA
+            cur.execute("SELECT element_id FROM element WHERE soa_id=?", (soa_id,))
+            existing_raw = [r[0] for r in cur.fetchall() if r[0]]
+            used_nums = set()
+            for val in existing_raw:
+                if val.startswith("StudyElement_"):
+                    tail = val.split("StudyElement_")[-1]
+                    if tail.isdigit():
+                        used_nums.add(int(tail))
+            next_n = 1
+            while next_n in used_nums:
+                next_n += 1
+            element_identifier = f"StudyElement_{next_n}"
+            cur.execute(
+                f"""INSERT INTO element (soa_id,name,label,description,testrl,teenrl,order_index,created_at,element_id)
+                VALUES (?,?,?,?,?,?,?,{_SQL_UTC_NOW},?)""",
+                (
+                    soa_id,
+                    name,
+                    (label or "").strip() or None,
+                    (description or "").strip() or None,
+                    (testrl or "").strip() or None,
+                    (teenrl or "").strip() or None,
+                    next_ord,
+                    element_identifier,
+                ),
+            )
+        else:
+            cur.execute(
+                f"""INSERT INTO element (soa_id,name,label,description,testrl,teenrl,order_index,created_at)
+                VALUES (?,?,?,?,?,?,?,{_SQL_UTC_NOW})""",
+                (
+                    soa_id,
+                    name,
+                    (label or "").strip() or None,
+                    (description or "").strip() or None,
+                    (testrl or "").strip() or None,
+                    (teenrl or "").strip() or None,
+                    next_ord,
+                ),
+            )
+        eid = cur.lastrowid
+        conn.commit()
     _record_element_audit(
         soa_id,
         "create",
@@ -3509,13 +3638,13 @@ def ui_add_element(
             "element_id": element_identifier,
         },
     )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/update_element", response_class=HTMLResponse)
 def ui_update_element(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     element_id: int = Form(...),
     name: Optional[str] = Form(None),
     label: Optional[str] = Form(None),
@@ -3523,22 +3652,16 @@ def ui_update_element(
     testrl: Optional[str] = Form(None),
     teenrl: Optional[str] = Form(None),
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM element WHERE id=? AND soa_id=?", (element_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Element not found")
-    # Capture before
-    cur.execute(
-        "SELECT id,name,label,description,testrl,teenrl,order_index,created_at FROM element WHERE id=?",
-        (element_id,),
-    )
-    b = cur.fetchone()
-    before = None
-    if b:
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Before image doubles as the ownership check
+        cur.execute(
+            "SELECT id,name,label,description,testrl,teenrl,order_index,created_at FROM element WHERE id=? AND soa_id=?",
+            (element_id, soa_id),
+        )
+        b = cur.fetchone()
+        if not b:
+            raise HTTPException(404, "Element not found")
         before = {
             "id": b[0],
             "name": b[1],
@@ -3549,25 +3672,20 @@ def ui_update_element(
             "order_index": b[6],
             "created_at": b[7],
         }
-    cur.execute(
-        "UPDATE element SET name=?, label=?, description=?, testrl=?, teenrl=? WHERE id=?",
-        (
-            (name or "").strip() or None,
-            (label or "").strip() or None,
-            (description or "").strip() or None,
-            (testrl or "").strip() or None,
-            (teenrl or "").strip() or None,
-            element_id,
-        ),
-    )
-    conn.commit()
-    # Fetch after
-    cur.execute(
-        "SELECT id,name,label,description,testrl,teenrl,order_index,created_at FROM element WHERE id=?",
-        (element_id,),
-    )
-    a = cur.fetchone()
-    conn.close()
+        cur.execute(
+            "UPDATE element SET name=?, label=?, description=?, testrl=?, teenrl=? WHERE id=? "
+            "RETURNING id,name,label,description,testrl,teenrl,order_index,created_at",
+            (
+                (name or "").strip() or None,
+                (label or "").strip() or None,
+                (description or "").strip() or None,
+                (testrl or "").strip() or None,
+                (teenrl or "").strip() or None,
+                element_id,
+            ),
+        )
+        a = cur.fetchone()
+        conn.commit()
     after = {
         "id": a[0],
         "name": a[1],
@@ -3579,9 +3697,7 @@ def ui_update_element(
         "created_at": a[7],
     }
     mutable_fields = ["name", "label", "description", "testrl", "teenrl"]
-    updated_fields = [
-        f for f in mutable_fields if before and before.get(f) != after.get(f)
-    ]
+    updated_fields = [f for f in mutable_fields if before.get(f) != after.get(f)]
     _record_element_audit(
         soa_id,
         "update",
@@ -3589,55 +3705,66 @@ def ui_update_element(
         before=before,
         after={**after, "updated_fields": updated_fields},
     )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/delete_element", response_class=HTMLResponse)
-def ui_delete_element(request: Request, soa_id: int, element_id: int = Form(...)):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM element WHERE id=? AND soa_id=?", (element_id, soa_id))
-    conn.commit()
-    conn.close()
-    _record_element_audit(
-        soa_id, "delete", element_id, before={"id": element_id}, after=None
-    )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+def ui_delete_element(
+    request: Request, soa_id: ExistingSoa, element_id: int = Form(...)
+):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "DELETE FROM element WHERE id=? AND soa_id=? "
+            "RETURNING id,name,label,description,testrl,teenrl,order_index,created_at",
+            (element_id, soa_id),
+        )
+        b = cur.fetchone()
+        if not b:
+            raise HTTPException(404, "Element not found")
+        conn.commit()
+    before = {
+        "id": b[0],
+        "name": b[1],
+        "label": b[2],
+        "description": b[3],
+        "testrl": b[4],
+        "teenrl": b[5],
+        "order_index": b[6],
+        "created_at": b[7],
+    }
+    _record_element_audit(soa_id, "delete", element_id, before=before, after=None)
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/add_epoch", response_class=HTMLResponse)
 def ui_add_epoch(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     name: str = Form(...),
     epoch_label: Optional[str] = Form(None),
     epoch_description: Optional[str] = Form(None),
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM epoch WHERE soa_id=?", (soa_id,))
-    order_index = cur.fetchone()[0] + 1
-    cur.execute("SELECT MAX(epoch_seq) FROM epoch WHERE soa_id=?", (soa_id,))
-    row = cur.fetchone()
-    next_seq = (row[0] or 0) + 1
-    cur.execute(
-        "INSERT INTO epoch (soa_id,name,order_index,epoch_seq,epoch_label,epoch_description) VALUES (?,?,?,?,?,?)",
-        (
-            soa_id,
-            name,
-            order_index,
-            next_seq,
-            (epoch_label or "").strip() or None,
-            (epoch_description or "").strip() or None,
-        ),
-    )
-    eid = cur.lastrowid
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM epoch WHERE soa_id=?", (soa_id,))
+        order_index = cur.fetchone()[0] + 1
+        cur.execute("SELECT MAX(epoch_seq) FROM epoch WHERE soa_id=?", (soa_id,))
+        row = cur.fetchone()
+        next_seq = (row[0] or 0) + 1
+        cur.execute(
+            "INSERT INTO epoch (soa_id,name,order_index,epoch_seq,epoch_label,epoch_description) VALUES (?,?,?,?,?,?)",
+            (
+                soa_id,
+                name,
+                order_index,
+                next_seq,
+                (epoch_label or "").strip() or None,
+                (epoch_description or "").strip() or None,
+            ),
+        )
+        eid = cur.lastrowid
+        conn.commit()
     _record_epoch_audit(
         soa_id,
         "create",
@@ -3652,38 +3779,28 @@ def ui_add_epoch(
             "epoch_description": (epoch_description or "").strip() or None,
         },
     )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/update_epoch", response_class=HTMLResponse)
 def ui_update_epoch(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     epoch_id: int = Form(...),
     name: Optional[str] = Form(None),
     epoch_label: Optional[str] = Form(None),
     epoch_description: Optional[str] = Form(None),
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM epoch WHERE id=? AND soa_id=?", (epoch_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Epoch not found")
-    conn.close()
-    # Capture before
-    conn_b = _connect()
-    cur_b = conn_b.cursor()
-    cur_b.execute(
-        "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE id=?",
-        (epoch_id,),
-    )
-    b = cur_b.fetchone()
-    conn_b.close()
-    before = None
-    if b:
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Capture before (doubles as the existence check)
+        cur.execute(
+            "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE id=? AND soa_id=?",
+            (epoch_id, soa_id),
+        )
+        b = cur.fetchone()
+        if not b:
+            raise HTTPException(404, "Epoch not found")
         before = {
             "id": b[0],
             "name": b[1],
@@ -3692,48 +3809,44 @@ def ui_update_epoch(
             "epoch_label": b[4],
             "epoch_description": b[5],
         }
-    sets = []
-    vals: list[Any] = []
-    if name is not None:
-        sets.append("name=?")
-        vals.append((name or "").strip() or None)
-    if epoch_label is not None:
-        sets.append("epoch_label=?")
-        vals.append((epoch_label or "").strip() or None)
-    if epoch_description is not None:
-        sets.append("epoch_description=?")
-        vals.append((epoch_description or "").strip() or None)
-    if sets:
-        conn_u = _connect()
-        cur_u = conn_u.cursor()
-        vals.append(epoch_id)
-        cur_u.execute(f"UPDATE epoch SET {', '.join(sets)} WHERE id=?", vals)
-        conn_u.commit()
-        conn_u.close()
-    conn_a = _connect()
-    cur_a = conn_a.cursor()
-    cur_a.execute(
-        "SELECT id,name,order_index,epoch_seq,epoch_label,epoch_description FROM epoch WHERE id=?",
-        (epoch_id,),
-    )
-    r = cur_a.fetchone()
-    conn_a.close()
-    after_api = {
-        "id": r[0],
-        "name": r[1],
-        "order_index": r[2],
-        "epoch_seq": r[3],
-        "epoch_label": r[4],
-        "epoch_description": r[5],
-    }
-    _record_epoch_audit(
-        soa_id,
-        "update",
-        epoch_id,
-        before=before,
-        after=after_api,
-    )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+        sets = []
+        vals: list[Any] = []
+        if name is not None:
+            sets.append("name=?")
+            vals.append((name or "").strip() or None)
+        if epoch_label is not None:
+            sets.append("epoch_label=?")
+            vals.append((epoch_label or "").strip() or None)
+        if epoch_description is not None:
+            sets.append("epoch_description=?")
+            vals.append((epoch_description or "").strip() or None)
+        after_api = dict(before)
+        if sets:
+            vals.append(epoch_id)
+            cur.execute(
+                f"UPDATE epoch SET {', '.join(sets)} WHERE id=? "
+                "RETURNING id,name,order_index,epoch_seq,epoch_label,epoch_description",
+                vals,
+            )
+            r = cur.fetchone()
+            after_api = {
+                "id": r[0],
+                "name": r[1],
+                "order_index": r[2],
+                "epoch_seq": r[3],
+                "epoch_label": r[4],
+                "epoch_description": r[5],
+            }
+        _record_epoch_audit(
+            soa_id,
+            "update",
+            epoch_id,
+            before=before,
+            after=after_api,
+            conn=conn,
+        )
+        conn.commit()
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post(
@@ -3745,20 +3858,17 @@ def ui_set_activity_concepts(
     activity_id: int,
     concept_codes: List[str] = Form([]),
 ):
-    payload = ConceptsUpdate(concept_codes=list(dict.fromkeys(concept_codes)))
-    set_activity_concepts(soa_id, activity_id, payload)
+    hx = request.headers.get("HX-Request") == "true"
+    # Write and (for HTMX) read back the selection on one connection
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        _replace_activity_concepts(cur, soa_id, activity_id, concept_codes)
+        conn.commit()
+        selected = _get_activity_concepts(cur, activity_id) if hx else None
     # HTMX inline update support
-    if request.headers.get("HX-Request") == "true":
+    if hx:
         concepts = fetch_biomedical_concepts()
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT concept_code, concept_title FROM activity_concept WHERE activity_id=?",
-            (activity_id,),
-        )
-        selected = [{"code": c, "title": t} for c, t in cur.fetchall()]
-        conn.close()
-        html = templates.get_template("concepts_cell.html").render(
+        html = _CONCEPTS_CELL_TPL.render(
             request=request,
             soa_id=soa_id,
             activity_id=activity_id,
@@ -3768,32 +3878,24 @@ def ui_set_activity_concepts(
             edit=False,
         )
         return HTMLResponse(html)
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.get(
     "/ui/soa/{soa_id}/activity/{activity_id}/concepts_cell", response_class=HTMLResponse
 )
 def ui_activity_concepts_cell(
-    request: Request, soa_id: int, activity_id: int, edit: int = 0
+    request: Request, soa_id: ExistingSoa, activity_id: int, edit: int = 0
 ):
     # Defensive guard: if activity_id is somehow falsy (should not happen for valid int path param)
     # surface a clear 400 error rather than proceeding and causing confusing downstream behavior.
     if not activity_id:
         raise HTTPException(status_code=400, detail="Missing activity_id")
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     concepts = fetch_biomedical_concepts()
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT concept_code, concept_title FROM activity_concept WHERE activity_id=?",
-        (activity_id,),
-    )
-    selected = [{"code": c, "title": t} for c, t in cur.fetchall()]
-    conn.close()
+    with pooled_conn() as conn:
+        selected = _get_activity_concepts(conn.cursor(), activity_id)
     return HTMLResponse(
-        templates.get_template("concepts_cell.html").render(
+        _CONCEPTS_CELL_TPL.render(
             request=request,
             soa_id=soa_id,
             activity_id=activity_id,
@@ -3819,50 +3921,50 @@ def ui_set_cell(
     return HTMLResponse(result.get("status", ""))
 
 
+# Same markup as the matrix cell in edit.html (data-visit-id keeps client-side column
+# reordering working after a swap). All fields are ints or the constant "X"/"", so
+# nothing needs escaping.
+_TOGGLE_CELL_TPL = (
+    '<td data-visit-id="{visit}" hx-post="/ui/soa/{soa}/toggle_cell" '
+    'hx-vals=\'{{"visit_id":{visit},"activity_id":{activity}}}\' '
+    'hx-swap="outerHTML" class="cell">{status}</td>'
+)
+
+
 @app.post("/ui/soa/{soa_id}/toggle_cell", response_class=HTMLResponse)
 def ui_toggle_cell(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     visit_id: int = Form(...),
     activity_id: int = Form(...),
 ):
     """Toggle logic: blank -> X, X -> blank (delete row). Returns updated <td> snippet with next action encoded.
     This avoids stale hx-vals attributes after a partial swap."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    # Determine current status
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT status,id FROM matrix_cells WHERE soa_id=? AND visit_id=? AND activity_id=?",
-        (soa_id, visit_id, activity_id),
-    )
-    row = cur.fetchone()
-    if row and row[0] == "X":
-        # clear
-        cur.execute("DELETE FROM matrix_cells WHERE id=?", (row[1],))
-        conn.commit()
-        conn.close()
-        current = ""
-    elif row:
-        # Any non-blank treated as blank visually, remove
-        cur.execute("DELETE FROM matrix_cells WHERE id=?", (row[1],))
-        conn.commit()
-        conn.close()
-        current = ""
-    else:
-        # create X
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # An empty cell becomes X; any existing status (X or otherwise) clears the cell.
+        # Marking cells is the common case, so try the insert first: it is a single
+        # statement, and ux_matrix_cells_soa_visit_activity turns it into a no-op when
+        # the cell is already filled.
         cur.execute(
-            "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,?)",
-            (soa_id, visit_id, activity_id, "X"),
+            "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (?,?,?,'X') "
+            "ON CONFLICT(soa_id, visit_id, activity_id) DO NOTHING RETURNING id",
+            (soa_id, visit_id, activity_id),
         )
+        if cur.fetchone():
+            current = "X"
+        else:
+            cur.execute(
+                "DELETE FROM matrix_cells WHERE soa_id=? AND visit_id=? AND activity_id=?",
+                (soa_id, visit_id, activity_id),
+            )
+            current = ""
         conn.commit()
-        conn.close()
-        current = "X"
-    # Next status (for hx-vals) depends on current
-    # next_status = "X" if current == "" else ""
-    cell_html = f'<td hx-post="/ui/soa/{soa_id}/toggle_cell" hx-vals=\'{{"visit_id": {visit_id}, "activity_id": {activity_id}}}\' hx-swap="outerHTML" class="cell">{current}</td>'
-    return HTMLResponse(cell_html)
+    return HTMLResponse(
+        _TOGGLE_CELL_TPL.format(
+            soa=soa_id, visit=visit_id, activity=activity_id, status=current
+        )
+    )
 
 
 @app.post("/ui/soa/{soa_id}/delete_visit", response_class=HTMLResponse)
@@ -3880,19 +3982,17 @@ def ui_delete_visit(request: Request, soa_id: int, visit_id: int = Form(...)):
         logger.error(
             "ui_delete_visit failed visit_id=%s soa_id=%s error=%s", visit_id, soa_id, e
         )
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/set_visit_epoch", response_class=HTMLResponse)
 def ui_set_visit_epoch(
     request: Request,
-    soa_id: int,
+    soa_id: ExistingSoa,
     visit_id: int = Form(...),
     epoch_id_raw: str = Form(""),  # new field name (blank means clear)
     epoch_id: str = Form(""),  # legacy field name used by template select
 ):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     # Determine provided raw value (prefer epoch_id_raw if non-blank)
     raw_val = (epoch_id_raw or "").strip() or (epoch_id or "").strip()
     parsed_epoch: Optional[int] = None
@@ -3901,122 +4001,127 @@ def ui_set_visit_epoch(
             parsed_epoch = int(raw_val)
         else:
             raise HTTPException(400, "Invalid epoch_id value")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM visit WHERE id=? AND soa_id=?", (visit_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Visit not found")
-    if parsed_epoch is not None:
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Visit ownership and epoch validity are checked by the UPDATE itself; the
+        # follow-up SELECT only runs on failure to pick the right error
         cur.execute(
-            "SELECT 1 FROM epoch WHERE id=? AND soa_id=?", (parsed_epoch, soa_id)
+            "UPDATE visit SET epoch_id=? WHERE id=? AND soa_id=? "
+            "AND (? IS NULL OR EXISTS (SELECT 1 FROM epoch WHERE id=? AND soa_id=?))",
+            (parsed_epoch, visit_id, soa_id, parsed_epoch, parsed_epoch, soa_id),
         )
-        if not cur.fetchone():
-            conn.close()
+        if cur.rowcount == 0:
+            cur.execute(
+                "SELECT 1 FROM visit WHERE id=? AND soa_id=?", (visit_id, soa_id)
+            )
+            if not cur.fetchone():
+                raise HTTPException(404, "Visit not found")
             raise HTTPException(400, "Invalid epoch_id for this SOA")
-    cur.execute("UPDATE visit SET epoch_id=? WHERE id=?", (parsed_epoch, visit_id))
-    conn.commit()
-    logger.info(
-        "ui_set_visit_epoch updated visit id=%s soa_id=%s epoch_id=%s raw_val='%s' db_path=%s",
-        visit_id,
-        soa_id,
-        parsed_epoch,
-        raw_val,
-        DB_PATH,
-    )
-    conn.close()
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+        conn.commit()
+        logger.info(
+            "ui_set_visit_epoch updated visit id=%s soa_id=%s epoch_id=%s raw_val='%s' db_path=%s",
+            visit_id,
+            soa_id,
+            parsed_epoch,
+            raw_val,
+            DB_PATH,
+        )
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/delete_activity", response_class=HTMLResponse)
 def ui_delete_activity(request: Request, soa_id: int, activity_id: int = Form(...)):
     delete_activity(soa_id, activity_id)
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/delete_epoch", response_class=HTMLResponse)
 def ui_delete_epoch(request: Request, soa_id: int, epoch_id: int = Form(...)):
     delete_epoch(soa_id, epoch_id)
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return _redirect_to_edit(request, soa_id)
 
 
 @app.post("/ui/soa/{soa_id}/reorder_visits", response_class=HTMLResponse)
-def ui_reorder_visits(request: Request, soa_id: int, order: str = Form("")):
+def ui_reorder_visits(request: Request, soa_id: ExistingSoa, order: str = Form("")):
     """Persist new visit ordering. 'order' is a comma-separated list of visit IDs in desired order."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     ids = [int(x) for x in order.split(",") if x.strip().isdigit()]
     if not ids:
         return HTMLResponse("Invalid order", status_code=400)
-    conn = _connect()
-    cur = conn.cursor()
-    # Capture existing order BEFORE modifications
-    cur.execute("SELECT id FROM visit WHERE soa_id=? ORDER BY order_index", (soa_id,))
-    old_order = [r[0] for r in cur.fetchall()]
-    # Validate membership
-    cur.execute("SELECT id FROM visit WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(ids) - existing:
-        conn.close()
-        return HTMLResponse("Order contains invalid visit id", status_code=400)
-    # Apply new order indices
-    for idx, vid in enumerate(ids, start=1):
-        cur.execute("UPDATE visit SET order_index=? WHERE id=?", (idx, vid))
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Take the write lock before reading the old order so the audited order
+        # and the rewrite happen in one transaction
+        cur.execute("BEGIN IMMEDIATE")
+        # Capture existing order BEFORE modifications
+        cur.execute(
+            "SELECT id FROM visit WHERE soa_id=? ORDER BY order_index", (soa_id,)
+        )
+        old_order = [r[0] for r in cur.fetchall()]
+        # Validate membership
+        existing = set(old_order)
+        if set(ids) - existing:
+            return HTMLResponse("Order contains invalid visit id", status_code=400)
+        # Apply new order indices
+        cur.executemany(
+            "UPDATE visit SET order_index=? WHERE id=?",
+            [(idx, vid) for idx, vid in enumerate(ids, start=1)],
+        )
+        conn.commit()
     _record_reorder_audit(soa_id, "visit", old_order, ids)
     return HTMLResponse("OK")
 
 
 @app.post("/ui/soa/{soa_id}/reorder_activities", response_class=HTMLResponse)
-def ui_reorder_activities(request: Request, soa_id: int, order: str = Form("")):
+def ui_reorder_activities(request: Request, soa_id: ExistingSoa, order: str = Form("")):
     """Persist new activity ordering. 'order' is a comma-separated list of activity IDs in desired order."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     ids = [int(x) for x in order.split(",") if x.strip().isdigit()]
     if not ids:
         return HTMLResponse("Invalid order", status_code=400)
-    conn = _connect()
-    cur = conn.cursor()
-    # Capture previous order
-    cur.execute(
-        "SELECT id FROM activity WHERE soa_id=? ORDER BY order_index", (soa_id,)
-    )
-    old_order = [r[0] for r in cur.fetchall()]
-    cur.execute("SELECT id FROM activity WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(ids) - existing:
-        conn.close()
-        return HTMLResponse("Order contains invalid activity id", status_code=400)
-    for idx, aid in enumerate(ids, start=1):
-        cur.execute("UPDATE activity SET order_index=? WHERE id=?", (idx, aid))
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Take the write lock before reading the old order so the audited order
+        # and the rewrite happen in one transaction
+        cur.execute("BEGIN IMMEDIATE")
+        # Capture previous order
+        cur.execute(
+            "SELECT id FROM activity WHERE soa_id=? ORDER BY order_index", (soa_id,)
+        )
+        old_order = [r[0] for r in cur.fetchall()]
+        existing = set(old_order)
+        if set(ids) - existing:
+            return HTMLResponse("Order contains invalid activity id", status_code=400)
+        cur.executemany(
+            "UPDATE activity SET order_index=? WHERE id=?",
+            [(idx, aid) for idx, aid in enumerate(ids, start=1)],
+        )
+        conn.commit()
     _record_reorder_audit(soa_id, "activity", old_order, ids)
     return HTMLResponse("OK")
 
 
 @app.post("/ui/soa/{soa_id}/reorder_epochs", response_class=HTMLResponse)
-def ui_reorder_epochs(request: Request, soa_id: int, order: str = Form("")):
+def ui_reorder_epochs(request: Request, soa_id: ExistingSoa, order: str = Form("")):
     """Persist new epoch ordering."""
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
     ids = [int(x) for x in order.split(",") if x.strip().isdigit()]
     if not ids:
         return HTMLResponse("Invalid order", status_code=400)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM epoch WHERE soa_id=? ORDER BY order_index", (soa_id,))
-    old_order = [r[0] for r in cur.fetchall()]
-    cur.execute("SELECT id FROM epoch WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(ids) - existing:
-        conn.close()
-        return HTMLResponse("Order contains invalid epoch id", status_code=400)
-    for idx, eid in enumerate(ids, start=1):
-        cur.execute("UPDATE epoch SET order_index=? WHERE id=?", (idx, eid))
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Take the write lock before reading the old order so the audited order
+        # and the rewrite happen in one transaction
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(
+            "SELECT id FROM epoch WHERE soa_id=? ORDER BY order_index", (soa_id,)
+        )
+        old_order = [r[0] for r in cur.fetchall()]
+        existing = set(old_order)
+        if set(ids) - existing:
+            return HTMLResponse("Order contains invalid epoch id", status_code=400)
+        cur.executemany(
+            "UPDATE epoch SET order_index=? WHERE id=?",
+            [(idx, eid) for idx, eid in enumerate(ids, start=1)],
+        )
+        conn.commit()
     _record_reorder_audit(soa_id, "epoch", old_order, ids)
     # Also record epoch-specific reorder audit for parity with JSON endpoint
     _record_epoch_audit(
@@ -4030,42 +4135,518 @@ def ui_reorder_epochs(request: Request, soa_id: int, order: str = Form("")):
 
 
 # --------------------- DDF Terminology Load ---------------------
+@contextmanager
+def _bulk_load_conn():
+    """Dedicated connection rebuilding a terminology table in one transaction.
+
+    DROP, CREATE, the bulk INSERT and the index builds commit together, so readers
+    never see a missing or half-filled table. The connection keeps synchronous=NORMAL:
+    under WAL the commit itself is not fsynced, while OFF would risk corrupting the
+    database on an OS crash or power loss.
+    """
+    conn = _connect()
+    try:
+        conn.execute("BEGIN")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+_SANI_NONALNUM = re.compile(r"[^a-z0-9]+")
+_SANI_UNDERSCORES = re.compile(r"_+")
+# Terminology dataset date, taken from the worksheet name (YYYY-MM-DD)
+_DATASET_DATE_RE = re.compile(r"(20\d{2}-\d{2}-\d{2})")
+_ISO_DATE_RE = re.compile(r"\d{4}-(\d{2})-(\d{2})")
+
+
+def _valid_date(d: str) -> bool:
+    """Lexical YYYY-MM-DD check for audit date filters, which compare against the
+    date prefix of stored ISO timestamps."""
+    m = _ISO_DATE_RE.fullmatch(d)
+    return bool(m) and 1 <= int(m[1]) <= 12 and 1 <= int(m[2]) <= 31
+
+
+# Filter predicates in the order of _audit_filter's shape flags. Range comparisons
+# on loaded_at itself (rather than substr of it) let the (source, loaded_at, id)
+# index serve the date filters; '~' sorts after the time part of any timestamp on
+# the end date.
+_AUDIT_PREDICATES = ("source = ?", "loaded_at >= ?", "loaded_at < ?", "id < ?")
+
+
+def _audit_filter(
+    source: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    before_id: Optional[int] = None,
+) -> tuple[tuple[bool, ...], list]:
+    """Filter shape (which predicates apply) and bound params for terminology audit
+    queries; invalid dates are ignored."""
+    values = (
+        source or None,
+        start if start and _valid_date(start) else None,
+        end + "~" if end and _valid_date(end) else None,
+        before_id,
+    )
+    shape = tuple(v is not None for v in values)
+    return shape, [v for v in values if v is not None]
+
+
+@lru_cache(maxsize=64)
+def _audit_select_sql(table: str, columns: str, shape: tuple[bool, ...]) -> str:
+    """Newest-first audit SELECT for one filter shape. The text is built once per
+    shape, so every request reuses one of a handful of cached prepared statements."""
+    clauses = [p for p, on in zip(_AUDIT_PREDICATES, shape) if on]
+    where_sql = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    return f"SELECT {columns} FROM {table}{where_sql} ORDER BY id DESC"
+
+
+_AUDIT_PAGE_DEFAULT = 500
+_AUDIT_PAGE_MAX = 5000
+_AUDIT_ROW_KEYS = (
+    "id",
+    "loaded_at",
+    "original_filename",
+    "file_path",
+    "sheet_name",
+    "row_count",
+    "column_count",
+    "source",
+    "file_hash",
+    "error",
+    "dataset_date",
+)
+_AUDIT_ROW_COLUMNS = ",".join(_AUDIT_ROW_KEYS)
+
+
+def _audit_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    source: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    limit: int,
+    before_id: Optional[int],
+) -> List[dict]:
+    """One page of a terminology audit table, newest first, as dicts keyed by
+    _AUDIT_ROW_KEYS (zipped against the fixed SELECT column order)."""
+    limit = max(1, min(limit, _AUDIT_PAGE_MAX))
+    shape, params = _audit_filter(source, start, end, before_id)
+    params.append(limit)
+    cur = conn.cursor()
+    cur.execute(
+        _audit_select_sql(table, _AUDIT_ROW_COLUMNS, shape) + " LIMIT ?", params
+    )
+    return [dict(zip(_AUDIT_ROW_KEYS, r)) for r in cur.fetchall()]
+
+
+def _audit_sources(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Distinct audit sources for the filter dropdown (served by the source index)."""
+    cur = conn.execute(
+        f"SELECT DISTINCT source FROM {table} WHERE source IS NOT NULL ORDER BY source"
+    )
+    return [r[0] for r in cur.fetchall()]
+
+
+def _audit_page(
+    table: str,
+    source: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    limit: int,
+    before_id: Optional[int],
+) -> dict:
+    """JSON page of audit rows using keyset pagination: pass the returned
+    ``next_before_id`` back as ``before_id`` for the next page."""
+    limit = max(1, min(limit, _AUDIT_PAGE_MAX))
+    with pooled_conn() as conn:
+        rows = _audit_rows(conn, table, source, start, end, limit, before_id)
+    next_before_id = rows[-1]["id"] if len(rows) == limit else None
+    return {"rows": rows, "next_before_id": next_before_id}
+
+
+_AUDIT_CSV_HEADER = (
+    "id",
+    "loaded_at",
+    "source",
+    "original_filename",
+    "file_hash",
+    "row_count",
+    "column_count",
+    "sheet_name",
+    "error",
+)
+# Header order; a NULL error is written as an empty cell
+_AUDIT_CSV_COLUMNS = ",".join(_AUDIT_CSV_HEADER[:-1]) + ",COALESCE(error,'')"
+_AUDIT_CSV_BATCH = 500
+
+
+def _stream_audit_csv(
+    table: str,
+    source: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+) -> StreamingResponse:
+    """Stream a terminology audit table as CSV straight off a cursor, a batch of
+    rows per chunk, instead of building every row and the whole file first."""
+    shape, params = _audit_filter(source, start, end)
+    sql = _audit_select_sql(table, _AUDIT_CSV_COLUMNS, shape)
+
+    def _iter_csv():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(_AUDIT_CSV_HEADER)
+        yield buf.getvalue().encode("utf-8")
+        with pooled_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            while batch := cur.fetchmany(_AUDIT_CSV_BATCH):
+                buf.seek(0)
+                buf.truncate()
+                writer.writerows(batch)
+                yield buf.getvalue().encode("utf-8")
+
+    return StreamingResponse(
+        _iter_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={table}.csv"},
+    )
+
+
+def _stream_audit_json(
+    table: str,
+    source: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+) -> StreamingResponse:
+    """Stream every matching audit row as one JSON array, newest first. Unlike the
+    paged audit endpoint the export is never truncated."""
+    shape, params = _audit_filter(source, start, end)
+    sql = _audit_select_sql(table, _AUDIT_ROW_COLUMNS, shape)
+
+    def _iter_json():
+        sep = b"["
+        with pooled_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            while batch := cur.fetchmany(_AUDIT_CSV_BATCH):
+                chunk = b",".join(
+                    orjson.dumps(dict(zip(_AUDIT_ROW_KEYS, r))) for r in batch
+                )
+                yield sep + chunk
+                sep = b","
+        yield b"]" if sep == b"," else b"[]"
+
+    return StreamingResponse(_iter_json(), media_type="application/json")
+
+
+def _audit_ui_context(
+    table: str,
+    source: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    before_id: Optional[int],
+) -> dict:
+    """Template context for an audit page: one page of rows older than
+    ``before_id`` plus the cursor for the next (older) page."""
+    # The page and the source dropdown share one pooled connection
+    with pooled_conn() as conn:
+        rows = _audit_rows(
+            conn, table, source, start, end, _AUDIT_PAGE_DEFAULT, before_id
+        )
+        sources = _audit_sources(conn, table)
+    return {
+        "rows": rows,
+        "count": len(rows),
+        "next_before_id": rows[-1]["id"] if len(rows) == _AUDIT_PAGE_DEFAULT else None,
+        "before_id": before_id,
+        "sources": sources,
+        "current_source": source or "",
+        "start": start or "",
+        "end": end or "",
+    }
+
+
+_HASH_CHUNK = 1 << 20
+# Workbook extensions accepted by the terminology upload forms
+_ALLOWED_UPLOAD_EXT = frozenset({".xls", ".xlsx"})
+# Columns covered by the terminology free-text search
+_TERMINOLOGY_SEARCH_COLS = (
+    "code",
+    "cdisc_submission_value",
+    "cdisc_definition",
+    "cdisc_synonym_s",
+    "nci_preferred_term",
+    "codelist_name",
+    "codelist_code",
+)
+# The trigram tokenizer indexes every 3-character window, so shorter search
+# strings cannot use the FTS table and fall back to a LIKE scan
+_FTS_MIN_SEARCH = 3
+# Per terminology table: (schema_version, state) where state is (columns except id,
+# searchable columns, has FTS index, row count), or None while the table is not loaded
+_TerminologyState = tuple[tuple[str, ...], tuple[str, ...], bool, int]
+_terminology_states: dict[str, tuple[int, Optional[_TerminologyState]]] = {}
+
+
+def _build_terminology_fts(cur: sqlite3.Cursor, table: str, columns: list[str]):
+    """(Re)build ``<table>_fts``, an external-content FTS5 trigram index over the
+    searchable columns, so substring search avoids scanning LOWER(col) LIKE.
+    Skipped with a warning when this SQLite lacks FTS5.
+    """
+    fts_cols = [c for c in columns if c in _TERMINOLOGY_SEARCH_COLS]
+    cur.execute(f"DROP TABLE IF EXISTS {table}_fts")
+    if not fts_cols:
+        return
+    col_sql = ", ".join(fts_cols)
+    try:
+        cur.execute(
+            f"CREATE VIRTUAL TABLE {table}_fts USING fts5({col_sql}, "
+            f"content='{table}', content_rowid='id', tokenize='trigram')"
+        )
+    except sqlite3.OperationalError as e:  # pragma: no cover
+        logger.warning("FTS5 unavailable; %s search uses LIKE: %s", table, e)
+        return
+    cur.execute(
+        f"INSERT INTO {table}_fts(rowid, {col_sql}) SELECT id, {col_sql} FROM {table}"
+    )
+
+
+def _terminology_page(
+    cur: sqlite3.Cursor,
+    table: str,
+    select_cols: list[str],
+    where_sql: str,
+    params: list,
+    limit: int,
+    offset: int,
+) -> tuple[list[dict], int]:
+    """One page of rows ordered by code plus the filtered match count, taken from a
+    COUNT(*) OVER () window so the filter is evaluated once."""
+    cur.execute(
+        f"SELECT COUNT(*) OVER (), {', '.join(select_cols)} FROM {table}{where_sql} "
+        "ORDER BY code LIMIT ? OFFSET ?",
+        params + [limit, offset],
+    )
+    rows_raw = cur.fetchall()
+    if rows_raw:
+        matched_count = rows_raw[0][0]
+    elif offset:
+        # Paged past the end: the window yields no row to carry the count
+        cur.execute(f"SELECT COUNT(*) FROM {table}{where_sql}", params)
+        matched_count = cur.fetchone()[0]
+    else:
+        matched_count = 0
+    rows = [dict(zip(select_cols, r[1:])) for r in rows_raw]
+    return rows, matched_count
+
+
+def _terminology_state(cur: sqlite3.Cursor, table: str) -> Optional[_TerminologyState]:
+    """Column layout and row count of a terminology table; None if it is not loaded.
+
+    Every (re)load drops and recreates the table, which bumps SQLite's schema_version
+    cookie in the database header, so the cached state is revalidated against it:
+    a reload by another worker process invalidates it here too. The read transaction
+    opened first keeps the check and the caller's queries on one snapshot.
+    """
+    if not cur.connection.in_transaction:
+        cur.execute("BEGIN")
+    version = cur.execute("PRAGMA schema_version").fetchone()[0]
+    cached = _terminology_states.get(table)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    cur.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name IN (?, ?)",
+        (table, f"{table}_fts"),
+    )
+    names = {r[0] for r in cur.fetchall()}
+    state = None
+    if table in names:
+        cur.execute(f"PRAGMA table_info({table})")
+        cols = tuple(r[1] for r in cur.fetchall() if r[1] != "id")
+        searchable = tuple(c for c in cols if c in _TERMINOLOGY_SEARCH_COLS)
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        state = (cols, searchable, f"{table}_fts" in names, cur.fetchone()[0])
+    _terminology_states[table] = (version, state)
+    return state
+
+
+@lru_cache(maxsize=32)
+def _terminology_like_where(searchable: tuple[str, ...]) -> str:
+    return "(" + " OR ".join(f"LOWER({c}) LIKE ?" for c in searchable) + ")"
+
+
+def _terminology_search_clause(
+    table: str, searchable: tuple[str, ...], has_fts: bool, search: str
+) -> tuple[str, list]:
+    """WHERE fragment and params matching ``search`` as a case-insensitive substring
+    of any searchable column; uses the FTS index when present."""
+    if has_fts and len(search) >= _FTS_MIN_SEARCH:
+        phrase = '"' + search.replace('"', '""') + '"'
+        return (
+            f"id IN (SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ?)",
+            [phrase],
+        )
+    return _terminology_like_where(searchable), [f"%{search.lower()}%"] * len(
+        searchable
+    )
+
+
+def _sha256_file(path: str) -> str:
+    """Hex SHA-256 of a file, read in 1MB chunks so memory stays bounded."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _spool_upload(src, suffix: str) -> tuple[str, str]:
+    """Copy an uploaded file object to a named temp file, hashing it on the way.
+
+    Returns (temp path, hex SHA-256); the upload is never held in memory whole. The
+    loader needs a path that outlives the request, so the copy cannot be skipped, but
+    it reuses one chunk buffer instead of allocating a new bytes object per read.
+    """
+    h = hashlib.sha256()
+    readinto = getattr(src, "readinto", None)  # SpooledTemporaryFile: Python 3.11+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        if readinto is None:
+            for chunk in iter(lambda: src.read(_HASH_CHUNK), b""):
+                h.update(chunk)
+                tmp.write(chunk)
+        else:
+            view = memoryview(bytearray(_HASH_CHUNK))
+            while n := readinto(view):
+                h.update(view[:n])
+                tmp.write(view[:n])
+    return tmp.name, h.hexdigest()
+
+
 def _sanitize_column(name: str) -> str:
     """Sanitize Excel column header to safe SQLite identifier: lowercase, replace spaces & non-alnum with underscore, collapse repeats."""
-    import re
-
     s = name.strip().lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s)
-    s = re.sub(r"_+", "_", s).strip("_")
-    if not s:
-        s = "col"
-    return s
+    s = _SANI_UNDERSCORES.sub("_", _SANI_NONALNUM.sub("_", s)).strip("_")
+    return s or "col"
 
 
-def load_ddf_terminology(
+def _insert_terminology_rows(
+    cur: sqlite3.Cursor,
+    table: str,
+    columns: list[str],
+    sub: pd.DataFrame,
+    dataset_date: str,
+):
+    """Bulk insert worksheet rows; ``columns`` ends with dataset_date, which is the
+    same for every row. Rows are streamed into executemany from itertuples, so
+    no per-row Series or full list of parameter tuples is built.
+
+    dataset_date is written as a SQL literal instead of a per-row bind; it is
+    only ever a YYYY-MM-DD match of _DATASET_DATE_RE, checked again here.
+    """
+    if not _DATASET_DATE_RE.fullmatch(dataset_date):
+        raise ValueError(f"Invalid dataset date: {dataset_date!r}")
+    values = ["?"] * (len(columns) - 1) + [f"'{dataset_date}'"]
+    stmt = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({','.join(values)})"
+    if len(sub.columns):
+        cur.executemany(stmt, sub.itertuples(index=False, name=None))
+    else:
+        # Every worksheet column was dropped; itertuples yields nothing without
+        # columns, so bind one empty tuple per row to keep the row count
+        cur.executemany(stmt, [()] * len(sub))
+
+
+def _read_terminology_sheet(file_path: str, sheet_name: str) -> pd.DataFrame:
+    """Parse a terminology worksheet as strings, skipping worksheet columns that
+    sanitize to ``dataset_date`` (the loaders inject their own) at parse time."""
+    with pd.ExcelFile(file_path, engine=_EXCEL_ENGINE) as xl:
+        header = xl.parse(sheet_name, nrows=0, dtype=str).columns
+        keep = [
+            i
+            for i, c in enumerate(header)
+            if _sanitize_column(str(c)) != "dataset_date"
+        ]
+        usecols = keep if keep and len(keep) < len(header) else None
+        return xl.parse(sheet_name, dtype=str, usecols=usecols)
+
+
+# Per-kind loader settings: table, audit label, first suffix for duplicate
+# sanitized headers, and (index name, column) pairs built after each load
+_TERMINOLOGY_KINDS = {
+    "ddf": {
+        "table": "ddf_terminology",
+        "label": "DDF",
+        "dup_suffix_start": 2,
+        "indexes": (
+            ("idx_ddf_code", "code"),
+            ("idx_ddf_submission", "cdisc_submission_value"),
+            ("idx_ddf_codelist_name", "codelist_name"),
+        ),
+    },
+    "protocol": {
+        "table": "protocol_terminology",
+        "label": "Protocol",
+        "dup_suffix_start": 1,
+        "indexes": (
+            ("idx_protocol_code", "code"),
+            ("idx_protocol_codelist_name", "codelist_name"),
+        ),
+    },
+}
+
+
+def _terminology_cached_load(
+    table: str, sheet_name: str, file_hash: Optional[str]
+) -> Optional[dict]:
+    """Result of the last successful load when it used the same file and sheet
+    and the table still has the columns it recorded; None if a reload is needed."""
+    if not file_hash:
+        return None
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                f"SELECT file_hash, sheet_name, columns_json, row_count FROM {table}_audit "
+                "WHERE error IS NULL ORDER BY id DESC LIMIT 1"
+            )
+        except sqlite3.OperationalError:
+            return None  # audit table not created yet
+        last = cur.fetchone()
+        if not last or last[0] != file_hash or last[1] != sheet_name:
+            return None
+        columns = json.loads(last[2] or "[]")
+        cur.execute(f"PRAGMA table_info({table})")
+        if [r[1] for r in cur.fetchall() if r[1] != "id"] != columns:
+            return None
+    return {"columns": columns, "row_count": last[3]}
+
+
+def _load_terminology(
+    kind: str,
     file_path: str,
-    sheet_name: str = "DDF Terminology 2025-09-26",
-    source: str = "admin",
-    original_filename: Optional[str] = None,
-    file_hash: Optional[str] = None,
+    sheet_name: str,
+    source: str,
+    original_filename: Optional[str],
+    file_hash: Optional[str],
+    force: bool = False,
 ) -> dict:
-    """Load DDF terminology Excel sheet into SQLite table `ddf_terminology`.
-    Recreates table each time (drop + create) for schema drift tolerance.
-    Records an audit entry in ddf_terminology_audit.
-    Returns dict with columns and row count.
-    """
+    spec = _TERMINOLOGY_KINDS[kind]
+    table = spec["table"]
+    record_audit = _record_ddf_audit if kind == "ddf" else _record_protocol_audit
     # Extract dataset date ONLY from sheet_name (must contain YYYY-MM-DD).
-    _date_pattern = re.compile(r"(20\d{2}-\d{2}-\d{2})")
-    m = _date_pattern.search(sheet_name or "")
+    m = _DATASET_DATE_RE.search(sheet_name or "")
     if not m:
         raise HTTPException(
             400,
-            "Sheet name must contain dataset date YYYY-MM-DD (e.g. 'DDF Terminology 2025-09-26')",
+            f"Sheet name must contain dataset date YYYY-MM-DD (e.g. '{spec['label']} Terminology 2025-09-26')",
         )
     dataset_date = m.group(1)
-    if not os.path.exists(file_path):
-        # audit error record
-        _record_ddf_audit(
+
+    def audit_error(error: str):
+        record_audit(
             file_path=file_path,
             sheet_name=sheet_name,
             row_count=0,
@@ -4073,94 +4654,72 @@ def load_ddf_terminology(
             columns_json="[]",
             source=source,
             file_hash=file_hash,
-            error=f"File not found: {file_path}",
+            error=error,
             dataset_date=dataset_date,
         )
+
+    if not os.path.exists(file_path):
+        audit_error(f"File not found: {file_path}")
         raise HTTPException(400, f"File not found: {file_path}")
-    try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, dtype=str)
-    except Exception as e:
-        _record_ddf_audit(
-            file_path=file_path,
-            sheet_name=sheet_name,
-            row_count=0,
-            column_count=0,
-            columns_json="[]",
-            source=source,
-            file_hash=file_hash,
-            error=f"Read error: {e}",
-            dataset_date=dataset_date,
-        )
-        raise HTTPException(400, f"Failed reading Excel: {e}")
-    if df.empty:
-        _record_ddf_audit(
-            file_path=file_path,
-            sheet_name=sheet_name,
-            row_count=0,
-            column_count=0,
-            columns_json="[]",
-            source=source,
-            file_hash=file_hash,
-            error="Worksheet empty",
-            dataset_date=dataset_date,
+    cached = None if force else _terminology_cached_load(table, sheet_name, file_hash)
+    if cached is not None:
+        # Same workbook and sheet as the table's current contents: skip the reload
+        logger.info(
+            "%s terminology unchanged (sha256 %s); reload skipped",
+            spec["label"],
+            file_hash,
         )
-        raise HTTPException(400, "Worksheet is empty")
-    # Build sanitized headers, discarding any worksheet column that normalizes to 'dataset_date'.
-    raw_cols = list(df.columns)
-    pairs = []  # (raw, sanitized)
-    seen = set()
-    for c in raw_cols:
-        sc = _sanitize_column(str(c))
-        if sc == "dataset_date":
-            continue  # drop original dataset_date worksheet column; we inject a single synthetic one sourced from sheet name
-        base = sc
-        i = 2
-        while sc in seen:
-            sc = f"{base}_{i}"
-            i += 1
-        seen.add(sc)
-        pairs.append((c, sc))
-    sanitized = [sc for _, sc in pairs]
-    sanitized.append("dataset_date")  # single authoritative dataset date column
-    cols_sql = ", ".join(f"{c} TEXT" for c in sanitized)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("DROP TABLE IF EXISTS ddf_terminology")
-    cur.execute(
-        f"CREATE TABLE ddf_terminology (id INTEGER PRIMARY KEY AUTOINCREMENT, {cols_sql})"
-    )
-    df = df.fillna("")
-    kept_raw_cols = [raw for raw, sc in pairs]
-    base_records = [
-        tuple(str(row[c]) for c in kept_raw_cols) for _, row in df.iterrows()
-    ]
-    # Append dataset_date value per row (same for all rows)
-    records = [r + (dataset_date,) for r in base_records]
-    placeholders = ",".join(["?"] * (len(kept_raw_cols) + 1))
-    cur.executemany(
-        f"INSERT INTO ddf_terminology ({','.join(sanitized)}) VALUES ({placeholders})",
-        records,
-    )
-    # Indexes for faster search/filter
-    try:
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_ddf_code ON ddf_terminology(code)")
-        if "cdisc_submission_value" in sanitized:
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_ddf_submission ON ddf_terminology(cdisc_submission_value)"
-            )
-        if "codelist_name" in sanitized:
+        sanitized, row_count = cached["columns"], cached["row_count"]
+    else:
+        try:
+            df = _read_terminology_sheet(file_path, sheet_name)
+        except Exception as e:
+            audit_error(f"Read error: {e}")
+            raise HTTPException(400, f"Failed reading Excel: {e}")
+        if df.empty:
+            audit_error("Worksheet empty")
+            raise HTTPException(400, "Worksheet is empty")
+        # Build sanitized headers, discarding any worksheet column that normalizes to 'dataset_date'.
+        pairs = []  # (raw, sanitized)
+        seen = set()
+        for c in df.columns:
+            sc = _sanitize_column(str(c))
+            if sc == "dataset_date":
+                continue  # drop original dataset_date worksheet column; we inject a single synthetic one sourced from sheet name
+            base = sc
+            i = spec["dup_suffix_start"]
+            while sc in seen:
+                sc = f"{base}_{i}"
+                i += 1
+            seen.add(sc)
+            pairs.append((c, sc))
+        sanitized = [sc for _, sc in pairs]
+        sanitized.append("dataset_date")  # single authoritative dataset date column
+        cols_sql = ", ".join(f"{c} TEXT" for c in sanitized)
+        with _bulk_load_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(f"DROP TABLE IF EXISTS {table}")
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_ddf_codelist_name ON ddf_terminology(codelist_name)"
+                f"CREATE TABLE {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, {cols_sql})"
             )
-    except Exception as ie:  # pragma: no cover
-        logger.warning("Failed creating DDF indexes: %s", ie)
-    conn.commit()
-    conn.close()
+            sub = df[[raw for raw, _ in pairs]].fillna("").astype(str)
+            _insert_terminology_rows(cur, table, sanitized, sub, dataset_date)
+            # Indexes for faster search/filter
+            try:
+                for index_name, column in spec["indexes"]:
+                    if column in sanitized:
+                        cur.execute(
+                            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({column})"
+                        )
+            except Exception as ie:  # pragma: no cover
+                logger.warning("Failed creating %s indexes: %s", spec["label"], ie)
+            _build_terminology_fts(cur, table, sanitized)
+        row_count = len(sub)
     # Audit success
-    _record_ddf_audit(
+    record_audit(
         file_path=file_path,
         sheet_name=sheet_name,
-        row_count=len(records),
+        row_count=row_count,
         column_count=len(sanitized),
         columns_json=json.dumps(sanitized),
         source=source,
@@ -4169,12 +4728,33 @@ def load_ddf_terminology(
         original_filename=original_filename or os.path.basename(file_path),
         dataset_date=dataset_date,
     )
-    return {"columns": sanitized, "row_count": len(records)}
+    return {"columns": sanitized, "row_count": row_count}
+
+
+def load_ddf_terminology(
+    file_path: str,
+    sheet_name: str = "DDF Terminology 2025-09-26",
+    source: str = "admin",
+    original_filename: Optional[str] = None,
+    file_hash: Optional[str] = None,
+    force: bool = False,
+) -> dict:
+    """Load DDF terminology Excel sheet into SQLite table `ddf_terminology`.
+    Recreates table each time (drop + create) for schema drift tolerance, unless
+    file_hash and sheet_name match the last successful load (``force`` reloads anyway).
+    Records an audit entry in ddf_terminology_audit.
+    Returns dict with columns and row count.
+    """
+    return _load_terminology(
+        "ddf", file_path, sheet_name, source, original_filename, file_hash, force
+    )
 
 
 @app.post("/admin/load_ddf_terminology")
 def admin_load_ddf(
-    file_path: Optional[str] = None, sheet_name: str = "DDF Terminology 2025-09-26"
+    file_path: Optional[str] = None,
+    sheet_name: str = "DDF Terminology 2025-09-26",
+    force: bool = False,
 ):
     """Admin endpoint to (re)load DDF terminology Excel sheet into SQLite."""
     # Determine repo root (src/soa_builder/web/app.py -> ascend 3 levels to /src, then one more to project root)
@@ -4206,10 +4786,7 @@ def admin_load_ddf(
             )
     # compute file hash for audit
     try:
-        import hashlib
-
-        with open(fp, "rb") as fh:
-            file_hash = hashlib.sha256(fh.read()).hexdigest()
+        file_hash = _sha256_file(fp)
     except Exception:
         file_hash = None
     result = load_ddf_terminology(
@@ -4218,13 +4795,14 @@ def admin_load_ddf(
         source="admin",
         original_filename=os.path.basename(fp),
         file_hash=file_hash,
+        force=force,
     )
     return JSONResponse(
         {"ok": True, **result, "file_path": fp, "sheet_name": sheet_name}
     )
 
 
-@app.get("/ddf/terminology")
+@app.get("/ddf/terminology", response_class=ORJSONResponse)
 def get_ddf_terminology(
     search: Optional[str] = None,
     code: Optional[str] = None,
@@ -4242,69 +4820,38 @@ def get_ddf_terminology(
     """
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
-    conn = _connect()
-    cur = conn.cursor()
-    # Ensure table exists
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='ddf_terminology'"
-    )
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(
-            404,
-            "ddf_terminology table not found (load via POST /admin/load_ddf_terminology)",
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        # Ensure table exists
+        state = _terminology_state(cur, "ddf_terminology")
+        if state is None:
+            raise HTTPException(
+                404,
+                "ddf_terminology table not found (load via POST /admin/load_ddf_terminology)",
+            )
+        cols, searchable, has_fts, total_count = state
+        params = []
+        where = []
+        if code:
+            where.append("code = ?")
+            params.append(code)
+        if codelist_name:
+            where.append("codelist_name = ?")
+            params.append(codelist_name)
+        if codelist_code:
+            where.append("codelist_code = ?")
+            params.append(codelist_code)
+        if (not code) and search:
+            clause, search_params = _terminology_search_clause(
+                "ddf_terminology", searchable, has_fts, search
+            )
+            where.append(clause)
+            params.extend(search_params)
+        where_sql = " WHERE " + " AND ".join(where) if where else ""
+        select_cols = ["id", *cols]
+        rows, matched_count = _terminology_page(
+            cur, "ddf_terminology", select_cols, where_sql, params, limit, offset
         )
-    # Column discovery
-    cur.execute("PRAGMA table_info(ddf_terminology)")
-    cols = [r[1] for r in cur.fetchall() if r[1] != "id"]
-    searchable = [
-        c
-        for c in cols
-        if c
-        in [
-            "code",
-            "cdisc_submission_value",
-            "cdisc_definition",
-            "cdisc_synonym_s",
-            "nci_preferred_term",
-            "codelist_name",
-            "codelist_code",
-        ]
-    ]
-    cur.execute("SELECT COUNT(*) FROM ddf_terminology")
-    total_count = cur.fetchone()[0]
-    params = []
-    where = []
-    if code:
-        where.append("code = ?")
-        params.append(code)
-    if codelist_name:
-        where.append("codelist_name = ?")
-        params.append(codelist_name)
-    if codelist_code:
-        where.append("codelist_code = ?")
-        params.append(codelist_code)
-    if (not code) and search:
-        pattern = f"%{search.lower()}%"
-        like_clauses = [f"LOWER({c}) LIKE ?" for c in searchable]
-        params.extend([pattern] * len(like_clauses))
-        where.append("(" + " OR ".join(like_clauses) + ")")
-    where_sql = " WHERE " + " AND ".join(where) if where else ""
-    count_sql = f"SELECT COUNT(*) FROM ddf_terminology{where_sql}"
-    cur.execute(count_sql, params)
-    matched_count = cur.fetchone()[0]
-    select_cols = ["id"] + cols
-    select_sql = f"SELECT {', '.join(select_cols)} FROM ddf_terminology{where_sql} ORDER BY code LIMIT ? OFFSET ?"
-    cur.execute(select_sql, params + [limit, offset])
-    rows_raw = cur.fetchall()
-    # Build dict rows
-    rows = []
-    for r in rows_raw:
-        d = {}
-        for idx, col in enumerate(select_cols):
-            d[col] = r[idx]
-        rows.append(d)
-    conn.close()
     return {
         "total_count": total_count,
         "matched_count": matched_count,
@@ -4356,54 +4903,89 @@ def ui_ddf_terminology(
     )
 
 
+def _load_uploaded_terminology(
+    kind: str, tmp_path: str, sheet_name: str, filename: str, file_hash: str
+):
+    """Background task: load a spooled upload, then remove the temp file. The loader
+    audits its own failures; anything else is audited here."""
+    try:
+        _load_terminology(kind, tmp_path, sheet_name, "upload", filename, file_hash)
+    except HTTPException as he:
+        logger.warning(
+            "%s terminology upload failed: %s",
+            _TERMINOLOGY_KINDS[kind]["label"],
+            he.detail,
+        )
+    except Exception as e:
+        logger.exception(
+            "%s terminology upload failed", _TERMINOLOGY_KINDS[kind]["label"]
+        )
+        record_audit = _record_ddf_audit if kind == "ddf" else _record_protocol_audit
+        m = _DATASET_DATE_RE.search(sheet_name)
+        record_audit(
+            file_path=tmp_path,
+            sheet_name=sheet_name,
+            row_count=0,
+            column_count=0,
+            columns_json="[]",
+            source="upload",
+            file_hash=file_hash,
+            error=f"Load error: {e}",
+            original_filename=filename,
+            dataset_date=m.group(1) if m else None,
+        )
+    finally:
+        os.unlink(tmp_path)
+
+
+def _queue_terminology_upload(
+    kind: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile,
+    suffix: str,
+    filename: str,
+    sheet_name: str,
+) -> RedirectResponse:
+    """Spool an uploaded workbook and load it after the response is sent, so the
+    redirect does not wait on the Excel parse and bulk insert."""
+    page = f"/ui/{kind}/terminology"
+    if not _DATASET_DATE_RE.search(sheet_name or ""):
+        # Same check the loader makes; reported now since it cannot reach the audit log
+        error = "Sheet name must contain dataset date YYYY-MM-DD"
+        return RedirectResponse(
+            url=f"{page}?error={urllib.parse.quote_plus(error)}", status_code=303
+        )
+    try:
+        tmp_path, file_hash = _spool_upload(file.file, suffix)
+    except Exception as e:
+        return RedirectResponse(
+            url=f"{page}?error={urllib.parse.quote_plus(str(e))}", status_code=303
+        )
+    background_tasks.add_task(
+        _load_uploaded_terminology, kind, tmp_path, sheet_name, filename, file_hash
+    )
+    return RedirectResponse(url=f"{page}?uploaded=1", status_code=303)
+
+
 @app.post("/ui/ddf/terminology/upload", response_class=HTMLResponse)
 def ui_ddf_upload(
     request: Request,
+    background_tasks: BackgroundTasks,
     sheet_name: str = Form("DDF Terminology 2025-09-26"),
     file: UploadFile = File(...),
 ):
-    """Upload an XLS/XLSX file and reload ddf_terminology table. Redirects back with status message."""
+    """Upload an XLS/XLSX file and queue a reload of ddf_terminology. Redirects back
+    at once; the load result appears in the audit log."""
     # Basic validation
     filename = file.filename or "uploaded.xls"
-    if not (filename.lower().endswith(".xls") or filename.lower().endswith(".xlsx")):
-        return HTMLResponse(
-            "<script>window.location='/ui/ddf/terminology?error=Unsupported+file+type';</script>",
-            status_code=400,
-        )
-    try:
-        import tempfile
-
-        suffix = ".xls" if filename.lower().endswith(".xls") else ".xlsx"
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-        contents = file.file.read()
-        tmp.write(contents)
-        tmp.flush()
-        tmp.close()
-        # hash
-        import hashlib
-
-        file_hash = hashlib.sha256(contents).hexdigest()
-        load_ddf_terminology(
-            tmp.name,
-            sheet_name=sheet_name,
-            source="upload",
-            original_filename=filename,
-            file_hash=file_hash,
-        )
-        return HTMLResponse(
-            "<script>window.location='/ui/ddf/terminology?uploaded=1';</script>"
-        )
-    except HTTPException as he:
-        return HTMLResponse(
-            f"<script>window.location='/ui/ddf/terminology?error={he.detail}';</script>",
-            status_code=400,
-        )
-    except Exception as e:
-        esc = str(e).replace("'", "").replace('"', "")
-        return HTMLResponse(
-            f"<script>window.location='/ui/ddf/terminology?error={esc}';</script>",
-            status_code=500,
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix not in _ALLOWED_UPLOAD_EXT:
+        return RedirectResponse(
+            url="/ui/ddf/terminology?error=Unsupported+file+type", status_code=303
         )
+    return _queue_terminology_upload(
+        "ddf", background_tasks, file, suffix, filename, sheet_name
+    )
 
 
 def _record_ddf_audit(
@@ -4420,190 +5002,52 @@ def _record_ddf_audit(
 ):
     """Insert audit row (create table if missing)."""
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            """CREATE TABLE IF NOT EXISTS ddf_terminology_audit (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                loaded_at TEXT NOT NULL,
-                file_path TEXT,
-                original_filename TEXT,
-                sheet_name TEXT,
-                row_count INTEGER,
-                column_count INTEGER,
-                columns_json TEXT,
-                source TEXT,
-                file_hash TEXT,
-                error TEXT,
-                dataset_date TEXT
-            )"""
-        )
-        # Migration: ensure dataset_date column exists if table was created earlier without it.
-        cur.execute("PRAGMA table_info(ddf_terminology_audit)")
-        audit_cols = {r[1] for r in cur.fetchall()}
-        if "dataset_date" not in audit_cols:
-            try:
-                cur.execute(
-                    "ALTER TABLE ddf_terminology_audit ADD COLUMN dataset_date TEXT"
-                )
-            except Exception:
-                pass
-        cur.execute(
-            "INSERT INTO ddf_terminology_audit (loaded_at,file_path,original_filename,sheet_name,row_count,column_count,columns_json,source,file_hash,error,dataset_date) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
-            (
-                datetime.now(timezone.utc).isoformat(),
-                file_path,
-                original_filename,
-                sheet_name,
-                row_count,
-                column_count,
-                columns_json,
-                source,
-                file_hash,
-                error,
-                dataset_date,
-            ),
-        )
-        # Index for future date filtering
-        try:
+        with pooled_conn() as conn:
+            cur = conn.cursor()
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_ddf_audit_dataset_date ON ddf_terminology_audit(dataset_date)"
+                "INSERT INTO ddf_terminology_audit (loaded_at,file_path,original_filename,sheet_name,row_count,column_count,columns_json,source,file_hash,error,dataset_date) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    datetime.now(timezone.utc).isoformat(),
+                    file_path,
+                    original_filename,
+                    sheet_name,
+                    row_count,
+                    column_count,
+                    columns_json,
+                    source,
+                    file_hash,
+                    error,
+                    dataset_date,
+                ),
             )
-        except Exception:
-            pass
-        conn.commit()
-        conn.close()
+            conn.commit()
     except Exception as e:  # pragma: no cover
         logger.warning("Failed recording DDF audit: %s", e)
 
 
-def _get_ddf_sources() -> List[str]:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='ddf_terminology_audit'"
-    )
-    if not cur.fetchone():
-        conn.close()
-        return []
-    cur.execute(
-        "SELECT DISTINCT source FROM ddf_terminology_audit WHERE source IS NOT NULL ORDER BY source"
-    )
-    sources = [r[0] for r in cur.fetchall()]
-    conn.close()
-    return sources
-
-
-@app.get("/ddf/terminology/audit")
+@app.get("/ddf/terminology/audit", response_class=ORJSONResponse)
 def get_ddf_audit(
-    source: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
+    source: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: int = _AUDIT_PAGE_DEFAULT,
+    before_id: Optional[int] = None,
 ):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='ddf_terminology_audit'"
-    )
-    if not cur.fetchone():
-        conn.close()
-        return []
-    where_clauses = []
-    params: List[Any] = []
-
-    # Validate date inputs (YYYY-MM-DD)
-    def _valid_date(d: str) -> bool:
-        try:
-            datetime.strptime(d, "%Y-%m-%d")
-            return True
-        except Exception:
-            return False
-
-    if source:
-        where_clauses.append("source = ?")
-        params.append(source)
-    if start and _valid_date(start):
-        where_clauses.append("substr(loaded_at,1,10) >= ?")
-        params.append(start)
-    if end and _valid_date(end):
-        where_clauses.append("substr(loaded_at,1,10) <= ?")
-        params.append(end)
-    where_sql = (" WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
-    cur.execute(
-        f"SELECT id,loaded_at,original_filename,file_path,sheet_name,row_count,column_count,source,file_hash,error,dataset_date FROM ddf_terminology_audit{where_sql} ORDER BY id DESC",
-        params,
-    )
-    rows = []
-    for r in cur.fetchall():
-        rows.append(
-            {
-                "id": r[0],
-                "loaded_at": r[1],
-                "original_filename": r[2],
-                "file_path": r[3],
-                "sheet_name": r[4],
-                "row_count": r[5],
-                "column_count": r[6],
-                "source": r[7],
-                "file_hash": r[8],
-                "error": r[9],
-                "dataset_date": r[10],
-            }
-        )
-    conn.close()
-    return {"rows": rows}
+    return _audit_page("ddf_terminology_audit", source, start, end, limit, before_id)
 
 
 @app.get("/ddf/terminology/audit/export.csv")
 def export_ddf_audit_csv(
     source: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
 ):
-    rows = get_ddf_audit(source=source, start=start, end=end)
-    import csv
-    import io
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(
-        [
-            "id",
-            "loaded_at",
-            "source",
-            "original_filename",
-            "file_hash",
-            "row_count",
-            "column_count",
-            "sheet_name",
-            "error",
-        ]
-    )
-    for r in rows:
-        writer.writerow(
-            [
-                r["id"],
-                r["loaded_at"],
-                r["source"],
-                r["original_filename"],
-                r["file_hash"],
-                r["row_count"],
-                r["column_count"],
-                r["sheet_name"],
-                r["error"] or "",
-            ]
-        )
-    csv_data = buf.getvalue()
-    return Response(
-        content=csv_data,
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=ddf_terminology_audit.csv"
-        },
-    )
+    return _stream_audit_csv("ddf_terminology_audit", source, start, end)
 
 
 @app.get("/ddf/terminology/audit/export.json")
 def export_ddf_audit_json(
     source: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
 ):
-    return get_ddf_audit(source=source, start=start, end=end)
+    return _stream_audit_json("ddf_terminology_audit", source, start, end)
 
 
 @app.get("/ui/ddf/terminology/audit", response_class=HTMLResponse)
@@ -4612,20 +5056,12 @@ def ui_ddf_audit(
     source: Optional[str] = None,
     start: Optional[str] = None,
     end: Optional[str] = None,
+    before_id: Optional[int] = None,
 ):
-    rows = get_ddf_audit(source=source, start=start, end=end)
-    sources = _get_ddf_sources()
     return templates.TemplateResponse(
         request,
         "ddf_terminology_audit.html",
-        {
-            "rows": rows,
-            "count": len(rows),
-            "sources": sources,
-            "current_source": source or "",
-            "start": start or "",
-            "end": end or "",
-        },
+        _audit_ui_context("ddf_terminology_audit", source, start, end, before_id),
     )
 
 
@@ -4636,125 +5072,21 @@ def load_protocol_terminology(
     source: str = "admin",
     original_filename: Optional[str] = None,
     file_hash: Optional[str] = None,
+    force: bool = False,
 ) -> dict:
     """Load Protocol terminology Excel sheet into SQLite table `protocol_terminology`.
     Mirrors load_ddf_terminology: drop/create table, sanitize headers, create indexes, record audit.
     """
-    # Extract dataset date ONLY from sheet_name (must contain YYYY-MM-DD).
-    _date_pattern = re.compile(r"(20\d{2}-\d{2}-\d{2})")
-    m = _date_pattern.search(sheet_name or "")
-    if not m:
-        raise HTTPException(
-            400,
-            "Sheet name must contain dataset date YYYY-MM-DD (e.g. 'Protocol Terminology 2025-09-26')",
-        )
-    dataset_date = m.group(1)
-    if not os.path.exists(file_path):
-        _record_protocol_audit(
-            file_path=file_path,
-            sheet_name=sheet_name,
-            row_count=0,
-            column_count=0,
-            columns_json="[]",
-            source=source,
-            file_hash=file_hash,
-            error=f"File not found: {file_path}",
-            dataset_date=dataset_date,
-        )
-        raise HTTPException(400, f"File not found: {file_path}")
-    try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, dtype=str)
-    except Exception as e:
-        _record_protocol_audit(
-            file_path=file_path,
-            sheet_name=sheet_name,
-            row_count=0,
-            column_count=0,
-            columns_json="[]",
-            source=source,
-            file_hash=file_hash,
-            error=f"Read error: {e}",
-            dataset_date=dataset_date,
-        )
-        raise HTTPException(400, f"Failed reading Excel: {e}")
-    if df.empty:
-        _record_protocol_audit(
-            file_path=file_path,
-            sheet_name=sheet_name,
-            row_count=0,
-            column_count=0,
-            columns_json="[]",
-            source=source,
-            file_hash=file_hash,
-            error="Worksheet empty",
-            dataset_date=dataset_date,
-        )
-        raise HTTPException(400, "Worksheet is empty")
-    raw_cols = list(df.columns)
-    pairs = []  # (raw, sanitized)
-    seen = set()
-    for c in raw_cols:
-        sc = re.sub(r"[^a-zA-Z0-9_]+", "_", c.strip().lower()).strip("_") or "col"
-        if sc == "dataset_date":
-            continue  # drop any existing dataset_date worksheet column
-        base = sc
-        i = 1
-        while sc in seen:
-            sc = f"{base}_{i}"
-            i += 1
-        seen.add(sc)
-        pairs.append((c, sc))
-    sanitized = [sc for _, sc in pairs]
-    sanitized.append("dataset_date")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("DROP TABLE IF EXISTS protocol_terminology")
-    cur.execute(
-        "CREATE TABLE protocol_terminology (id INTEGER PRIMARY KEY AUTOINCREMENT, "
-        + ",".join(f"{c} TEXT" for c in sanitized)
-        + ")"
-    )
-    kept_raw_cols = [raw for raw, sc in pairs]
-    base_records = [
-        tuple(str(row[c]) for c in kept_raw_cols) for _, row in df.iterrows()
-    ]
-    records = [r + (dataset_date,) for r in base_records]
-    placeholders = ",".join(["?"] * (len(kept_raw_cols) + 1))
-    cur.executemany(
-        f"INSERT INTO protocol_terminology ({','.join(sanitized)}) VALUES ({placeholders})",
-        records,
-    )
-    try:
-        if "code" in sanitized:
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_protocol_code ON protocol_terminology(code)"
-            )
-        if "codelist_name" in sanitized:
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_protocol_codelist_name ON protocol_terminology(codelist_name)"
-            )
-    except Exception as ie:  # pragma: no cover
-        logger.warning("Failed creating Protocol indexes: %s", ie)
-    conn.commit()
-    conn.close()
-    _record_protocol_audit(
-        file_path=file_path,
-        sheet_name=sheet_name,
-        row_count=len(records),
-        column_count=len(sanitized),
-        columns_json=json.dumps(sanitized),
-        source=source,
-        file_hash=file_hash,
-        error=None,
-        original_filename=original_filename or os.path.basename(file_path),
-        dataset_date=dataset_date,
+    return _load_terminology(
+        "protocol", file_path, sheet_name, source, original_filename, file_hash, force
     )
-    return {"columns": sanitized, "row_count": len(records)}
 
 
 @app.post("/admin/load_protocol_terminology")
 def admin_load_protocol(
-    file_path: Optional[str] = None, sheet_name: str = "Protocol Terminology 2025-09-26"
+    file_path: Optional[str] = None,
+    sheet_name: str = "Protocol Terminology 2025-09-26",
+    force: bool = False,
 ):
     project_root = os.path.dirname(
         os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -4775,10 +5107,7 @@ def admin_load_protocol(
                 400, f"Protocol terminology file not found in candidates: {candidates}"
             )
     try:
-        import hashlib
-
-        with open(fp, "rb") as fh:
-            file_hash = hashlib.sha256(fh.read()).hexdigest()
+        file_hash = _sha256_file(fp)
     except Exception:
         file_hash = None
     result = load_protocol_terminology(
@@ -4787,13 +5116,14 @@ def admin_load_protocol(
         source="admin",
         original_filename=os.path.basename(fp),
         file_hash=file_hash,
+        force=force,
     )
     return JSONResponse(
         {"ok": True, **result, "file_path": fp, "sheet_name": sheet_name}
     )
 
 
-@app.get("/protocol/terminology")
+@app.get("/protocol/terminology", response_class=ORJSONResponse)
 def get_protocol_terminology(
     search: Optional[str] = None,
     code: Optional[str] = None,
@@ -4804,67 +5134,37 @@ def get_protocol_terminology(
 ):
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='protocol_terminology'"
-    )
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(
-            404,
-            "protocol_terminology table not found (load via POST /admin/load_protocol_terminology)",
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        state = _terminology_state(cur, "protocol_terminology")
+        if state is None:
+            raise HTTPException(
+                404,
+                "protocol_terminology table not found (load via POST /admin/load_protocol_terminology)",
+            )
+        cols, searchable, has_fts, total_count = state
+        params: List[Any] = []
+        where = []
+        if code:
+            where.append("code = ?")
+            params.append(code)
+        if codelist_name:
+            where.append("codelist_name = ?")
+            params.append(codelist_name)
+        if codelist_code:
+            where.append("codelist_code = ?")
+            params.append(codelist_code)
+        if (not code) and search:
+            clause, search_params = _terminology_search_clause(
+                "protocol_terminology", searchable, has_fts, search
+            )
+            where.append(clause)
+            params.extend(search_params)
+        where_sql = " WHERE " + " AND ".join(where) if where else ""
+        select_cols = ["id", *cols]
+        rows, matched_count = _terminology_page(
+            cur, "protocol_terminology", select_cols, where_sql, params, limit, offset
         )
-    cur.execute("PRAGMA table_info(protocol_terminology)")
-    cols = [r[1] for r in cur.fetchall() if r[1] != "id"]
-    searchable = [
-        c
-        for c in cols
-        if c
-        in [
-            "code",
-            "cdisc_submission_value",
-            "cdisc_definition",
-            "cdisc_synonym_s",
-            "nci_preferred_term",
-            "codelist_name",
-            "codelist_code",
-        ]
-    ]
-    cur.execute("SELECT COUNT(*) FROM protocol_terminology")
-    total_count = cur.fetchone()[0]
-    params: List[Any] = []
-    where = []
-    if code:
-        where.append("code = ?")
-        params.append(code)
-    if codelist_name:
-        where.append("codelist_name = ?")
-        params.append(codelist_name)
-    if codelist_code:
-        where.append("codelist_code = ?")
-        params.append(codelist_code)
-    if (not code) and search:
-        pattern = f"%{search.lower()}%"
-        like_clauses = [f"LOWER({c}) LIKE ?" for c in searchable]
-        params.extend([pattern] * len(like_clauses))
-        where.append("(" + " OR ".join(like_clauses) + ")")
-    where_sql = " WHERE " + " AND ".join(where) if where else ""
-    cur.execute(f"SELECT COUNT(*) FROM protocol_terminology{where_sql}", params)
-    matched_count = cur.fetchone()[0]
-    select_cols = ["id"] + cols
-    cur.execute(
-        f"SELECT {', '.join(select_cols)} FROM protocol_terminology{where_sql} ORDER BY code LIMIT ? OFFSET ?",
-        params + [limit, offset],
-    )
-    rows_raw = cur.fetchall()
-    rows = []
-    for r in rows_raw:
-        d = {}
-        for idx, col in enumerate(select_cols):
-            d[col] = r[idx]
-        rows.append(d)
-    conn.close()
     return {
         "total_count": total_count,
         "matched_count": matched_count,
@@ -4919,47 +5219,19 @@ def ui_protocol_terminology(
 @app.post("/ui/protocol/terminology/upload", response_class=HTMLResponse)
 def ui_protocol_upload(
     request: Request,
+    background_tasks: BackgroundTasks,
     sheet_name: str = Form("Protocol Terminology 2025-09-26"),
     file: UploadFile = File(...),
 ):
     filename = file.filename or "uploaded.xls"
-    if not (filename.lower().endswith(".xls") or filename.lower().endswith(".xlsx")):
-        return HTMLResponse(
-            "<script>window.location='/ui/protocol/terminology?error=Unsupported+file+type';</script>",
-            status_code=400,
-        )
-    try:
-        import hashlib
-        import tempfile
-
-        suffix = ".xls" if filename.lower().endswith(".xls") else ".xlsx"
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-        contents = file.file.read()
-        tmp.write(contents)
-        tmp.flush()
-        tmp.close()
-        file_hash = hashlib.sha256(contents).hexdigest()
-        load_protocol_terminology(
-            tmp.name,
-            sheet_name=sheet_name,
-            source="upload",
-            original_filename=filename,
-            file_hash=file_hash,
-        )
-        return HTMLResponse(
-            "<script>window.location='/ui/protocol/terminology?uploaded=1';</script>"
-        )
-    except HTTPException as he:
-        return HTMLResponse(
-            f"<script>window.location='/ui/protocol/terminology?error={he.detail}';</script>",
-            status_code=400,
-        )
-    except Exception as e:
-        esc = str(e).replace("'", "").replace('"', "")
-        return HTMLResponse(
-            f"<script>window.location='/ui/protocol/terminology?error={esc}';</script>",
-            status_code=500,
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix not in _ALLOWED_UPLOAD_EXT:
+        return RedirectResponse(
+            url="/ui/protocol/terminology?error=Unsupported+file+type", status_code=303
         )
+    return _queue_terminology_upload(
+        "protocol", background_tasks, file, suffix, filename, sheet_name
+    )
 
 
 def _record_protocol_audit(
@@ -4975,187 +5247,54 @@ def _record_protocol_audit(
     dataset_date: Optional[str] = None,
 ):
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            """CREATE TABLE IF NOT EXISTS protocol_terminology_audit (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            loaded_at TEXT NOT NULL,
-            file_path TEXT,
-            original_filename TEXT,
-            sheet_name TEXT,
-            row_count INTEGER,
-            column_count INTEGER,
-            columns_json TEXT,
-            source TEXT,
-            file_hash TEXT,
-            error TEXT,
-            dataset_date TEXT
-        )"""
-        )
-        cur.execute("PRAGMA table_info(protocol_terminology_audit)")
-        audit_cols = {r[1] for r in cur.fetchall()}
-        if "dataset_date" not in audit_cols:
-            try:
-                cur.execute(
-                    "ALTER TABLE protocol_terminology_audit ADD COLUMN dataset_date TEXT"
-                )
-            except Exception:
-                pass
-        cur.execute(
-            "INSERT INTO protocol_terminology_audit (loaded_at,file_path,original_filename,sheet_name,row_count,column_count,columns_json,source,file_hash,error,dataset_date) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
-            (
-                datetime.now(timezone.utc).isoformat(),
-                file_path,
-                original_filename,
-                sheet_name,
-                row_count,
-                column_count,
-                columns_json,
-                source,
-                file_hash,
-                error,
-                dataset_date,
-            ),
-        )
-        try:
+        with pooled_conn() as conn:
+            cur = conn.cursor()
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_protocol_audit_dataset_date ON protocol_terminology_audit(dataset_date)"
+                "INSERT INTO protocol_terminology_audit (loaded_at,file_path,original_filename,sheet_name,row_count,column_count,columns_json,source,file_hash,error,dataset_date) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    datetime.now(timezone.utc).isoformat(),
+                    file_path,
+                    original_filename,
+                    sheet_name,
+                    row_count,
+                    column_count,
+                    columns_json,
+                    source,
+                    file_hash,
+                    error,
+                    dataset_date,
+                ),
             )
-        except Exception:
-            pass
-        conn.commit()
-        conn.close()
+            conn.commit()
     except Exception as e:
         logger.warning("Failed recording Protocol audit: %s", e)
 
 
-def _get_protocol_sources() -> List[str]:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='protocol_terminology_audit'"
-    )
-    if not cur.fetchone():
-        conn.close()
-        return []
-    cur.execute(
-        "SELECT DISTINCT source FROM protocol_terminology_audit WHERE source IS NOT NULL ORDER BY source"
-    )
-    sources = [r[0] for r in cur.fetchall()]
-    conn.close()
-    return sources
-
-
-@app.get("/protocol/terminology/audit")
+@app.get("/protocol/terminology/audit", response_class=ORJSONResponse)
 def get_protocol_audit(
-    source: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
+    source: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: int = _AUDIT_PAGE_DEFAULT,
+    before_id: Optional[int] = None,
 ):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='protocol_terminology_audit'"
-    )
-    if not cur.fetchone():
-        conn.close()
-        return []
-    where_clauses = []
-    params: List[Any] = []
-
-    def _valid_date(d: str) -> bool:
-        try:
-            datetime.strptime(d, "%Y-%m-%d")
-            return True
-        except Exception:
-            return False
-
-    if source:
-        where_clauses.append("source = ?")
-        params.append(source)
-    if start and _valid_date(start):
-        where_clauses.append("substr(loaded_at,1,10) >= ?")
-        params.append(start)
-    if end and _valid_date(end):
-        where_clauses.append("substr(loaded_at,1,10) <= ?")
-        params.append(end)
-    where_sql = (" WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
-    cur.execute(
-        f"SELECT id,loaded_at,original_filename,file_path,sheet_name,row_count,column_count,source,file_hash,error,dataset_date FROM protocol_terminology_audit{where_sql} ORDER BY id DESC",
-        params,
+    return _audit_page(
+        "protocol_terminology_audit", source, start, end, limit, before_id
     )
-    rows = []
-    for r in cur.fetchall():
-        rows.append(
-            {
-                "id": r[0],
-                "loaded_at": r[1],
-                "original_filename": r[2],
-                "file_path": r[3],
-                "sheet_name": r[4],
-                "row_count": r[5],
-                "column_count": r[6],
-                "source": r[7],
-                "file_hash": r[8],
-                "error": r[9],
-                "dataset_date": r[10],
-            }
-        )
-    conn.close()
-    return {"rows": rows}
 
 
 @app.get("/protocol/terminology/audit/export.csv")
 def export_protocol_audit_csv(
     source: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
 ):
-    rows = get_protocol_audit(source=source, start=start, end=end)
-    import csv
-    import io
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(
-        [
-            "id",
-            "loaded_at",
-            "source",
-            "original_filename",
-            "file_hash",
-            "row_count",
-            "column_count",
-            "sheet_name",
-            "error",
-        ]
-    )
-    for r in rows:
-        writer.writerow(
-            [
-                r["id"],
-                r["loaded_at"],
-                r["source"],
-                r["original_filename"],
-                r["file_hash"],
-                r["row_count"],
-                r["column_count"],
-                r["sheet_name"],
-                r["error"] or "",
-            ]
-        )
-    csv_data = buf.getvalue()
-    return Response(
-        content=csv_data,
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=protocol_terminology_audit.csv"
-        },
-    )
+    return _stream_audit_csv("protocol_terminology_audit", source, start, end)
 
 
 @app.get("/protocol/terminology/audit/export.json")
 def export_protocol_audit_json(
     source: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
 ):
-    return get_protocol_audit(source=source, start=start, end=end)
+    return _stream_audit_json("protocol_terminology_audit", source, start, end)
 
 
 @app.get("/ui/protocol/terminology/audit", response_class=HTMLResponse)
@@ -5164,20 +5303,12 @@ def ui_protocol_audit(
     source: Optional[str] = None,
     start: Optional[str] = None,
     end: Optional[str] = None,
+    before_id: Optional[int] = None,
 ):
-    rows = get_protocol_audit(source=source, start=start, end=end)
-    sources = _get_protocol_sources()
     return templates.TemplateResponse(
         request,
         "protocol_terminology_audit.html",
-        {
-            "rows": rows,
-            "count": len(rows),
-            "sources": sources,
-            "current_source": source or "",
-            "start": start or "",
-            "end": end or "",
-        },
+        _audit_ui_context("protocol_terminology_audit", source, start, end, before_id),
     )
 
 
@@ -1,12 +1,99 @@
+import atexit
 import json
 import logging
+import queue
+import sqlite3
+import threading
 from datetime import datetime, timezone
+from itertools import groupby
 from typing import Any, Dict, List, Optional
 
-from .db import _connect
+from .db import pooled_conn
 
 logger = logging.getLogger("soa_builder.concepts")
 
+# Audit rows written outside a caller's transaction are queued and inserted by one
+# background writer, which drains whatever has accumulated (up to _AUDIT_BATCH_MAX)
+# into a single executemany transaction. Readers of audit tables call flush_audit().
+_AUDIT_BATCH_MAX = 100
+_audit_queue: "queue.Queue[tuple[str, tuple, str]]" = queue.Queue()
+_audit_writer: Optional[threading.Thread] = None
+_audit_writer_lock = threading.Lock()
+
+
+def _insert_audit_batch(batch: list[tuple[str, tuple, str]]):
+    try:
+        with pooled_conn() as conn:
+            # Consecutive rows for the same table share one executemany
+            for sql, rows in groupby(batch, key=lambda item: item[0]):
+                conn.executemany(sql, [params for _, params, _ in rows])
+            conn.commit()
+        return
+    except Exception as e:
+        logger.warning(
+            "Audit batch of %d failed, retrying row by row: %s", len(batch), e
+        )
+    for sql, params, kind in batch:
+        try:
+            with pooled_conn() as conn:
+                conn.execute(sql, params)
+                conn.commit()
+        except Exception as e:
+            logger.warning("Failed recording %s audit: %s", kind, e)
+
+
+def _audit_writer_loop():
+    while True:
+        batch = [_audit_queue.get()]
+        while len(batch) < _AUDIT_BATCH_MAX:
+            try:
+                batch.append(_audit_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _insert_audit_batch(batch)
+        finally:
+            for _ in batch:
+                _audit_queue.task_done()
+
+
+def _ensure_audit_writer():
+    global _audit_writer
+    if _audit_writer is not None and _audit_writer.is_alive():
+        return
+    with _audit_writer_lock:
+        if _audit_writer is None or not _audit_writer.is_alive():
+            _audit_writer = threading.Thread(
+                target=_audit_writer_loop, name="audit-writer", daemon=True
+            )
+            _audit_writer.start()
+
+
+def flush_audit():
+    """Block until every queued audit row has been written."""
+    _audit_queue.join()
+
+
+atexit.register(flush_audit)
+
+
+def _write_audit(
+    sql: str, params: tuple, kind: str, conn: Optional[sqlite3.Connection] = None
+):
+    """Record one audit row.
+
+    When ``conn`` is supplied the row joins the caller's transaction and the caller
+    commits; otherwise it is queued for the background writer.
+    """
+    if conn is None:
+        _ensure_audit_writer()
+        _audit_queue.put((sql, params, kind))
+        return
+    try:
+        conn.execute(sql, params)
+    except Exception as e:
+        logger.warning("Failed recording %s audit: %s", kind, e)
+
 
 def _record_arm_audit(
     soa_id: int,
@@ -14,25 +101,21 @@ def _record_arm_audit(
     arm_id: int | None,
     before: Optional[Dict[str, Any]] = None,
     after: Optional[Dict[str, Any]] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO arm_audit (soa_id, arm_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                arm_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed recording arm audit: %s", e)
+    _write_audit(
+        "INSERT INTO arm_audit (soa_id, arm_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            arm_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "arm",
+        conn,
+    )
 
 
 def _record_element_audit(
@@ -41,25 +124,21 @@ def _record_element_audit(
     element_id: int | None,
     before: Optional[Dict[str, Any]] = None,
     after: Optional[Dict[str, Any]] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO element_audit (soa_id, element_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                element_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed recording element audit: %s", e)
+    _write_audit(
+        "INSERT INTO element_audit (soa_id, element_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            element_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "element",
+        conn,
+    )
 
 
 def _record_reorder_audit(
@@ -67,24 +146,20 @@ def _record_reorder_audit(
     entity_type: str,
     old_order: List[int],
     new_order: List[int],
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO reorder_audit (soa_id, entity_type, old_order_json, new_order_json, performed_at) VALUES (?,?,?,?,?)",
-            (
-                soa_id,
-                entity_type,
-                json.dumps(old_order),
-                json.dumps(new_order),
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed recording reorder audit: %s", e)
+    _write_audit(
+        "INSERT INTO reorder_audit (soa_id, entity_type, old_order_json, new_order_json, performed_at) VALUES (?,?,?,?,?)",
+        (
+            soa_id,
+            entity_type,
+            json.dumps(old_order),
+            json.dumps(new_order),
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "reorder",
+        conn,
+    )
 
 
 def _record_visit_audit(
@@ -93,25 +168,21 @@ def _record_visit_audit(
     visit_id: Optional[int],
     before: Optional[Dict[str, Any]] = None,
     after: Optional[Dict[str, Any]] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO visit_audit (soa_id, visit_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                visit_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed recording visit audit: %s", e)
+    _write_audit(
+        "INSERT INTO visit_audit (soa_id, visit_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            visit_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "visit",
+        conn,
+    )
 
 
 def _record_activity_audit(
@@ -120,22 +191,18 @@ def _record_activity_audit(
     activity_id: Optional[int],
     before: Optional[Dict[str, Any]] = None,
     after: Optional[Dict[str, Any]] = None,
+    conn: Optional[sqlite3.Connection] = None,
 ):
-    try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO activity_audit (soa_id, activity_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
-            (
-                soa_id,
-                activity_id,
-                action,
-                json.dumps(before) if before else None,
-                json.dumps(after) if after else None,
-                datetime.now(timezone.utc).isoformat(),
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed recording activity audit: %s", e)
+    _write_audit(
+        "INSERT INTO activity_audit (soa_id, activity_id, action, before_json, after_json, performed_at) VALUES (?,?,?,?,?,?)",
+        (
+            soa_id,
+            activity_id,
+            action,
+            json.dumps(before) if before else None,
+            json.dumps(after) if after else None,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+        "activity",
+        conn,
+    )
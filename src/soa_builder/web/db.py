@@ -1,11 +1,156 @@
+import atexit
 import os
+import queue
 import sqlite3
+from contextlib import contextmanager
+from typing import Annotated
 
 from dotenv import load_dotenv
+from fastapi import Depends, HTTPException
 
 load_dotenv()
+
 DB_PATH = os.environ.get("SOA_BUILDER_DB", "soa_builder_web.db")
 
 
-def _connect():
-    return sqlite3.connect(DB_PATH)
+# SQL expression for the current UTC time as ISO-8601 in the same layout as the
+# datetime.now(timezone.utc).isoformat() values already stored. SQLite's %f stops at
+# milliseconds (SS.SSS) where isoformat() writes microseconds; both sort together
+# as text and parse with datetime.fromisoformat().
+_SQL_UTC_NOW = "strftime('%Y-%m-%dT%H:%M:%f+00:00','now')"
+
+
+# Per-connection settings applied to every connection, pooled or not. Under WAL,
+# synchronous=NORMAL only syncs at checkpoints yet stays corruption-safe.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+# journal_mode=WAL is persisted in the database file: _init_db sets it at startup and
+# pooled connections re-assert it in case the file was recreated.
+_POOL_PRAGMAS = ("PRAGMA journal_mode=WAL",) + _CONNECTION_PRAGMAS
+
+
+def _connect(check_same_thread: bool = True):
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+_POOL_CACHED_STATEMENTS = 512
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived, pre-configured SQLite connections.
+
+    Connections keep their page cache warm across requests. ``acquire`` never blocks:
+    when no idle connection is available a new one is opened, and ``release`` closes
+    connections beyond ``size`` instead of queueing them. With WAL, readers proceed
+    alongside the single SQLite writer, and busy_timeout queues competing writers.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(
+            maxsize=size
+        )
+
+    def _open(self) -> sqlite3.Connection:
+        # Requests may hand a connection between threadpool workers. Pooled connections
+        # outlive many requests, so a larger prepared-statement cache keeps the app's
+        # few hundred distinct SQL strings compiled.
+        conn = sqlite3.connect(
+            DB_PATH,
+            check_same_thread=False,
+            cached_statements=_POOL_CACHED_STATEMENTS,
+        )
+        for pragma in _POOL_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._open()
+
+    def release(self, conn: sqlite3.Connection):
+        # Discard uncommitted work exactly as closing a connection would
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def prewarm(self):
+        while not self._idle.full():
+            try:
+                self._idle.put_nowait(self._open())
+            except queue.Full:
+                break
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_POOL = ConnectionPool(size=min(32, (os.cpu_count() or 4) * 2))
+# Lifespan shutdown closes the pool too; this covers scripts and tests that never run it
+atexit.register(_POOL.close_all)
+
+
+@contextmanager
+def pooled_conn():
+    """Borrow a pooled connection; it is rolled back if left mid-transaction."""
+    conn = _POOL.acquire()
+    try:
+        yield conn
+    finally:
+        _POOL.release(conn)
+
+
+# SOAs are never deleted, so a positive existence check stays valid for the life of
+# the process. Misses are not cached because the id may be created later.
+_KNOWN_SOA_IDS: set = set()
+
+
+def _soa_exists(soa_id: int) -> bool:
+    if soa_id in _KNOWN_SOA_IDS:
+        return True
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM soa WHERE id=? LIMIT 1", (soa_id,))
+        ok = cur.fetchone() is not None
+    if ok:
+        _KNOWN_SOA_IDS.add(soa_id)
+    return ok
+
+
+def existing_soa(soa_id: int) -> int:
+    """FastAPI dependency resolving the ``soa_id`` path parameter; 404 if unknown."""
+    if not _soa_exists(soa_id):
+        raise HTTPException(404, "SOA not found")
+    return soa_id
+
+
+# Route parameter type for endpoints scoped to an existing SOA
+ExistingSoa = Annotated[int, Depends(existing_soa)]
+
+
+def get_conn():
+    """FastAPI dependency lending one pooled connection for the lifetime of a request.
+
+    Sync dependencies and endpoints may run on different threadpool workers, so pooled
+    connections are opened with ``check_same_thread=False``; a connection is only ever
+    used by one request at a time.
+    """
+    with pooled_conn() as conn:
+        yield conn
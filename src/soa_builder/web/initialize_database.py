@@ -1,9 +1,16 @@
-from .db import _connect
+from .db import _KNOWN_SOA_IDS, _POOL, _connect
 
 
 def _init_db():
+    # The database may have been recreated; drop pooled connections and SOA ids
+    # remembered from before
+    _POOL.close_all()
+    _KNOWN_SOA_IDS.clear()
     conn = _connect()
     cur = conn.cursor()
+    # Switch the file to WAL before anything else writes to it (the setting persists),
+    # so uploads and migrations run without blocking readers, whichever connects first
+    cur.execute("PRAGMA journal_mode=WAL")
     cur.execute(
         """CREATE TABLE IF NOT EXISTS soa (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, created_at TEXT)"""
     )
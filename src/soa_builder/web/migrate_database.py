@@ -601,6 +601,142 @@ def _migrate_activity_add_uid():
         logger.warning("activity_uid migration failed: %s", e)
 
 
+# Migration: enforce one row per (activity, concept)
+def _migrate_activity_concept_unique():
+    """Drop duplicate activity_concept rows (keeping the earliest) and add the
+    ux_activity_concept unique index so inserts can use INSERT OR IGNORE."""
+    try:
+        conn = _connect()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='ux_activity_concept'"
+        )
+        if not cur.fetchone():
+            cur.execute(
+                "DELETE FROM activity_concept WHERE id NOT IN (SELECT MIN(id) FROM activity_concept GROUP BY activity_id, concept_code)"
+            )
+            removed = cur.rowcount
+            cur.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_activity_concept ON activity_concept(activity_id, concept_code)"
+            )
+            conn.commit()
+            logger.info(
+                "Created ux_activity_concept index (removed %d duplicate rows)", removed
+            )
+        conn.close()
+    except Exception as e:  # pragma: no cover
+        logger.warning("activity_concept unique index migration failed: %s", e)
+
+
+# Migration: indexes for the per-SOA lookups on the matrix tables
+def _migrate_matrix_indexes():
+    """Create the lookup indexes for visit, activity and matrix_cells.
+
+    ux_matrix_cells_soa_visit_activity allows one cell per (soa, visit, activity);
+    duplicate rows are collapsed to the most recent first. Safe to run multiple times.
+    """
+    try:
+        conn = _connect()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='ux_matrix_cells_soa_visit_activity'"
+        )
+        if not cur.fetchone():
+            cur.execute(
+                "DELETE FROM matrix_cells WHERE id NOT IN (SELECT MAX(id) FROM matrix_cells GROUP BY soa_id, visit_id, activity_id)"
+            )
+            if cur.rowcount:
+                logger.info("Removed %d duplicate matrix_cells rows", cur.rowcount)
+            cur.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_matrix_cells_soa_visit_activity ON matrix_cells(soa_id, visit_id, activity_id)"
+            )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS ix_matrix_cells_soa_activity ON matrix_cells(soa_id, activity_id)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS ix_visit_soa_order ON visit(soa_id, order_index)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS ix_activity_soa_order ON activity(soa_id, order_index)"
+        )
+        conn.commit()
+        conn.close()
+    except Exception as e:  # pragma: no cover
+        logger.warning("Matrix index migration failed: %s", e)
+
+
+# Migration: order indexes for the remaining per-SOA ordered tables
+def _migrate_order_indexes():
+    """Create (soa_id, order_index) indexes on epoch, arm and element.
+
+    id is the rowid, which every index carries, so these cover the
+    ``SELECT id ... WHERE soa_id=? ORDER BY order_index`` reads used by listing and
+    reorder endpoints. Safe to run multiple times.
+    """
+    try:
+        conn = _connect()
+        cur = conn.cursor()
+        for table in ("epoch", "arm", "element"):
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_soa_order ON {table}(soa_id, order_index)"
+            )
+        conn.commit()
+        conn.close()
+    except Exception as e:  # pragma: no cover
+        logger.warning("Order index migration failed: %s", e)
+
+
+# Migration: terminology audit tables
+def _migrate_terminology_audit_tables():
+    """Create ddf_terminology_audit and protocol_terminology_audit with their
+    dataset_date column and index, so recording and listing audits needs no DDL.
+    Safe to run multiple times.
+    """
+    try:
+        conn = _connect()
+        cur = conn.cursor()
+        for prefix in ("ddf", "protocol"):
+            table = f"{prefix}_terminology_audit"
+            cur.execute(
+                f"""CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    loaded_at TEXT NOT NULL,
+                    file_path TEXT,
+                    original_filename TEXT,
+                    sheet_name TEXT,
+                    row_count INTEGER,
+                    column_count INTEGER,
+                    columns_json TEXT,
+                    source TEXT,
+                    file_hash TEXT,
+                    error TEXT,
+                    dataset_date TEXT
+                )"""
+            )
+            # Tables created before dataset_date existed
+            cur.execute(f"PRAGMA table_info({table})")
+            if "dataset_date" not in {r[1] for r in cur.fetchall()}:
+                cur.execute(f"ALTER TABLE {table} ADD COLUMN dataset_date TEXT")
+                logger.info("Added dataset_date column to %s", table)
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{prefix}_audit_dataset_date ON {table}(dataset_date)"
+            )
+            # Covers the source/date filters of the newest-first audit listing
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{prefix}_audit_source_loaded "
+                f"ON {table}(source, loaded_at DESC, id DESC)"
+            )
+            # Date-range filters without a source
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{prefix}_audit_loaded_at "
+                f"ON {table}(loaded_at)"
+            )
+        conn.commit()
+        conn.close()
+    except Exception as e:  # pragma: no cover
+        logger.warning("Terminology audit table migration failed: %s", e)
+
+
 # Migration: Add type & data_origin_type to arm
 def _migrate_arm_add_type_fields():
     """Ensure arm table has type and data_origin_type columns.
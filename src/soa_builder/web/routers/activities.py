@@ -9,16 +9,19 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 
 from ..audit import _record_activity_audit, _record_reorder_audit
-from ..db import _connect
+from ..db import ExistingSoa, pooled_conn
 from ..schemas import ActivityCreate, ActivityUpdate, BulkActivities
 
-_ACT_CONCEPT_CACHE = {"data": None, "fetched_at": 0}
+_ACT_CONCEPT_CACHE = {"data": None, "fetched_at": 0, "override": None, "lookup": {}}
 _ACT_CONCEPT_TTL = 60 * 60
 
 
 def fetch_biomedical_concepts(force: bool = False):
     override_json = os.environ.get("CDISC_CONCEPTS_JSON")
     if override_json:
+        # Parse a given override string once; it only changes when the env does
+        if not force and _ACT_CONCEPT_CACHE["override"] == override_json:
+            return _ACT_CONCEPT_CACHE["data"]
         try:
             data = json.loads(override_json)
             # Normalize data into an iterable list of dicts
@@ -52,6 +55,12 @@ def fetch_biomedical_concepts(force: bool = False):
                 title = c.get("title") or c.get("concept_title") or code
                 if code:
                     concepts.append({"code": code, "title": title})
+            _ACT_CONCEPT_CACHE.update(
+                data=concepts,
+                fetched_at=time.time(),
+                override=override_json,
+                lookup={c["code"]: c["title"] for c in concepts},
+            )
             return concepts
         except Exception:
             return []
@@ -63,53 +72,43 @@ def fetch_biomedical_concepts(force: bool = False):
     ):
         return _ACT_CONCEPT_CACHE["data"]
     # Remote fetch intentionally omitted here to prevent dependency & circular import; return empty list (titles fallback to codes)
-    _ACT_CONCEPT_CACHE["data"] = []
-    _ACT_CONCEPT_CACHE["fetched_at"] = now
+    _ACT_CONCEPT_CACHE.update(data=[], fetched_at=now, override=None, lookup={})
     return []
 
 
-router = APIRouter(prefix="/soa/{soa_id}")
+def _concept_lookup() -> dict:
+    """Return the cached code -> title map, refreshing the concept list if stale."""
+    fetch_biomedical_concepts()
+    return _ACT_CONCEPT_CACHE["lookup"]
 
 
-def _soa_exists(soa_id: int) -> bool:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM soa WHERE id=?", (soa_id,))
-    ok = cur.fetchone() is not None
-    conn.close()
-    return ok
+router = APIRouter(prefix="/soa/{soa_id}")
 
 
 @router.get("/activities", response_class=JSONResponse)
-def list_activities(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id,name,order_index,activity_uid FROM activity WHERE soa_id=? ORDER BY order_index",
-        (soa_id,),
-    )
-    rows = [
-        {"id": r[0], "name": r[1], "order_index": r[2], "activity_uid": r[3]}
-        for r in cur.fetchall()
-    ]
-    conn.close()
+def list_activities(soa_id: ExistingSoa):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id,name,order_index,activity_uid FROM activity WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
+        )
+        rows = [
+            {"id": r[0], "name": r[1], "order_index": r[2], "activity_uid": r[3]}
+            for r in cur.fetchall()
+        ]
     return JSONResponse(rows)
 
 
 @router.get("/activities/{activity_id}", response_class=JSONResponse)
-def get_activity(soa_id: int, activity_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id,name,order_index,activity_uid FROM activity WHERE id=? AND soa_id=?",
-        (activity_id, soa_id),
-    )
-    row = cur.fetchone()
-    conn.close()
+def get_activity(soa_id: ExistingSoa, activity_id: int):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id,name,order_index,activity_uid FROM activity WHERE id=? AND soa_id=?",
+            (activity_id, soa_id),
+        )
+        row = cur.fetchone()
     if not row:
         raise HTTPException(404, "Activity not found")
     return {
@@ -122,27 +121,28 @@ def get_activity(soa_id: int, activity_id: int):
 
 
 @router.post("/activities", response_class=JSONResponse)
-def add_activity(soa_id: int, payload: ActivityCreate):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM activity WHERE soa_id=?", (soa_id,))
-    order_index = cur.fetchone()[0] + 1
-    cur.execute(
-        "INSERT INTO activity (soa_id,name,order_index,activity_uid) VALUES (?,?,?,?)",
-        (soa_id, payload.name, order_index, f"Activity_{order_index}"),
-    )
-    aid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    after = {
-        "id": aid,
-        "name": payload.name,
-        "order_index": order_index,
-        "activity_uid": f"Activity_{order_index}",
-    }
-    _record_activity_audit(soa_id, "create", aid, before=None, after=after)
+def add_activity(soa_id: ExistingSoa, payload: ActivityCreate):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """INSERT INTO activity (soa_id,name,order_index,activity_uid)
+                SELECT ?,?,n,'Activity_' || n
+                FROM (SELECT COALESCE(MAX(order_index),0)+1 AS n FROM activity WHERE soa_id=?)
+                RETURNING id, order_index""",
+            (soa_id, payload.name, soa_id),
+        )
+        aid, order_index = cur.fetchone()
+        after = {
+            "id": aid,
+            "name": payload.name,
+            "order_index": order_index,
+            "activity_uid": f"Activity_{order_index}",
+        }
+        # Audit row shares the insert's transaction: one commit for both writes
+        _record_activity_audit(
+            soa_id, "create", aid, before=None, after=after, conn=conn
+        )
+        conn.commit()
     return {
         "activity_id": aid,
         "order_index": order_index,
@@ -151,139 +151,130 @@ def add_activity(soa_id: int, payload: ActivityCreate):
 
 
 @router.patch("/activities/{activity_id}", response_class=JSONResponse)
-def update_activity(soa_id: int, activity_id: int, payload: ActivityUpdate):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id,name,order_index,activity_uid FROM activity WHERE id=? AND soa_id=?",
-        (activity_id, soa_id),
-    )
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(404, "Activity not found")
-    before = {
-        "id": row[0],
-        "name": row[1],
-        "order_index": row[2],
-        "activity_uid": row[3],
-    }
-    new_name = (payload.name if payload.name is not None else before["name"]) or ""
-    new_name = new_name.strip()
-    cur.execute(
-        "UPDATE activity SET name=? WHERE id=?", (new_name or None, activity_id)
-    )
-    conn.commit()
-    cur.execute(
-        "SELECT id,name,order_index,activity_uid FROM activity WHERE id=?",
-        (activity_id,),
-    )
-    r = cur.fetchone()
-    conn.close()
-    after = {"id": r[0], "name": r[1], "order_index": r[2], "activity_uid": r[3]}
-    updated_fields = ["name"] if before["name"] != after["name"] else []
-    _record_activity_audit(
-        soa_id,
-        "update",
-        activity_id,
-        before=before,
-        after={**after, "updated_fields": updated_fields},
-    )
+def update_activity(
+    soa_id: ExistingSoa,
+    activity_id: int,
+    payload: ActivityUpdate,
+):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id,name,order_index,activity_uid FROM activity WHERE id=? AND soa_id=?",
+            (activity_id, soa_id),
+        )
+        row = cur.fetchone()
+        if not row:
+            raise HTTPException(404, "Activity not found")
+        before = {
+            "id": row[0],
+            "name": row[1],
+            "order_index": row[2],
+            "activity_uid": row[3],
+        }
+        new_name = (payload.name if payload.name is not None else before["name"]) or ""
+        new_name = new_name.strip()
+        cur.execute(
+            "UPDATE activity SET name=? WHERE id=?", (new_name or None, activity_id)
+        )
+        # The written row is fully determined by the values above; no need to re-read it
+        after = {
+            "id": activity_id,
+            "name": new_name or None,
+            "order_index": before["order_index"],
+            "activity_uid": before["activity_uid"],
+        }
+        updated_fields = ["name"] if before["name"] != after["name"] else []
+        _record_activity_audit(
+            soa_id,
+            "update",
+            activity_id,
+            before=before,
+            after={**after, "updated_fields": updated_fields},
+            conn=conn,
+        )
+        conn.commit()
     return JSONResponse({**after, "updated_fields": updated_fields})
 
 
 @router.post("/activities/reorder", response_class=JSONResponse)
-def reorder_activities_api(soa_id: int, order: List[int]):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def reorder_activities_api(soa_id: ExistingSoa, order: List[int]):
     if not order:
         raise HTTPException(400, "Order list required")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id FROM activity WHERE soa_id=? ORDER BY order_index", (soa_id,)
-    )
-    old_order = [r[0] for r in cur.fetchall()]
-    cur.execute("SELECT id FROM activity WHERE soa_id=?", (soa_id,))
-    existing = {r[0] for r in cur.fetchall()}
-    if set(order) - existing:
-        conn.close()
-        raise HTTPException(400, "Order contains invalid activity id")
-    before_rows = {
-        r[0]: r[1]
-        for r in cur.execute(
-            "SELECT id,order_index FROM activity WHERE soa_id=?", (soa_id,)
-        ).fetchall()
-    }
-    for idx, aid in enumerate(order, start=1):
-        cur.execute("UPDATE activity SET order_index=? WHERE id=?", (idx, aid))
-    after_rows = {
-        r[0]: r[1]
-        for r in cur.execute(
-            "SELECT id,order_index FROM activity WHERE soa_id=?", (soa_id,)
-        ).fetchall()
-    }
-    # Two-phase UID reassignment
-    cur.execute(
-        "UPDATE activity SET activity_uid='TMP_' || id WHERE soa_id=?", (soa_id,)
-    )
-    cur.execute(
-        "UPDATE activity SET activity_uid='Activity_' || order_index WHERE soa_id=?",
-        (soa_id,),
-    )
-    conn.commit()
-    conn.close()
-    _record_reorder_audit(soa_id, "activity", old_order, order)
-    reorder_details = [
-        {
-            "id": aid,
-            "before_order_index": before_rows.get(aid),
-            "after_order_index": after_rows.get(aid),
-        }
-        for aid in order
-    ]
-    _record_activity_audit(
-        soa_id,
-        "reorder",
-        activity_id=None,
-        before={"old_order": old_order},
-        after={"new_order": order, "details": reorder_details},
-    )
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, order_index FROM activity WHERE soa_id=? ORDER BY order_index",
+            (soa_id,),
+        )
+        before_rows = dict(cur.fetchall())
+        old_order = list(before_rows)
+        if set(order) - before_rows.keys():
+            raise HTTPException(400, "Order contains invalid activity id")
+        new_positions = [(idx, aid) for idx, aid in enumerate(order, start=1)]
+        cur.executemany("UPDATE activity SET order_index=? WHERE id=?", new_positions)
+        # Listed ids take their new position; the rest keep their old index
+        after_rows = dict(before_rows)
+        after_rows.update((aid, idx) for idx, aid in new_positions)
+        # Two-phase UID reassignment
+        cur.execute(
+            "UPDATE activity SET activity_uid='TMP_' || id WHERE soa_id=?", (soa_id,)
+        )
+        cur.execute(
+            "UPDATE activity SET activity_uid='Activity_' || order_index WHERE soa_id=?",
+            (soa_id,),
+        )
+        _record_reorder_audit(soa_id, "activity", old_order, order, conn=conn)
+        reorder_details = [
+            {
+                "id": aid,
+                "before_order_index": before_rows.get(aid),
+                "after_order_index": after_rows.get(aid),
+            }
+            for aid in order
+        ]
+        _record_activity_audit(
+            soa_id,
+            "reorder",
+            activity_id=None,
+            before={"old_order": old_order},
+            after={"new_order": order, "details": reorder_details},
+            conn=conn,
+        )
+        conn.commit()
     return JSONResponse({"ok": True, "old_order": old_order, "new_order": order})
 
 
 @router.post("/activities/bulk", response_class=JSONResponse)
-def add_activities_bulk(soa_id: int, payload: BulkActivities):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def add_activities_bulk(soa_id: ExistingSoa, payload: BulkActivities):
     names = [n.strip() for n in payload.names if n and n.strip()]
     if not names:
         return {"added": 0, "skipped": 0, "details": []}
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT name FROM activity WHERE soa_id=?", (soa_id,))
-    existing = set(r[0].lower() for r in cur.fetchall())
-    cur.execute("SELECT COUNT(*) FROM activity WHERE soa_id=?", (soa_id,))
-    count = cur.fetchone()[0]
-    order_index = count
-    added = []
-    skipped = []
-    for name in names:
-        lname = name.lower()
-        if lname in existing:
-            skipped.append(name)
-            continue
-        order_index += 1
-        cur.execute(
-            "INSERT INTO activity (soa_id,name,order_index,activity_uid) VALUES (?,?,?,?)",
-            (soa_id, name, order_index, f"Activity_{order_index}"),
-        )
-        added.append(name)
-        existing.add(lname)
-    conn.commit()
-    conn.close()
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT name FROM activity WHERE soa_id=?", (soa_id,))
+        existing = set(r[0].lower() for r in cur.fetchall())
+        added = []
+        skipped = []
+        for name in names:
+            lname = name.lower()
+            if lname in existing:
+                skipped.append(name)
+                continue
+            added.append(name)
+            existing.add(lname)
+        if added:
+            # Take the write lock up front so the count and the batch insert agree
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute("SELECT COUNT(*) FROM activity WHERE soa_id=?", (soa_id,))
+            count = cur.fetchone()[0]
+            cur.executemany(
+                "INSERT INTO activity (soa_id,name,order_index,activity_uid) VALUES (?,?,?,?)",
+                [
+                    (soa_id, name, idx, f"Activity_{idx}")
+                    for idx, name in enumerate(added, start=count + 1)
+                ],
+            )
+            conn.commit()
     return {
         "added": len(added),
         "skipped": len(skipped),
@@ -292,29 +283,32 @@ def add_activities_bulk(soa_id: int, payload: BulkActivities):
 
 
 @router.post("/activities/{activity_id}/concepts", response_class=JSONResponse)
-def set_activity_concepts(soa_id: int, activity_id: int, concept_codes: List[str]):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM activity WHERE id=? AND soa_id=?", (activity_id, soa_id))
-    if not cur.fetchone():
-        conn.close()
-        raise HTTPException(404, "Activity not found")
-    cur.execute("DELETE FROM activity_concept WHERE activity_id=?", (activity_id,))
-    concepts = fetch_biomedical_concepts()
-    lookup = {c["code"]: c["title"] for c in concepts}
-    inserted = 0
-    for code in concept_codes:
-        ccode = code.strip()
-        if not ccode:
-            continue
-        title = lookup.get(ccode, ccode)
+def set_activity_concepts(
+    soa_id: ExistingSoa, activity_id: int, concept_codes: List[str]
+):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT 1 FROM activity WHERE id=? AND soa_id=?", (activity_id, soa_id)
+        )
+        if not cur.fetchone():
+            raise HTTPException(404, "Activity not found")
+        lookup = _concept_lookup()
+        codes = list(dict.fromkeys(c.strip() for c in concept_codes if c.strip()))
+        # Only touch the delta; ux_activity_concept makes re-adding a kept code a no-op
         cur.execute(
-            "INSERT INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
-            (activity_id, ccode, title),
+            "SELECT concept_code FROM activity_concept WHERE activity_id=?",
+            (activity_id,),
+        )
+        stale = {r[0] for r in cur.fetchall()}.difference(codes)
+        cur.executemany(
+            "DELETE FROM activity_concept WHERE activity_id=? AND concept_code=?",
+            [(activity_id, code) for code in stale],
+        )
+        cur.executemany(
+            "INSERT OR IGNORE INTO activity_concept (activity_id, concept_code, concept_title) VALUES (?,?,?)",
+            [(activity_id, code, lookup.get(code, code)) for code in codes],
         )
-        inserted += 1
-    conn.commit()
-    conn.close()
+        inserted = len(codes)
+        conn.commit()
     return {"activity_id": activity_id, "concepts_set": inserted}
@@ -1,38 +1,53 @@
-import json
+import hashlib
 import os
-import sqlite3
+from typing import Optional
 
 from fastapi import APIRouter, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    Response,
+)
 from fastapi.templating import Jinja2Templates
 
+from ..db import ExistingSoa, pooled_conn
+
 DB_PATH = os.environ.get("SOA_BUILDER_DB", "soa_builder_web.db")
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
 router = APIRouter()
 
+# Freeze snapshots never change once written, so responses may be cached indefinitely.
+_FREEZE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
-def _connect():
-    return sqlite3.connect(DB_PATH)
+def _freeze_etag(soa_id: int, freeze_id: int, created_at: Optional[str]) -> str:
+    # created_at tells apart freezes that reuse an id after the database is recreated
+    stamp = hashlib.blake2b((created_at or "").encode(), digest_size=8).hexdigest()
+    return f'"freeze-{soa_id}-{freeze_id}-{stamp}"'
 
 
-def _soa_exists(soa_id: int) -> bool:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM soa WHERE id=?", (soa_id,))
-    r = cur.fetchone()
-    conn.close()
-    return r is not None
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _set_freeze_cache_headers(response: Response, etag: str):
+    response.headers["Cache-Control"] = _FREEZE_CACHE_CONTROL
+    response.headers["ETag"] = etag
+    return response
 
 
 # Dynamic helper imports inside endpoint bodies avoid circular import at module load.
 
 
 @router.post("/ui/soa/{soa_id}/freeze", response_class=HTMLResponse)
-def ui_freeze_soa(request: Request, soa_id: int, version_label: str = Form("")):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def ui_freeze_soa(request: Request, soa_id: ExistingSoa, version_label: str = Form("")):
     try:
         from ..app import _create_freeze  # type: ignore
 
@@ -47,28 +62,34 @@ def ui_freeze_soa(request: Request, soa_id: int, version_label: str = Form("")):
         )
     if request.headers.get("HX-Request") == "true":
         return HTMLResponse("", headers={"HX-Redirect": f"/ui/soa/{soa_id}/edit"})
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return RedirectResponse(url=f"/ui/soa/{soa_id}/edit", status_code=303)
 
 
 @router.get("/soa/{soa_id}/freeze/{freeze_id}")
-def get_freeze(soa_id: int, freeze_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT snapshot_json FROM soa_freeze WHERE id=? AND soa_id=?",
-        (freeze_id, soa_id),
-    )
-    row = cur.fetchone()
-    conn.close()
+def get_freeze(request: Request, soa_id: ExistingSoa, freeze_id: int):
+    with pooled_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT created_at FROM soa_freeze WHERE id=? AND soa_id=?",
+            (freeze_id, soa_id),
+        )
+        row = cur.fetchone()
+        if not row:
+            raise HTTPException(404, "Freeze not found")
+        etag = _freeze_etag(soa_id, freeze_id, row[0])
+        if _etag_matches(request.headers.get("If-None-Match"), etag):
+            return _set_freeze_cache_headers(Response(status_code=304), etag)
+        cur.execute("SELECT snapshot_json FROM soa_freeze WHERE id=?", (freeze_id,))
+        row = cur.fetchone()
     if not row:
         raise HTTPException(404, "Freeze not found")
-    try:
-        data = json.loads(row[0])
-    except Exception:
-        data = {"error": "Corrupt snapshot"}
-    return JSONResponse(data)
+    snapshot = (row[0] or "").lstrip()
+    # Snapshot is stored as JSON text already; pass it through without re-parsing
+    if not snapshot or snapshot[0] not in "{[":
+        return JSONResponse({"error": "Corrupt snapshot"})
+    return _set_freeze_cache_headers(
+        Response(content=snapshot, media_type="application/json"), etag
+    )
 
 
 @router.get("/ui/soa/{soa_id}/freeze/{freeze_id}/view", response_class=HTMLResponse)
@@ -78,11 +99,14 @@ def ui_freeze_view(request: Request, soa_id: int, freeze_id: int):
     freeze = _get_freeze(soa_id, freeze_id)
     if not freeze:
         raise HTTPException(404, "Freeze not found")
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         request,
         "freeze_modal.html",
         {"mode": "view", "freeze": freeze, "soa_id": soa_id},
     )
+    return _set_freeze_cache_headers(
+        response, _freeze_etag(soa_id, freeze_id, freeze["created_at"])
+    )
 
 
 @router.get("/ui/soa/{soa_id}/freeze/diff", response_class=HTMLResponse)
@@ -118,7 +142,7 @@ def ui_freeze_rollback(request: Request, soa_id: int, freeze_id: int):
     )
     if request.headers.get("HX-Request") == "true":
         return HTMLResponse("", headers={"HX-Redirect": f"/ui/soa/{soa_id}/edit"})
-    return HTMLResponse(f"<script>window.location='/ui/soa/{soa_id}/edit';</script>")
+    return RedirectResponse(url=f"/ui/soa/{soa_id}/edit", status_code=303)
 
 
 @router.get(
@@ -141,10 +165,10 @@ def ui_freeze_rollback_preview(request: Request, soa_id: int, freeze_id: int):
     )
 
 
-@router.get("/soa/{soa_id}/freeze/diff.json")
+@router.get("/soa/{soa_id}/freeze/diff.json", response_class=ORJSONResponse)
 def get_freeze_diff_json(soa_id: int, left: int, right: int, full: int = 0):
     from ..app import _diff_freezes_limited  # type: ignore
 
     limit = None if full == 1 else 1000
     diff = _diff_freezes_limited(soa_id, left, right, limit=limit)
-    return JSONResponse(diff)
+    return ORJSONResponse(diff)
@@ -1,12 +1,14 @@
 import io
 import os
+from typing import List
 
 import pandas as pd
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
 
-from ..db import _connect
+from ..db import ExistingSoa
 
 DB_PATH = os.environ.get("SOA_BUILDER_DB", "soa_builder_web.db")
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
@@ -15,37 +17,22 @@ templates = Jinja2Templates(directory=TEMPLATES_DIR)
 router = APIRouter()
 
 
-def _soa_exists(soa_id: int) -> bool:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM soa WHERE id=?", (soa_id,))
-    r = cur.fetchone()
-    conn.close()
-    return r is not None
-
-
-@router.get("/soa/{soa_id}/rollback_audit")
-def get_rollback_audit_json(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+@router.get("/soa/{soa_id}/rollback_audit", response_class=ORJSONResponse)
+def get_rollback_audit_json(soa_id: ExistingSoa):
     from ..app import _list_rollback_audit  # type: ignore
 
     return {"audit": _list_rollback_audit(soa_id)}
 
 
-@router.get("/soa/{soa_id}/reorder_audit")
-def get_reorder_audit_json(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+@router.get("/soa/{soa_id}/reorder_audit", response_class=ORJSONResponse)
+def get_reorder_audit_json(soa_id: ExistingSoa):
     from ..app import _list_reorder_audit  # type: ignore
 
     return {"audit": _list_reorder_audit(soa_id)}
 
 
 @router.get("/ui/soa/{soa_id}/rollback_audit", response_class=HTMLResponse)
-def ui_rollback_audit(request: Request, soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def ui_rollback_audit(request: Request, soa_id: ExistingSoa):
     from ..app import _list_rollback_audit  # type: ignore
 
     return templates.TemplateResponse(
@@ -56,9 +43,7 @@ def ui_rollback_audit(request: Request, soa_id: int):
 
 
 @router.get("/ui/soa/{soa_id}/reorder_audit", response_class=HTMLResponse)
-def ui_reorder_audit(request: Request, soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
+def ui_reorder_audit(request: Request, soa_id: ExistingSoa):
     from ..app import _list_reorder_audit  # type: ignore
 
     return templates.TemplateResponse(
@@ -68,46 +53,41 @@ def ui_reorder_audit(request: Request, soa_id: int):
     )
 
 
-@router.get("/soa/{soa_id}/rollback_audit/export/xlsx")
-def export_rollback_audit_xlsx(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    from ..app import _list_rollback_audit  # type: ignore
+_XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_ROLLBACK_AUDIT_COLUMNS = [
+    "id",
+    "freeze_id",
+    "performed_at",
+    "visits_restored",
+    "activities_restored",
+    "cells_restored",
+    "concepts_restored",
+    "elements_restored",
+]
 
-    rows = _list_rollback_audit(soa_id)
+_REORDER_AUDIT_COLUMNS = [
+    "id",
+    "entity_type",
+    "performed_at",
+    "old_order",
+    "new_order",
+    "moves",
+]
+
+
+def _build_workbook(rows: List[dict], columns: List[str], sheet_name: str) -> bytes:
+    """Render audit rows to an XLSX workbook (CPU-bound; run off the event loop)."""
     df = pd.DataFrame(rows)
     if df.empty:
-        df = pd.DataFrame(
-            columns=[
-                "id",
-                "freeze_id",
-                "performed_at",
-                "visits_restored",
-                "activities_restored",
-                "cells_restored",
-                "concepts_restored",
-                "elements_restored",
-            ]
-        )
+        df = pd.DataFrame(columns=columns)
     bio = io.BytesIO()
     with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="RollbackAudit")
-    bio.seek(0)
-    filename = f"soa_{soa_id}_rollback_audit.xlsx"
-    return StreamingResponse(
-        bio,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return bio.getvalue()
 
 
-@router.get("/soa/{soa_id}/reorder_audit/export/xlsx")
-def export_reorder_audit_xlsx(soa_id: int):
-    if not _soa_exists(soa_id):
-        raise HTTPException(404, "SOA not found")
-    from ..app import _list_reorder_audit  # type: ignore
-
-    rows = _list_reorder_audit(soa_id)
+def _flatten_reorder_rows(rows: List[dict]) -> List[dict]:
     flat = []
     for r in rows:
         moves = []
@@ -127,25 +107,39 @@ def export_reorder_audit_xlsx(soa_id: int):
                 "moves": "; ".join(moves) if moves else "",
             }
         )
-    df = pd.DataFrame(flat)
-    if df.empty:
-        df = pd.DataFrame(
-            columns=[
-                "id",
-                "entity_type",
-                "performed_at",
-                "old_order",
-                "new_order",
-                "moves",
-            ]
-        )
-    bio = io.BytesIO()
-    with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="ReorderAudit")
-    bio.seek(0)
+    return flat
+
+
+@router.get("/soa/{soa_id}/rollback_audit/export/xlsx")
+async def export_rollback_audit_xlsx(soa_id: ExistingSoa):
+    from ..app import _list_rollback_audit  # type: ignore
+
+    rows = await run_in_threadpool(_list_rollback_audit, soa_id)
+    data = await run_in_threadpool(
+        _build_workbook, rows, _ROLLBACK_AUDIT_COLUMNS, "RollbackAudit"
+    )
+    filename = f"soa_{soa_id}_rollback_audit.xlsx"
+    return Response(
+        content=data,
+        media_type=_XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/soa/{soa_id}/reorder_audit/export/xlsx")
+async def export_reorder_audit_xlsx(soa_id: ExistingSoa):
+    from ..app import _list_reorder_audit  # type: ignore
+
+    rows = await run_in_threadpool(_list_reorder_audit, soa_id)
+    data = await run_in_threadpool(
+        _build_workbook,
+        _flatten_reorder_rows(rows),
+        _REORDER_AUDIT_COLUMNS,
+        "ReorderAudit",
+    )
     filename = f"soa_{soa_id}_reorder_audit.xlsx"
-    return StreamingResponse(
-        bio,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    return Response(
+        content=data,
+        media_type=_XLSX_MEDIA_TYPE,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -0,0 +1,46 @@
+import uuid
+
+from soa_builder.web.audit import _record_arm_audit, _write_audit, flush_audit
+from soa_builder.web.db import _connect
+
+
+def _arm_audit_actions(soa_id):
+    conn = _connect()
+    rows = conn.execute(
+        "SELECT action FROM arm_audit WHERE soa_id=? ORDER BY id", (soa_id,)
+    ).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+
+def _unused_soa_id():
+    # Audit tables have no foreign keys; a random high id keeps rows isolated
+    return 10_000_000 + uuid.uuid4().int % 10_000_000
+
+
+def test_background_audit_rows_visible_after_flush():
+    soa_id = _unused_soa_id()
+    for i in range(5):
+        _record_arm_audit(soa_id, f"action-{i}", None, after={"n": i})
+    flush_audit()
+    assert _arm_audit_actions(soa_id) == [f"action-{i}" for i in range(5)]
+
+
+def test_background_audit_bad_row_does_not_drop_batch():
+    soa_id = _unused_soa_id()
+    _record_arm_audit(soa_id, "before", None)
+    _write_audit("INSERT INTO no_such_table (x) VALUES (?)", (1,), "broken")
+    _record_arm_audit(soa_id, "after", None)
+    flush_audit()
+    assert _arm_audit_actions(soa_id) == ["before", "after"]
+
+
+def test_audit_with_conn_joins_caller_transaction():
+    soa_id = _unused_soa_id()
+    conn = _connect()
+    _record_arm_audit(soa_id, "rolled-back", None, conn=conn)
+    conn.rollback()
+    _record_arm_audit(soa_id, "committed", None, conn=conn)
+    conn.commit()
+    conn.close()
+    assert _arm_audit_actions(soa_id) == ["committed"]
@@ -1,6 +1,6 @@
 from fastapi.testclient import TestClient
 
-from soa_builder.web.app import app
+from soa_builder.web.app import _connect, app
 
 client = TestClient(app)
 
@@ -64,3 +64,45 @@ def test_matrix_import_endpoint():
         and c["activity_id"] == activity_map["Hematology"]
     ]
     assert target_matrix_cells and target_matrix_cells[0]["status"] == "O"
+
+
+def test_matrix_import_appends_after_order_index_gaps():
+    reset_db()
+    r = client.post("/soa", json={"name": "Matrix Gap Trial"})
+    soa_id = r.json()["id"]
+    base = {
+        "visits": [{"name": "V1"}, {"name": "V2"}],
+        "activities": [
+            {"name": "A1", "statuses": ["X", ""]},
+            {"name": "A2", "statuses": ["", "X"]},
+        ],
+        "reset": True,
+    }
+    assert client.post(f"/soa/{soa_id}/matrix/import", json=base).status_code == 200
+    # Leave a gap (order_index 1 and 3): COUNT(*)+1 would reuse index 3
+    conn = _connect()
+    conn.execute(
+        "UPDATE visit SET order_index=3 WHERE soa_id=? AND name='V2'", (soa_id,)
+    )
+    conn.execute(
+        "UPDATE activity SET order_index=3 WHERE soa_id=? AND name='A2'", (soa_id,)
+    )
+    conn.commit()
+    conn.close()
+    extra = {
+        "visits": [{"name": "V3"}],
+        "activities": [{"name": "A3", "statuses": ["O"]}],
+        "reset": False,
+    }
+    resp = client.post(f"/soa/{soa_id}/matrix/import", json=extra)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["cells_inserted"] == 1
+    m = client.get(f"/soa/{soa_id}/matrix").json()
+    visit_map = {v["name"]: v["id"] for v in m["visits"]}
+    activity_map = {a["name"]: a["id"] for a in m["activities"]}
+    assert len(visit_map) == 3 and len(activity_map) == 3
+    cells = {(c["visit_id"], c["activity_id"]): c["status"] for c in m["cells"]}
+    assert cells[(visit_map["V3"], activity_map["A3"])] == "O"
+    # Earlier rows gained no cells from the append
+    assert (visit_map["V2"], activity_map["A3"]) not in cells
+    assert (visit_map["V3"], activity_map["A2"]) not in cells
@@ -0,0 +1,116 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from soa_builder.web.app import (
+    _concept_cache,
+    _connect,
+    app,
+    fetch_biomedical_concepts,
+)
+
+client = TestClient(app)
+
+
+def _soa_with_cell_axes(name):
+    soa_id = client.post("/soa", json={"name": name}).json()["id"]
+    v = client.post(f"/soa/{soa_id}/visits", json={"name": "C1D1"}).json()["visit_id"]
+    a = client.post(f"/soa/{soa_id}/activities", json={"name": "Lab"}).json()[
+        "activity_id"
+    ]
+    return soa_id, v, a
+
+
+def _cell_rows(soa_id):
+    conn = _connect()
+    rows = conn.execute(
+        "SELECT id, visit_id, activity_id, status FROM matrix_cells WHERE soa_id=?",
+        (soa_id,),
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_set_cell_upserts_single_row():
+    soa_id, v, a = _soa_with_cell_axes("Cell Upsert Trial")
+    first = client.post(
+        f"/soa/{soa_id}/cells", json={"visit_id": v, "activity_id": a, "status": "X"}
+    ).json()
+    second = client.post(
+        f"/soa/{soa_id}/cells", json={"visit_id": v, "activity_id": a, "status": "O"}
+    ).json()
+    # Same row updated in place
+    assert second == {"cell_id": first["cell_id"], "status": "O"}
+    assert _cell_rows(soa_id) == [(first["cell_id"], v, a, "O")]
+
+
+def test_set_cell_blank_on_empty_cell_is_noop():
+    soa_id, v, a = _soa_with_cell_axes("Cell Blank Trial")
+    r = client.post(
+        f"/soa/{soa_id}/cells", json={"visit_id": v, "activity_id": a, "status": " "}
+    ).json()
+    assert r == {"cell_id": None, "status": "", "deleted": False}
+    assert _cell_rows(soa_id) == []
+
+
+def test_toggle_clears_any_existing_status():
+    soa_id, v, a = _soa_with_cell_axes("Toggle Status Trial")
+    client.post(
+        f"/soa/{soa_id}/cells", json={"visit_id": v, "activity_id": a, "status": "O"}
+    )
+    r = client.post(
+        f"/ui/soa/{soa_id}/toggle_cell", data={"visit_id": v, "activity_id": a}
+    )
+    assert r.status_code == 200
+    assert r.text.endswith('class="cell"></td>')
+    # The returned cell re-posts its own coordinates
+    assert f'"visit_id":{v},"activity_id":{a}' in r.text
+    assert _cell_rows(soa_id) == []
+
+
+def test_concept_chip_add_and_remove(monkeypatch):
+    monkeypatch.setenv(
+        "CDISC_CONCEPTS_JSON",
+        json.dumps([{"code": "C64848", "title": "Hemoglobin Measurement"}]),
+    )
+    # Restore the shared concept cache after the test
+    for key in ("data", "fetched_at", "mono_at"):
+        monkeypatch.setitem(_concept_cache, key, _concept_cache.get(key))
+    fetch_biomedical_concepts(force=True)
+    soa_id, _v, a = _soa_with_cell_axes("Concept Chip Trial")
+    url = f"/ui/soa/{soa_id}/activity/{a}/concepts"
+    r = client.post(f"{url}/add", data={"concept_code": "C64848"})
+    assert r.status_code == 200
+    # Only the new chip is returned, titled from the concept list
+    assert r.text.count('class="concept-line"') == 1
+    assert "Hemoglobin Measurement" in r.text
+    assert 'value="C64848"' in r.text
+    # Adding it again leaves the page untouched
+    again = client.post(f"{url}/add", data={"concept_code": "C64848"})
+    assert again.status_code == 204
+    conn = _connect()
+    assert conn.execute(
+        "SELECT concept_code, concept_title FROM activity_concept WHERE activity_id=?",
+        (a,),
+    ).fetchall() == [("C64848", "Hemoglobin Measurement")]
+    conn.close()
+    removed = client.post(f"{url}/remove", data={"concept_code": "C64848"})
+    assert removed.status_code == 200 and removed.text == ""
+    conn = _connect()
+    assert (
+        conn.execute(
+            "SELECT COUNT(*) FROM activity_concept WHERE activity_id=?", (a,)
+        ).fetchone()[0]
+        == 0
+    )
+    conn.close()
+
+
+def test_concept_chip_add_rejects_foreign_activity():
+    soa_id, _v, _a = _soa_with_cell_axes("Concept Chip Owner Trial")
+    _other_soa, _ov, other_activity = _soa_with_cell_axes("Concept Chip Other Trial")
+    r = client.post(
+        f"/ui/soa/{soa_id}/activity/{other_activity}/concepts/add",
+        data={"concept_code": "C64848"},
+    )
+    assert r.status_code == 404
@@ -0,0 +1,57 @@
+import sqlite3
+import uuid
+
+from soa_builder.web.db import ConnectionPool, _connect, pooled_conn
+
+
+def _arm_audit_actions(soa_id):
+    conn = _connect()
+    rows = conn.execute(
+        "SELECT action FROM arm_audit WHERE soa_id=? ORDER BY id", (soa_id,)
+    ).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+
+def _unused_soa_id():
+    # Audit tables have no foreign keys; a random high id keeps rows isolated
+    return 10_000_000 + uuid.uuid4().int % 10_000_000
+
+
+def test_pool_reuses_idle_connection_lifo():
+    pool = ConnectionPool(size=2)
+    a = pool.acquire()
+    b = pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    assert pool.acquire() is b
+    assert pool.acquire() is a
+    pool.close_all()
+
+
+def test_pool_release_rolls_back_open_transaction():
+    soa_id = _unused_soa_id()
+    with pooled_conn() as conn:
+        conn.execute(
+            "INSERT INTO arm_audit (soa_id, action, performed_at) VALUES (?,?,?)",
+            (soa_id, "uncommitted", "2025-01-01T00:00:00"),
+        )
+        assert conn.in_transaction
+        leaked = conn
+    assert not leaked.in_transaction
+    assert _arm_audit_actions(soa_id) == []
+
+
+def test_pool_closes_connections_beyond_size():
+    pool = ConnectionPool(size=1)
+    a = pool.acquire()
+    b = pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    try:
+        b.execute("SELECT 1")
+        raise AssertionError("surplus connection should be closed")
+    except sqlite3.ProgrammingError:
+        pass
+    assert pool.acquire() is a
+    pool.close_all()
@@ -1,6 +1,9 @@
+import io
+
+import pandas as pd
 from fastapi.testclient import TestClient
 
-from soa_builder.web.app import app
+from soa_builder.web.app import _create_freeze, app
 
 client = TestClient(app)
 
@@ -41,6 +44,71 @@ def test_export_xlsx():
     assert len(resp.content) > 1000  # basic size sanity
 
 
+def _read_xlsx(content):
+    return pd.read_excel(io.BytesIO(content), sheet_name=None, dtype=str)
+
+
+def test_export_xlsx_sheet_contents():
+    reset_db()
+    soa_id = _setup_matrix()
+    resp = client.get(f"/soa/{soa_id}/export/xlsx")
+    assert resp.status_code == 200
+    assert 'filename="soa' in resp.headers["content-disposition"]
+    sheets = _read_xlsx(resp.content)
+    assert list(sheets) == ["Study", "SoA", "ConceptMappings", "RollbackAudit"]
+    soa = sheets["SoA"].fillna("")
+    assert list(soa.columns) == ["Activity", "Concepts", "C1D1", "C1D8"]
+    assert soa.values.tolist() == [["Lab", "", "X", ""], ["ECG", "", "", "X"]]
+    study = dict(sheets["Study"].fillna("").values.tolist())
+    assert study["Study Name"] == "Export Trial"
+    assert study["Cell Count"] == "2"
+
+
+def test_export_xlsx_writes_every_row_in_constant_memory():
+    reset_db()
+    soa_id = client.post("/soa", json={"name": "Large Export Trial"}).json()["id"]
+    n_visits, n_activities = 12, 40
+    payload = {
+        "visits": [{"name": f"V{i}"} for i in range(n_visits)],
+        "activities": [
+            {
+                "name": f"A{j}",
+                "statuses": ["X" if (i + j) % 3 == 0 else "" for i in range(n_visits)],
+            }
+            for j in range(n_activities)
+        ],
+        "reset": True,
+    }
+    assert client.post(f"/soa/{soa_id}/matrix/import", json=payload).status_code == 200
+    soa = _read_xlsx(client.get(f"/soa/{soa_id}/export/xlsx").content)["SoA"]
+    soa = soa.fillna("")
+    assert soa.shape == (n_activities, n_visits + 2)
+    assert soa["Activity"].tolist() == [f"A{j}" for j in range(n_activities)]
+    for j, row in enumerate(soa.itertuples(index=False)):
+        assert list(row[2:]) == payload["activities"][j]["statuses"]
+
+
+def test_export_xlsx_reads_freezes_for_metadata_and_diff():
+    reset_db()
+    soa_id = _setup_matrix()
+    left, _ = _create_freeze(soa_id, "draft-1")
+    right, _ = _create_freeze(soa_id, "draft-2")
+    resp = client.get(f"/soa/{soa_id}/export/xlsx")
+    assert resp.headers["content-disposition"].endswith('_draft-2.xlsx"')
+    study = dict(_read_xlsx(resp.content)["Study"].fillna("").values.tolist())
+    assert study["Frozen Versions Count"] == "2"
+    assert study["Latest Freeze Label"] == "draft-2"
+    resp = client.get(
+        f"/soa/{soa_id}/export/xlsx", params={"left": left, "right": right}
+    )
+    assert resp.headers["content-disposition"].endswith('_draft-1_vs_draft-2.xlsx"')
+    sheets = _read_xlsx(resp.content)
+    assert "ConceptDiff" in sheets
+    study = dict(sheets["Study"].fillna("").values.tolist())
+    assert study["Diff Left Label"] == "draft-1"
+    assert study["Diff Right Label"] == "draft-2"
+
+
 def test_export_pdf():
     reset_db()
     soa_id = _setup_matrix()
@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+
+from soa_builder.web.app import _connect, _create_freeze, app
+
+client = TestClient(app)
+
+
+def _new_freeze(name):
+    soa_id = client.post("/soa", json={"name": name}).json()["id"]
+    freeze_id, _label = _create_freeze(soa_id, None)
+    return soa_id, freeze_id
+
+
+def test_freeze_etag_revalidation():
+    soa_id, freeze_id = _new_freeze("Freeze ETag Trial")
+    r = client.get(f"/soa/{soa_id}/freeze/{freeze_id}")
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert "immutable" in r.headers["Cache-Control"]
+    r2 = client.get(
+        f"/soa/{soa_id}/freeze/{freeze_id}", headers={"If-None-Match": etag}
+    )
+    assert r2.status_code == 304
+    assert r2.headers["ETag"] == etag
+    # Weak and list forms of If-None-Match also match
+    r3 = client.get(
+        f"/soa/{soa_id}/freeze/{freeze_id}",
+        headers={"If-None-Match": f'"other", W/{etag}'},
+    )
+    assert r3.status_code == 304
+
+
+def test_freeze_etag_not_honoured_for_missing_freeze():
+    soa_id, freeze_id = _new_freeze("Freeze ETag Missing Trial")
+    etag = client.get(f"/soa/{soa_id}/freeze/{freeze_id}").headers["ETag"]
+    conn = _connect()
+    conn.execute("DELETE FROM soa_freeze WHERE id=?", (freeze_id,))
+    conn.commit()
+    conn.close()
+    r = client.get(f"/soa/{soa_id}/freeze/{freeze_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 404
+
+
+def test_freeze_etag_changes_with_created_at():
+    soa_id, freeze_id = _new_freeze("Freeze ETag Recreated Trial")
+    etag = client.get(f"/soa/{soa_id}/freeze/{freeze_id}").headers["ETag"]
+    # Same ids, different freeze (as after the database is recreated)
+    conn = _connect()
+    conn.execute(
+        "UPDATE soa_freeze SET created_at='2000-01-01T00:00:00', snapshot_json='{}' WHERE id=?",
+        (freeze_id,),
+    )
+    conn.commit()
+    conn.close()
+    r = client.get(f"/soa/{soa_id}/freeze/{freeze_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert r.json() == {}
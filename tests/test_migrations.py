@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+
+from soa_builder.web import db
+from soa_builder.web.migrate_database import (
+    _migrate_activity_concept_unique,
+    _migrate_matrix_indexes,
+)
+
+
+@pytest.fixture
+def scratch_db(tmp_path, monkeypatch):
+    """Point the migrations at an empty throwaway database."""
+    path = str(tmp_path / "migrate.db")
+    monkeypatch.setattr(db, "DB_PATH", path)
+    return path
+
+
+def _index_names(path):
+    conn = sqlite3.connect(path)
+    names = {
+        r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    }
+    conn.close()
+    return names
+
+
+def test_matrix_cells_duplicates_collapse_to_latest(scratch_db):
+    conn = sqlite3.connect(scratch_db)
+    conn.executescript(
+        """
+        CREATE TABLE visit (id INTEGER PRIMARY KEY, soa_id INTEGER, order_index INTEGER);
+        CREATE TABLE activity (id INTEGER PRIMARY KEY, soa_id INTEGER, order_index INTEGER);
+        CREATE TABLE matrix_cells (id INTEGER PRIMARY KEY AUTOINCREMENT, soa_id INTEGER,
+            visit_id INTEGER, activity_id INTEGER, status TEXT);
+        INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES
+            (1, 1, 1, 'old'), (1, 1, 1, 'new'), (1, 2, 1, 'X');
+        """
+    )
+    conn.commit()
+    conn.close()
+    _migrate_matrix_indexes()
+    _migrate_matrix_indexes()  # idempotent
+    conn = sqlite3.connect(scratch_db)
+    rows = conn.execute(
+        "SELECT visit_id, status FROM matrix_cells ORDER BY visit_id"
+    ).fetchall()
+    assert rows == [(1, "new"), (2, "X")]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO matrix_cells (soa_id, visit_id, activity_id, status) VALUES (1, 2, 1, 'dup')"
+        )
+    conn.close()
+    assert {
+        "ux_matrix_cells_soa_visit_activity",
+        "ix_matrix_cells_soa_activity",
+        "ix_visit_soa_order",
+        "ix_activity_soa_order",
+    } <= _index_names(scratch_db)
+
+
+def test_activity_concept_duplicates_keep_earliest(scratch_db):
+    conn = sqlite3.connect(scratch_db)
+    conn.executescript(
+        """
+        CREATE TABLE activity_concept (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            activity_id INTEGER, concept_code TEXT, concept_title TEXT);
+        INSERT INTO activity_concept (activity_id, concept_code, concept_title) VALUES
+            (1, 'C1', 'first'), (1, 'C1', 'second'), (1, 'C2', 'other'), (2, 'C1', 'x');
+        """
+    )
+    conn.commit()
+    conn.close()
+    _migrate_activity_concept_unique()
+    _migrate_activity_concept_unique()  # idempotent
+    conn = sqlite3.connect(scratch_db)
+    rows = conn.execute(
+        "SELECT activity_id, concept_code, concept_title FROM activity_concept ORDER BY id"
+    ).fetchall()
+    assert rows == [(1, "C1", "first"), (1, "C2", "other"), (2, "C1", "x")]
+    # INSERT OR IGNORE now relies on the unique index
+    conn.execute(
+        "INSERT OR IGNORE INTO activity_concept (activity_id, concept_code, concept_title) VALUES (1, 'C1', 'again')"
+    )
+    assert conn.execute("SELECT COUNT(*) FROM activity_concept").fetchone()[0] == 3
+    conn.close()
+    assert "ux_activity_concept" in _index_names(scratch_db)
@@ -0,0 +1,99 @@
+import re
+import uuid
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+
+from soa_builder.web.app import _AUDIT_PAGE_DEFAULT, _connect, app
+
+client = TestClient(app)
+
+
+@contextmanager
+def _seeded_audit(table, n):
+    """Insert n audit rows under a fresh source so filters isolate them; the rows
+    are removed afterwards to keep the shared test database's audit pages intact."""
+    source = f"test-{uuid.uuid4().hex[:8]}"
+    conn = _connect()
+    conn.executemany(
+        f"INSERT INTO {table} (loaded_at,original_filename,source,row_count) VALUES (?,?,?,?)",
+        [(f"2025-01-01T00:00:{i % 60:02d}", f"f{i}.xlsx", source, i) for i in range(n)],
+    )
+    conn.commit()
+    try:
+        yield source
+    finally:
+        conn.execute(f"DELETE FROM {table} WHERE source=?", (source,))
+        conn.commit()
+        conn.close()
+
+
+def test_ui_audit_links_to_older_page():
+    with _seeded_audit("ddf_terminology_audit", _AUDIT_PAGE_DEFAULT + 1) as source:
+        r = client.get("/ui/ddf/terminology/audit", params={"source": source})
+        assert r.status_code == 200
+        assert f"Showing {_AUDIT_PAGE_DEFAULT} audit entries" in r.text
+        m = re.search(r"before_id=(\d+)\">Older entries", r.text)
+        assert m
+        r2 = client.get(
+            "/ui/ddf/terminology/audit",
+            params={"source": source, "before_id": m.group(1)},
+        )
+    assert r2.status_code == 200
+    assert "Showing 1 audit entries" in r2.text
+    assert "f0.xlsx" in r2.text
+    assert "Older entries" not in r2.text
+
+
+def test_audit_json_export_is_not_truncated():
+    n = _AUDIT_PAGE_DEFAULT + 1
+    with _seeded_audit("protocol_terminology_audit", n) as source:
+        r = client.get(
+            "/protocol/terminology/audit/export.json", params={"source": source}
+        )
+    assert r.status_code == 200
+    rows = r.json()
+    assert len(rows) == n
+    assert [row["row_count"] for row in rows] == list(range(n - 1, -1, -1))
+    empty = client.get(
+        "/protocol/terminology/audit/export.json", params={"source": "no-such-source"}
+    )
+    assert empty.json() == []
+
+
+def test_audit_keyset_pages_cover_every_row_once():
+    n = 7
+    with _seeded_audit("ddf_terminology_audit", n) as source:
+        seen = []
+        before_id = None
+        while True:
+            params = {"source": source, "limit": 3}
+            if before_id is not None:
+                params["before_id"] = before_id
+            page = client.get("/ddf/terminology/audit", params=params).json()
+            seen.extend(row["id"] for row in page["rows"])
+            before_id = page["next_before_id"]
+            if before_id is None:
+                break
+    assert len(seen) == n
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_audit_date_filter_is_inclusive_of_end_day():
+    with _seeded_audit("ddf_terminology_audit", 2) as source:
+        r = client.get(
+            "/ddf/terminology/audit",
+            params={"source": source, "start": "2025-01-01", "end": "2025-01-01"},
+        )
+        outside = client.get(
+            "/ddf/terminology/audit",
+            params={"source": source, "start": "2025-01-02"},
+        )
+        invalid = client.get(
+            "/ddf/terminology/audit",
+            params={"source": source, "end": "2025-13-40"},
+        )
+    assert len(r.json()["rows"]) == 2
+    assert outside.json()["rows"] == []
+    # Invalid dates are ignored rather than rejected
+    assert len(invalid.json()["rows"]) == 2
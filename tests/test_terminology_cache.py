@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+from soa_builder.web.app import _connect, app
+
+client = TestClient(app)
+
+
+def _replace_table_elsewhere(sql_statements):
+    """Change protocol_terminology on a separate connection, as another worker would."""
+    conn = _connect()
+    for sql in sql_statements:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def test_protocol_terminology_cache_follows_other_writers():
+    r = client.post("/admin/load_protocol_terminology", params={"force": True})
+    assert r.status_code == 200
+    loaded = client.get("/protocol/terminology", params={"limit": 1}).json()
+    assert loaded["total_count"] == r.json()["row_count"]
+    try:
+        # Reloaded elsewhere with a different layout: columns and count follow
+        _replace_table_elsewhere(
+            [
+                "DROP TABLE IF EXISTS protocol_terminology_fts",
+                "DROP TABLE protocol_terminology",
+                "CREATE TABLE protocol_terminology (id INTEGER PRIMARY KEY, code TEXT, extra TEXT)",
+                "INSERT INTO protocol_terminology (code, extra) VALUES ('C1','a'), ('C2','b')",
+            ]
+        )
+        data = client.get("/protocol/terminology", params={"limit": 5}).json()
+        assert data["total_count"] == 2
+        assert set(data["rows"][0]) >= {"code", "extra"}
+        assert (
+            client.get("/protocol/terminology", params={"search": "C2"}).json()[
+                "matched_count"
+            ]
+            == 1
+        )
+        # Dropped elsewhere: reported as not loaded, then found again once recreated
+        _replace_table_elsewhere(["DROP TABLE protocol_terminology"])
+        assert client.get("/protocol/terminology").status_code == 404
+        _replace_table_elsewhere(
+            ["CREATE TABLE protocol_terminology (id INTEGER PRIMARY KEY, code TEXT)"]
+        )
+        assert client.get("/protocol/terminology").json()["total_count"] == 0
+    finally:
+        r = client.post("/admin/load_protocol_terminology", params={"force": True})
+        assert r.status_code == 200
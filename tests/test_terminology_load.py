@@ -0,0 +1,133 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from soa_builder.web.app import (
+    _TERMINOLOGY_SEARCH_COLS,
+    _connect,
+    _insert_terminology_rows,
+    app,
+)
+
+client = TestClient(app)
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "files")
+PROTOCOL_XLS = os.path.join(FILES_DIR, "Protocol_Terminology_2025-09-26.xls")
+
+
+def _schema_version():
+    conn = _connect()
+    version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    conn.close()
+    return version
+
+
+def _like_count(table, search):
+    conn = _connect()
+    cols = [
+        r[1]
+        for r in conn.execute(f"PRAGMA table_info({table})")
+        if r[1] in _TERMINOLOGY_SEARCH_COLS
+    ]
+    where = " OR ".join(f"LOWER({c}) LIKE ?" for c in cols)
+    count = conn.execute(
+        f"SELECT COUNT(*) FROM {table} WHERE {where}",
+        [f"%{search.lower()}%"] * len(cols),
+    ).fetchone()[0]
+    conn.close()
+    return count
+
+
+def _latest_audit(kind):
+    return client.get(f"/{kind}/terminology/audit").json()["rows"][0]
+
+
+def test_ddf_reload_of_same_workbook_is_skipped():
+    first = client.post("/admin/load_ddf_terminology")
+    assert first.status_code == 200
+    version = _schema_version()
+    again = client.post("/admin/load_ddf_terminology")
+    assert again.status_code == 200
+    assert again.json()["columns"] == first.json()["columns"]
+    assert again.json()["row_count"] == first.json()["row_count"]
+    # Skipped: the table was not dropped and recreated
+    assert _schema_version() == version
+    audit = _latest_audit("ddf")
+    assert audit["error"] is None and audit["row_count"] == first.json()["row_count"]
+    forced = client.post("/admin/load_ddf_terminology", params={"force": True})
+    assert forced.status_code == 200
+    assert _schema_version() != version
+
+
+@pytest.mark.parametrize("search", ["blood", "BLOOD", "ab", 'say "x'])
+def test_ddf_search_matches_like_semantics(search):
+    assert client.post("/admin/load_ddf_terminology").status_code == 200
+    r = client.get("/ddf/terminology", params={"search": search, "limit": 5})
+    assert r.status_code == 200
+    data = r.json()
+    # FTS (3+ characters) and the LIKE fallback agree with a plain LIKE scan
+    assert data["matched_count"] == _like_count("ddf_terminology", search)
+    for row in data["rows"]:
+        assert any(
+            search.lower() in (row.get(c) or "").lower()
+            for c in _TERMINOLOGY_SEARCH_COLS
+        )
+
+
+def _upload(content, filename, sheet_name="Protocol Terminology 2025-09-26"):
+    return client.post(
+        "/ui/protocol/terminology/upload",
+        data={"sheet_name": sheet_name},
+        files={"file": (filename, content, "application/vnd.ms-excel")},
+        follow_redirects=False,
+    )
+
+
+def test_protocol_upload_loads_in_background():
+    with open(PROTOCOL_XLS, "rb") as fh:
+        r = _upload(fh.read(), "protocol-upload-test.xls")
+    assert r.status_code == 303
+    assert r.headers["location"].endswith("?uploaded=1")
+    # TestClient runs background tasks before returning the response
+    audit = _latest_audit("protocol")
+    assert audit["source"] == "upload"
+    assert audit["original_filename"] == "protocol-upload-test.xls"
+    assert audit["error"] is None
+    assert audit["row_count"] > 0
+    assert not os.path.exists(audit["file_path"])
+
+
+def test_protocol_upload_unreadable_workbook_is_audited():
+    before = client.get("/protocol/terminology", params={"limit": 1}).json()
+    r = _upload(b"not a workbook", "broken.xls")
+    assert r.status_code == 303
+    audit = _latest_audit("protocol")
+    assert audit["source"] == "upload"
+    assert audit["error"].startswith("Read error")
+    assert not os.path.exists(audit["file_path"])
+    # The loaded table is untouched by the failed upload
+    after = client.get("/protocol/terminology", params={"limit": 1}).json()
+    assert after["total_count"] == before["total_count"]
+
+
+def test_protocol_upload_rejected_before_queueing():
+    latest = _latest_audit("protocol")["id"]
+    r = _upload(b"x", "notes.txt")
+    assert r.status_code == 303 and "error=Unsupported" in r.headers["location"]
+    r = _upload(b"x", "undated.xls", sheet_name="Protocol Terminology")
+    assert r.status_code == 303 and "error=" in r.headers["location"]
+    assert _latest_audit("protocol")["id"] == latest
+
+
+def test_insert_rows_when_dataset_date_is_the_only_column():
+    # A worksheet whose only column was itself a dataset date column
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, dataset_date TEXT)")
+    sub = pd.DataFrame(index=range(3))
+    _insert_terminology_rows(conn.cursor(), "t", ["dataset_date"], sub, "2025-09-26")
+    rows = conn.execute("SELECT dataset_date FROM t").fetchall()
+    assert rows == [("2025-09-26",)] * 3
+    conn.close()
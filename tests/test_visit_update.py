@@ -0,0 +1,41 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from soa_builder.web.app import _connect, app
+
+client = TestClient(app)
+
+
+def _create_visit():
+    soa_id = client.post("/soa", json={"name": "VisitUpdate"}).json()["id"]
+    r = client.post(f"/soa/{soa_id}/visits", json={"name": "V1", "raw_header": "V1"})
+    assert r.status_code == 200
+    return soa_id, r.json()["visit_id"]
+
+
+def test_update_visit_invalid_epoch_returns_400():
+    soa_id, visit_id = _create_visit()
+    r = client.patch(f"/soa/{soa_id}/visits/{visit_id}", json={"epoch_id": 999999})
+    assert r.status_code == 400
+    assert "epoch_id" in r.json()["detail"]
+    # The pooled connection used by the failed request is still usable
+    r = client.patch(f"/soa/{soa_id}/visits/{visit_id}", json={"name": "V1b"})
+    assert r.status_code == 200
+    assert client.get(f"/soa/{soa_id}/visits/{visit_id}").json()["name"] == "V1b"
+
+
+def test_update_visit_audit_commits_with_the_update():
+    soa_id, visit_id = _create_visit()
+    r = client.patch(f"/soa/{soa_id}/visits/{visit_id}", json={"name": "V1c"})
+    assert r.status_code == 200
+    # Written on the request's connection, so visible without flush_audit()
+    conn = _connect()
+    rows = conn.execute(
+        "SELECT action, after_json FROM visit_audit WHERE soa_id=? AND visit_id=? "
+        "ORDER BY id",
+        (soa_id, visit_id),
+    ).fetchall()
+    conn.close()
+    assert [action for action, _ in rows][-2:] == ["create", "update"]
+    assert json.loads(rows[-1][1])["updated_fields"] == ["name"]